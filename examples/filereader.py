@@ -15,6 +15,7 @@ from typing import Optional, Sequence, Union
 import thurible as thb
 from thurible import messages as tm
 from thurible.dialog import cont
+from thurible.text import MappedText
 
 
 # Classes.
@@ -198,15 +199,18 @@ def create_text(path: Union[str, Path]) -> thb.Text:
     if not isinstance(path, Path):
         path = Path(path)
 
-    # Get the text from the file. Default to interpreting the test as
-    # UTF-8. If that fails, use Latin-1, which will work. This will
-    # misinterpret files that aren't in those character sets. There
-    # should probably an option to select the character set manually
-    # in the future.
-    try:
-        content = read_file_as_text(path, 'utf_8')
-    except UnicodeDecodeError:
-        content = read_file_as_text(path, 'latin_1')
+    # Map the file into memory rather than reading it, so large files
+    # can be browsed without loading them. Default to interpreting the
+    # text as UTF-8. If the start of the file isn't valid UTF-8, use
+    # Latin-1, which will work. This will misinterpret files that
+    # aren't in those character sets. There should probably an option
+    # to select the character set manually in the future. The map used
+    # to check the encoding is closed once the check is done.
+    encoding = 'utf_8'
+    with MappedText(path, encoding) as probe:
+        if not probe.is_decodable():
+            encoding = 'latin_1'
+    content = MappedText(path, encoding)
 
     # Create and return a thurible.Text object for reading the text
     # in the given file.
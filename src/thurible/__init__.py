@@ -15,14 +15,16 @@ if _sys.version_info[:2] < (3, 9):
 from blessed import Terminal
 from blessed.keyboard import Keystroke
 
+from thurible.asyncmanager import async_manager
 from thurible.dialog import Dialog
 from thurible.eventmanager import event_manager
 from thurible.log import Log, Update
-from thurible.menu import Menu, Option
+from thurible.menu import Menu, Option, ReplaceOption
 from thurible.progress import NoTick, Progress, Tick
 from thurible.splash import Splash
-from thurible.table import Table
-from thurible.text import Text
+from thurible.table import AddRows, Filter, Sort, Table
+from thurible.text import Append, Text
 from thurible.textdialog import TextDialog
 from thurible.thurible import queued_manager
+from thurible.transport import get_process_queues, process_manager
 from thurible.util import get_queues, get_terminal
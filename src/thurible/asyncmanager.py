@@ -0,0 +1,251 @@
+"""
+asyncmanager
+~~~~~~~~~~~~
+
+A manager that runs as a coroutine in an :mod:`asyncio` event loop.
+"""
+import asyncio
+from collections import deque
+from itertools import chain
+from typing import Optional, cast
+
+from blessed import Terminal
+
+from thurible import messages as tm
+from thurible.render import Renderer
+from thurible.thurible import (
+    IDLE_TIMEOUT,
+    _get_waiting,
+    _time_to_flush,
+    check_flush,
+    check_input,
+    check_resize,
+    handle_messages
+)
+from thurible.util import get_terminal
+
+
+# Common values.
+# How long, in seconds, the manager waits for a message before checking
+# for input when it can't watch the keyboard through the event loop.
+POLL_TIMEOUT = 0.01
+
+
+# Manager.
+async def async_manager(
+    q_to: asyncio.Queue,
+    q_from: asyncio.Queue,
+    term: Optional[Terminal] = None,
+    displays: Optional[dict] = None,
+    fps: float = 60.0,
+    diff: bool = False
+) -> None:
+    """Manage a terminal display by sending and receiving
+    :class:`thurible.messages.Message` objects through
+    :class:`asyncio.Queue` objects.
+
+    This works like :func:`thurible.queued_manager`, but it runs as a
+    task in an :mod:`asyncio` event loop rather than in its own
+    thread. Key presses are read when the event loop sees the
+    keyboard is ready, and messages are handled as soon as they are
+    put in `q_to`, so the manager doesn't use any processor time while
+    it waits.
+
+    :param q_to: A queue for messages the program sends to the manager.
+    :param q_from: A queue for messages the manager sends to the program.
+    :param term: An instance of `blessed.Terminal` used to interact with
+        the terminal.
+    :param displays: (Optional.) Storage for the panels the program may
+        want the manager to display.
+    :param fps: (Optional.) The maximum number of times per second
+        the manager writes to the terminal. If it's zero, updates are
+        written as soon as they are made. It defaults to 60.
+    :param diff: (Optional.) Whether to only write the parts of the
+        terminal that changed since the last frame. This reduces the
+        amount written to the terminal, which helps over slow
+        connections. See :class:`thurible.render.Screen`. It defaults
+        to false.
+    :return: None.
+    :rtype: NoneType
+    :usage:
+        An example small application that uses the
+        :func:`thurible.async_manager` to show a splash screen
+        until a key is pressed::
+
+            import asyncio
+
+            from thurible import Splash, async_manager
+            import thurible.messages as tm
+
+            async def main():
+                # Create the queues and start the manager.
+                q_to = asyncio.Queue()
+                q_from = asyncio.Queue()
+                task = asyncio.create_task(async_manager(q_to, q_from))
+
+                # Show the splash screen.
+                await q_to.put(tm.Store('splash', Splash('SPAM!')))
+                await q_to.put(tm.Show('splash'))
+
+                # End when a key is pressed.
+                while not isinstance(await q_from.get(), tm.Data):
+                    ...
+                await q_to.put(tm.End('Quitting.'))
+                await task
+
+            asyncio.run(main())
+
+    """
+    # Set up.
+    if term is None:
+        term = get_terminal()
+    if displays is None:
+        displays = {}
+    showing: str = ''
+    history: deque[str] = deque(maxlen=100)
+    farewell = ''
+    reason = ''
+    exception: Optional[Exception] = None
+    last_height = term.height
+    last_width = term.width
+    renderer = Renderer(term, fps, diff)
+    loop = asyncio.get_running_loop()
+    key_ready = asyncio.Event()
+    reading = _add_reader(loop, term, key_ready)
+
+    # Program loop.
+    try:
+        with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+            while True:
+                try:
+
+                    # Sleep until there is something to do.
+                    wait = IDLE_TIMEOUT if reading else POLL_TIMEOUT
+                    if renderer.pending:
+                        wait = min(wait, renderer.time_to_frame)
+                    flush = _time_to_flush(displays, showing)
+                    if flush is not None:
+                        wait = min(wait, flush)
+                    received = await _wait_for_event(
+                        q_to,
+                        key_ready,
+                        term,
+                        wait
+                    )
+                    key_ready.clear()
+
+                    # If the terminal size has changed, change the size
+                    # of the showing panel to match.
+                    last_height, last_width = check_resize(
+                        displays,
+                        showing,
+                        term,
+                        last_height,
+                        last_width,
+                        renderer
+                    )
+
+                    # Manage messages from the application.
+                    (
+                        displays, showing, end, farewell, reason, history
+                    ) = handle_messages(
+                        chain(received, _get_waiting(q_to)),
+                        q_from,
+                        displays,
+                        showing,
+                        history,
+                        renderer
+                    )
+                    if end:
+                        break
+
+                    # Manage messages from the user.
+                    check_input(
+                        q_from,
+                        displays,
+                        showing,
+                        term,
+                        0.0,
+                        renderer
+                    )
+
+                    # Write any updates the showing panel held back.
+                    check_flush(displays, showing, renderer)
+
+                    # Write any updates if it's time for the next frame.
+                    renderer.flush()
+
+                # Handle any exceptions that occurred while managing the
+                # messages.
+                except Exception as ex:
+                    reason = 'Exception.'
+                    exception = ex
+                    break
+
+            # Write anything left before leaving full screen mode.
+            try:
+                renderer.flush(force=True)
+            except OSError:
+                ...
+
+    # Stop watching the keyboard even if the task is cancelled.
+    finally:
+        if reading:
+            loop.remove_reader(cast(int, term._keyboard_fd))
+
+    # After exiting full screen mode, print the farewell message and
+    # inform the program the manager is ending.
+    if farewell:
+        print(farewell)
+    q_from.put_nowait(tm.Ending(reason, exception))
+
+
+# Private functions.
+def _add_reader(
+    loop: asyncio.AbstractEventLoop,
+    term: Terminal,
+    key_ready: asyncio.Event
+) -> bool:
+    """Have the event loop set the event when a key is pressed. Return
+    whether the keyboard can be watched that way.
+    """
+    fd = cast(Optional[int], term._keyboard_fd)
+    if fd is None:
+        return False
+    try:
+        loop.add_reader(fd, key_ready.set)
+    except (NotImplementedError, OSError, ValueError):
+        return False
+    return True
+
+
+async def _wait_for_event(
+    q_to: asyncio.Queue,
+    key_ready: asyncio.Event,
+    term: Terminal,
+    timeout: float = IDLE_TIMEOUT
+) -> list[tm.Message]:
+    """Sleep until the user presses a key, the application sends a
+    message, or the timeout passes. Return the message that woke the
+    manager, if there was one.
+    """
+    if not q_to.empty() or key_ready.is_set() or term._keyboard_buf:
+        return []
+
+    getter = asyncio.ensure_future(q_to.get())
+    waiter = asyncio.ensure_future(key_ready.wait())
+    try:
+        await asyncio.wait(
+            (getter, waiter),
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        getter.cancel()
+        waiter.cancel()
+
+    # A cancelled getter leaves its message in the queue, so only a
+    # getter that finished took a message.
+    if getter.done() and not getter.cancelled():
+        return [getter.result()]
+    return []
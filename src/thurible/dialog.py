@@ -4,12 +4,14 @@ dialog
 
 A dialog for terminal applications.
 """
-from typing import Optional, Sequence
+from collections.abc import Callable
+from typing import Any, Optional, Sequence
 
 from blessed.keyboard import Keystroke
 
 from thurible.menu import Option
 from thurible.panel import Content, Title
+from thurible.util import HotkeyIndex
 
 
 # Common dialog options.
@@ -55,6 +57,12 @@ class Dialog(Content, Title):
             *   <hotkey>: Move to the defined option.
 
     """
+    # The hotkey index is rebuilt rather than sent with the panel.
+    _transient: dict[str, Callable[[], Any]] = {
+        **Content._transient,
+        '_hotkey_index': lambda: None,
+    }
+
     def __init__(
         self,
         message_text: str,
@@ -63,16 +71,14 @@ class Dialog(Content, Title):
     ) -> None:
         super().__init__(*args, **kwargs)
         self.message_text = message_text
+        self._hotkey_index: Optional[HotkeyIndex] = None
         self.options = options
 
-        # Defined action keys.
+        # Defined action keys. The hotkeys are registered when the
+        # options are set.
         self.register_key('KEY_ENTER', self._select)
         self.register_key('KEY_LEFT', self._select_left)
         self.register_key('KEY_RIGHT', self._select_right)
-        for option in self.options:
-            hotkey = f"'{option.hotkey}'"
-            self.register_key(hotkey, self._hotkey)
-        self._selected = len(self.options) - 1
 
     def __str__(self) -> str:
         result = super().__str__()
@@ -115,6 +121,37 @@ class Dialog(Content, Title):
             result += f'{self.term.move(y + i, x)}{line}'
         return result
 
+    @property
+    def options(self) -> Sequence[Option]:
+        """The options the user can chose from. Changing the options
+        rebuilds the hotkeys and selects the last option.
+
+        :return: A :class:`collections.abc.Sequence` object of
+            :class:`thurible.Option` objects.
+        :rtype: collections.abc.Sequence
+        """
+        return self._options
+
+    @options.setter
+    def options(self, value: Sequence[Option]) -> None:
+        self._options = value
+        self._hotkey_index = None
+        for key, handler in list(self._active_keys.items()):
+            if handler == self._hotkey:
+                del self._active_keys[key]
+        for char in self._hotkeys.chars:
+            self.register_key(f"'{char}'", self._hotkey)
+        self._selected = len(value) - 1
+
+    @property
+    def _hotkeys(self) -> HotkeyIndex:
+        """The index used to find options by their hotkeys."""
+        if self._hotkey_index is None:
+            self._hotkey_index = HotkeyIndex(
+                option.hotkey for option in self.options
+            )
+        return self._hotkey_index
+
     # Public methods.
     def action(self, key: Keystroke) -> tuple[str, str]:
         """Act on a keystroke typed by the user.
@@ -159,8 +196,10 @@ class Dialog(Content, Title):
     # Private action handlers.
     def _hotkey(self, key: Optional[Keystroke] = None) -> str:
         """Select the option assigned to the hot key."""
-        hotkeys = [option.hotkey for option in self.options]
-        self._selected = hotkeys.index(str(key))
+        index = self._hotkeys.press(str(key))
+        if index is None:
+            return str(key)
+        self._selected = index
         return ''
 
     def _select(self, key: Optional[Keystroke] = None) -> str:
@@ -5,9 +5,9 @@ eventmanager
 A manager that uses events sent from the user interface to drive
 application flow.
 """
-from queue import Queue
+from queue import Empty, Queue
 from threading import Thread
-from typing import Callable, Mapping, Optional
+from typing import Callable, Mapping, Optional, Sequence, Union
 
 import thurible.messages as tm
 from thurible.panel import Panel
@@ -17,13 +17,16 @@ from thurible.util import get_queues
 
 # Types.
 EventScript = Callable[[tm.Message, Queue], bool]
-EventMap = Mapping[type, EventScript]
+EventMap = Mapping[type, Union[EventScript, Sequence[EventScript]]]
+IdleScript = Callable[[Queue], bool]
 
 
 # Manager.
 def event_manager(
     event_map: Optional[EventMap] = None,
-    initial_panel: Optional[Panel] = None
+    initial_panel: Optional[Panel] = None,
+    timeout: Optional[float] = None,
+    idle: Optional[IdleScript] = None
 ) -> None:
     """Manage a terminal display by mapping :ref:`response-messages`
     to event scripts (see below).
@@ -34,12 +37,24 @@ def event_manager(
         your application. These functions must accept a
         :class:`queue.Queue` object and the response message as
         parameters. It must return a :class:`bool` indicating
-        whether the application should continue running.
+        whether the application should continue running. A type
+        can be mapped to a sequence of functions, which are called
+        in order. See :ref:`event-dispatch` below.
     :param initial_panel: (Optional.) The first panel displayed in
         the terminal. While this is technically optional, that's
         just for testing purposes. You should really provide
         this to the manager. The panel passed this way will be
         stored as "__init".
+    :param timeout: (Optional.) How long, in seconds, to wait for a
+        message from the manager before calling `idle`. If it's not
+        set, the application waits until a message arrives, using no
+        processor time while it waits.
+    :param idle: (Optional.) A function called when `timeout` passes
+        without a message from the manager. It must accept a
+        :class:`queue.Queue` for sending :ref:`command
+        messages<command-messages>` to the manager and return a
+        :class:`bool` indicating whether the application should
+        continue running.
     :return: None
     :rtype: NoneType
     :usage:
@@ -135,9 +150,30 @@ def event_manager(
         probably should use :func:`queued_manager` directly
         rather than :func:`event_manager`.
 
+    .. _event-dispatch:
+
+    :event dispatch:
+        When a message arrives, the event scripts mapped to the
+        message's type are called. If the message's type isn't
+        in the map, the scripts for the closest parent class of
+        the message in the map are used instead, so subclasses
+        of a message are handled by the scripts for that message
+        unless they have their own. Mapping
+        :class:`thurible.panel.Message` creates a catch-all for
+        any message that has no more specific scripts.
+
+        If more than one script is mapped to a type, every script
+        is called, and the application keeps running only if all
+        of them return `True`.
+
+        If no scripts are found for a
+        :class:`thurible.messages.Ending` message, the
+        :func:`event_manager` ends.
+
     """
     if not event_map:
         event_map = {}
+    dispatcher = _Dispatcher(event_map)
 
     q_to, q_from = get_queues()
     T = Thread(target=queued_manager, args=(q_to, q_from))
@@ -150,7 +186,7 @@ def event_manager(
             q_to.put(tm.Show('__init'))
 
         while run:
-            run = _check_for_message(q_to, q_from, event_map)
+            run = _check_for_message(q_to, q_from, dispatcher, timeout, idle)
 
     except KeyboardInterrupt as ex:
         reason = 'Keyboard Interrupt'
@@ -159,22 +195,61 @@ def event_manager(
         raise ex
 
 
+# Private classes.
+class _Dispatcher:
+    """Find and call the event scripts for messages by their type.
+    The scripts for each type are found once, then cached.
+    """
+    def __init__(self, event_map: EventMap) -> None:
+        self._scripts: dict[type, tuple[EventScript, ...]] = {}
+        for msg_type, scripts in event_map.items():
+            if callable(scripts):
+                scripts = (scripts,)
+            self._scripts[msg_type] = tuple(scripts)
+        self._cache: dict[type, tuple[EventScript, ...]] = {}
+
+    def dispatch(self, msg: tm.Message, q_to: Queue) -> bool:
+        """Call the scripts for the message, returning whether the
+        application should keep running.
+        """
+        scripts: tuple[EventScript, ...] = ()
+        if isinstance(msg, tm.Message):
+            scripts = self.resolve(type(msg))
+        if not scripts:
+            return not isinstance(msg, tm.Ending)
+        results = [script(msg, q_to) for script in scripts]
+        return all(results)
+
+    def resolve(self, msg_type: type) -> tuple[EventScript, ...]:
+        """Find the scripts for a message type."""
+        try:
+            return self._cache[msg_type]
+        except KeyError:
+            pass
+
+        scripts: tuple[EventScript, ...] = ()
+        for cls in msg_type.__mro__:
+            if cls in self._scripts:
+                scripts = self._scripts[cls]
+                break
+        self._cache[msg_type] = scripts
+        return scripts
+
+
 # Private functions.
 def _check_for_message(
     q_to: Queue,
     q_from: Queue,
-    event_map: EventMap
+    dispatcher: _Dispatcher,
+    timeout: Optional[float] = None,
+    idle: Optional[IdleScript] = None
 ) -> bool:
-    """Check for and handle UI messages."""
+    """Wait for and handle UI messages."""
     run = True
-    if not q_from.empty():
-        msg = q_from.get()
-
-        for msg_type in event_map:
-            if isinstance(msg, msg_type) and isinstance(msg, tm.Message):
-                run = event_map[msg_type](msg, q_to)
-                break
-        else:
-            if isinstance(msg, tm.Ending):
-                run = False
-    return run
+    try:
+        msg = q_from.get(timeout=timeout)
+    except Empty:
+        if idle:
+            run = idle(q_to)
+        return run
+    return dispatcher.dispatch(msg, q_to)
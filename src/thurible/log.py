@@ -6,8 +6,10 @@ An object for displaying a history of updating messages, such as a
 log.
 """
 from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from time import monotonic
+from typing import Any, Optional, Sequence
 
 from thurible.panel import Content, Message, Title
 
@@ -55,6 +57,24 @@ class Log(Content, Title):
         terminal window to be resized without causing the loss of
         any messages. It's not intended for the user to be able to
         scroll to view messages that have rolled off the terminal.
+    :param max_rate: (Optional.) The most times per second new entries
+        are added to the display. Entries received between those times
+        are held back and added together. If it's zero, entries are
+        added as soon as they are received. It defaults to zero.
+    :param max_pending: (Optional.) The most entries that can be held
+        back. It defaults to the value of `maxlen`, since any more
+        entries than that would roll off the log when they are added.
+    :param overflow: (Optional.) What to do when more entries are held
+        back than `max_pending` allows. The options are:
+
+        *   "drop_oldest": Drop the oldest entry held back.
+        *   "collapse": Collapse repeated entries into one entry
+            ending with the number of times it was repeated, such as
+            "spam x3". If that isn't enough, drop the oldest entry.
+        *   "summarize": Drop the oldest entry, but add an entry
+            saying how many were dropped.
+
+        It defaults to "drop_oldest".
     :return: A :class:`Log` object.
     :rtype: thurible.Log
     :usage:
@@ -87,18 +107,45 @@ class Log(Content, Title):
             update = thurible.Update('spam')
             log.update(update)
 
+        To limit a log to adding entries ten times a second and
+        collapse repeated entries when it falls behind:
+
+        .. testcode:: log
+
+            log = thurible.Log(max_rate=10, overflow='collapse')
+
         Information on the sizing of :class:`thurible.Log`
         objects can be found in the :ref:`sizing` section below.
 
     """
+    # The wrapped lines and what is on the screen are rebuilt rather
+    # than sent with the panel.
+    _transient: dict[str, Callable[[], Any]] = {
+        **Content._transient,
+        '_lines': lambda: None,
+        '_shown': lambda: None,
+        '_wrapped': deque,
+        '_wrapped_width': lambda: -1,
+    }
+
     def __init__(
         self,
         content: Optional[Sequence[str]] = None,
         maxlen: int = 50,
+        max_rate: float = 0.0,
+        max_pending: Optional[int] = None,
+        overflow: str = 'drop_oldest',
         *args, **kwargs
     ) -> None:
+        if overflow not in ('drop_oldest', 'collapse', 'summarize'):
+            reason = f'Invalid overflow policy: {overflow}.'
+            raise ValueError(reason)
         super().__init__(*args, **kwargs)
         self.maxlen = maxlen
+        self.max_rate = max_rate
+        self.max_pending = max_pending if max_pending else maxlen
+        self.overflow = overflow
+        self.dropped = 0
         if content is None:
             content = deque(maxlen=self.maxlen)
         elif not isinstance(content, deque):
@@ -108,23 +155,28 @@ class Log(Content, Title):
             content = d
         self.content = content
 
+        # Private attributes.
+        self._added = 0
+        self._lines: Optional[list[str]] = None
+        self._newest: Optional[tuple[str, int]] = None
+        self._next_flush = 0.0
+        self._pending: deque[tuple[str, int]] = deque()
+        self._shown: Optional[list[str]] = None
+        self._summarized = 0
+        self._wrapped: deque[list[str]] = deque()
         self._wrapped_width = -1
 
     def __str__(self) -> str:
         """Return a string that will draw the entire panel."""
         # Set up.
-        inner_height = self.inner_height
-        y = self.inner_y
-        x = self.inner_x
+        height = self.inner_height
         result = super().__str__()
 
         # Write the contents of the log.
-        result += self._visible(
-            self.lines,
-            self.inner_height,
-            self.inner_x,
-            self.inner_y
-        )
+        top = self._top(height)
+        result += self._visible(top, height, self.inner_x, self.inner_y)
+        self._added = 0
+        self._shown = top
         return result
 
     # Properties.
@@ -139,33 +191,191 @@ class Log(Content, Title):
             text as a :class:`str`.
         :rtype: list
         """
-        width = self.inner_width
-        if width != self._wrapped_width:
-            wrapped = []
-            for line in self.content:
-                wrapped.extend(self.term.wrap(line, width=width))
-            self._lines = wrapped
-            self._wrapped_width = width
+        self._wrap()
+        if self._lines is None:
+            self._lines = [line for entry in self._wrapped for line in entry]
         return self._lines
 
+    @property
+    def pending(self) -> int:
+        """The number of entries held back until the next time entries
+        are added to the display.
+
+        :return: An :class:`int` object.
+        :rtype: int
+        """
+        return len(self._pending) + bool(self._summarized)
+
+    @property
+    def time_to_flush(self) -> Optional[float]:
+        if not self.pending:
+            return None
+        return max(self._next_flush - monotonic(), 0.0)
+
     # Public methods.
+    def flush(self) -> str:
+        """Add the entries that were held back to the display.
+
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        if not self.pending:
+            return ''
+        if self._summarized:
+            self._add(f'[{self._summarized} entries dropped]')
+            self._summarized = 0
+        while self._pending:
+            self._add(*self._pending.popleft())
+        if self.max_rate:
+            self._next_flush = monotonic() + 1 / self.max_rate
+        return self._redraw()
+
     def update(self, msg: Message) -> str:
         result = super().update(msg)
+        if self._apply_update(msg) and self.time_to_flush == 0.0:
+            result += self.flush()
+        return result
 
-        if isinstance(msg, Update):
-            self.content.appendleft(msg.text)
-            self._wrapped_width = -1
-            result += self.clear_contents()
-            result += self._visible(
-                self.lines,
-                self.inner_height,
-                self.inner_x,
-                self.inner_y
-            )
+    def update_many(self, msgs: Sequence[Message]) -> str:
+        """Act on several messages sent by the application at once.
+        All of the new entries are added before the log is redrawn,
+        so the log is only redrawn once.
 
+        :param msgs: The messages sent by the application in the order
+            they were sent.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        result = ''
+        changed = [self._apply_update(msg) for msg in msgs]
+        if any(changed) and self.time_to_flush == 0.0:
+            result += self.flush()
         return result
 
     # Private helper methods.
+    def _add(self, text: str, count: int = 1) -> None:
+        """Add an entry to the log. When collapsing repeated entries,
+        an entry that repeats the newest entry replaces it.
+        """
+        replace = (
+            self.overflow == 'collapse'
+            and self._newest is not None
+            and self._newest[0] == text
+            and bool(self.content)
+        )
+        if replace and self._newest:
+            count += self._newest[1]
+            self.content.popleft()
+        self._newest = (text, count)
+        if count > 1:
+            text = f'{text} x{count}'
+        self.content.appendleft(text)
+
+        width = self._wrapped_width
+        if width == self.inner_width:
+            wrapped = self.term.wrap(text, width=width)
+            if replace:
+                self._wrapped.popleft()
+            else:
+                self._added += len(wrapped)
+            self._wrapped.appendleft(wrapped)
+        self._lines = None
+
+    def _apply_update(self, msg: Message) -> bool:
+        """Hold back the text of an update until it's added to the log,
+        returning whether there is anything new to add.
+        """
+        if not isinstance(msg, Update):
+            return False
+
+        # Repeated entries can be collapsed while they wait.
+        pending = self._pending
+        if (
+            self.overflow == 'collapse'
+            and pending
+            and pending[-1][0] == msg.text
+        ):
+            pending[-1] = (msg.text, pending[-1][1] + 1)
+            return True
+
+        # Keep the number of entries waiting within the limit.
+        pending.append((msg.text, 1))
+        if len(pending) > self.max_pending:
+            _, count = pending.popleft()
+            self.dropped += count
+            if self.overflow == 'summarize':
+                self._summarized += count
+        return True
+
+    def _redraw(self) -> str:
+        """Redraw the entries in the log. If the log has been drawn
+        before, the lines already on the screen are shifted down by
+        the terminal if it can, and only the rows that changed are
+        written.
+        """
+        height = self.inner_height
+        y = self.inner_y
+        x = self.inner_x
+        top = self._top(height)
+        shown = self._shown
+        shift = min(self._added, len(top))
+        self._added = 0
+        self._shown = top
+        if shown is None:
+            result = self.clear_contents()
+            result += self._visible(top, height, x, y)
+            return result
+
+        # If the lines that were already shown only moved down, have
+        # the terminal shift them. The rows it exposes are blank, frame
+        # included, so they are always written.
+        result = ''
+        exposed = []
+        if (
+            self._can_scroll_rows(-shift, height)
+            and top[shift:] == shown[:height - shift]
+        ):
+            result += self._scroll_rows(-shift, y, height)
+            shown = [''] * shift + shown[:height - shift]
+            exposed = list(range(shift))
+
+        # Write the rows that changed.
+        shown += [''] * (height - len(shown))
+        rows = [
+            i for i, line in enumerate(top + [''] * (height - len(top)))
+            if i in exposed or line != shown[i]
+        ]
+        result += self._clear_rows(rows, y, x, self.inner_width)
+        for i in rows:
+            if i < len(top):
+                result += self.term.move(y + i, x) + top[i]
+        return result
+
+    def _top(self, height: int) -> list[str]:
+        """Get the most recent lines that fill the given height. Only
+        the entries needed to fill the height are used.
+        """
+        self._wrap()
+        top: list[str] = []
+        for entry in self._wrapped:
+            if len(top) >= height:
+                break
+            top.extend(entry)
+        return top[:height]
+
+    def _wrap(self) -> None:
+        """Wrap each entry to the width of the panel if it changed."""
+        width = self.inner_width
+        if width != self._wrapped_width:
+            self._wrapped = deque(
+                (self.term.wrap(line, width=width) for line in self.content),
+                maxlen=self.content.maxlen
+            )
+            self._wrapped_width = width
+            self._lines = None
+
     def _visible(
         self,
         lines: Sequence[str],
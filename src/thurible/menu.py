@@ -4,24 +4,157 @@ menu
 
 An object for displaying a text area in a terminal.
 """
+from collections import Counter
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Iterable, Optional, Sequence, Union, overload
+from unicodedata import category
 
 from blessed import Terminal
 from blessed.keyboard import Keystroke
 
-from thurible.panel import Scroll, Title
-from thurible.util import Box
+from thurible.panel import Message, Scroll, Title
+from thurible.util import Box, HotkeyIndex
+
+
+# Common values.
+# The most matches a filter ranks. Larger sets of matches are kept in
+# the order of the options, since a filter that matches that many
+# options doesn't say much about which one the user wants.
+RANK_LIMIT = 10_000
 
 
 # Utility classes.
+class FuzzyMatcher:
+    """Create a new :class:`thurible.menu.FuzzyMatcher` object. This
+    finds the names that contain the characters of a query in order,
+    ignoring case. The matches for each query are kept, so a query
+    that adds to the last one only searches the names that matched
+    the last query.
+
+    :param names: The names to search.
+    :return: None.
+    :rtype: NoneType
+    :usage:
+        To find the names containing "s" followed by "m":
+
+        .. testcode::
+
+            from thurible.menu import FuzzyMatcher
+
+            matcher = FuzzyMatcher(['spam', 'eggs', 'sausage', 'ham'])
+            assert matcher.search('sm') == [0]
+
+    """
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = names
+        self._lowered = [name.lower() for name in names]
+        self._firsts: dict[str, tuple[list[int], list[int]]] = {}
+        self._results: list[tuple[str, list[int], list[int]]] = []
+
+    # Public methods.
+    def positions(self, index: int, query: str) -> list[int]:
+        """Find where the characters of a query are in a name.
+
+        :param index: The position of the name.
+        :param query: The characters to find.
+        :return: A :class:`list` object of :class:`int` objects.
+        :rtype: list
+        """
+        name = self._lowered[index]
+        positions = []
+        pos = 0
+        for char in query.lower():
+            pos = name.find(char, pos)
+            if pos < 0:
+                return []
+            positions.append(pos)
+            pos += 1
+        return positions
+
+    def search(self, query: str) -> list[int]:
+        """Find the names that contain the characters of the query in
+        order. Names where the characters are closer together and
+        nearer the start are first, unless there are more matches
+        than :data:`thurible.menu.RANK_LIMIT`.
+
+        :param query: The characters to find.
+        :return: The positions of the matching names as a :class:`list`
+            object of :class:`int` objects.
+        :rtype: list
+        """
+        query = query.lower()
+        if not query:
+            self._results = []
+            return list(range(len(self.names)))
+
+        # Start from the matches of the longest query this one adds to.
+        while self._results and not query.startswith(self._results[-1][0]):
+            self._results.pop()
+        if self._results:
+            matched, found, ends = self._results[-1]
+        else:
+            matched = query[0]
+            found, ends = self._first(matched)
+            self._results.append((matched, found, ends))
+
+        # Only the names that matched the shorter query can match.
+        # Each match keeps where its last character ends, so each
+        # character added to the query is found from there.
+        lowered = self._lowered
+        for i in range(len(matched), len(query)):
+            char = query[i]
+            next_found: list[int] = []
+            next_ends: list[int] = []
+            for n, end in zip(found, ends):
+                pos = lowered[n].find(char, end)
+                if pos >= 0:
+                    next_found.append(n)
+                    next_ends.append(pos + 1)
+            found, ends = next_found, next_ends
+            self._results.append((query[:i + 1], found, ends))
+        return self._rank(query, found, ends)
+
+    # Private helper methods.
+    def _first(self, char: str) -> tuple[list[int], list[int]]:
+        """Find the names that contain a character and where the
+        character ends in each. Since every query starts with one
+        character, these are kept for each character searched for.
+        """
+        if char not in self._firsts:
+            lowered = self._lowered
+            found = [n for n, name in enumerate(lowered) if char in name]
+            ends = [lowered[n].find(char) + 1 for n in found]
+            self._firsts[char] = (found, ends)
+        return self._firsts[char]
+
+    def _rank(
+        self,
+        query: str,
+        found: list[int],
+        ends: list[int]
+    ) -> list[int]:
+        """Order the matches from best to worst."""
+        if len(found) > RANK_LIMIT:
+            return found
+        lowered = self._lowered
+        scores = sorted(
+            (end - start, start, len(name), n)
+            for n, end in zip(found, ends)
+            for name in (lowered[n],)
+            for start in (name.find(query[0]),)
+        )
+        return [score[-1] for score in scores]
+
+
 @dataclass
 class Option:
     """A command or menu option.
 
     :param name: The name of the option.
     :param hotkey: (Optional.) A hotkey that can be used to invoke
-        the option.
+        the option. It can be more than one character long, in which
+        case the user types the characters one after the other.
     :returns: A :class:`thurible.Option` object.
     :rtype: thurible.Option
     :usage:
@@ -37,6 +170,32 @@ class Option:
     hotkey: Optional[str] = None
 
 
+# Available update message.
+@dataclass
+class ReplaceOption(Message):
+    """Create a new :class:`thurible.menu.ReplaceOption` object. This
+    object is a command message used to instruct the currently
+    displayed :class:`thurible.Menu` to replace one of its options.
+
+    :param index: The position of the option in the menu.
+    :param option: The new option.
+    :return: A :class:`thurible.menu.ReplaceOption` object.
+    :rtype: thurible.menu.ReplaceOption
+    :usage:
+        To replace the first option of a menu with "spam":
+
+        .. testcode::
+
+            import thurible
+            from thurible.menu import ReplaceOption
+
+            msg = ReplaceOption(0, thurible.Option('spam', 's'))
+
+    """
+    index: int
+    option: Option
+
+
 # General classes.
 class Menu(Scroll, Title):
     """Create a new :class:`thurible.Menu` object. This class provides
@@ -61,6 +220,11 @@ class Menu(Scroll, Title):
         :class:`thurible.panel.Content` for more information.
     :param content_align_v: (Optional.) The vertical alignment
         of the contents of the panel. It defaults to "top".
+    :param filter_key: (Optional.) A key that starts filtering the
+        options. While filtering, the characters typed narrow the
+        options shown to the ones containing those characters in
+        order, and the matching characters are underlined. It
+        defaults to no key, which means the options can't be filtered.
     :return: A :class:`thurible.Menu` object.
     :rtype: thurible.Menu
     :usage:
@@ -84,6 +248,15 @@ class Menu(Scroll, Title):
             *   KEY_ENTER: Select the highlighted option.
             *   Optional hot keys to highlight the options, as defined in
                 the :class:`thurible.Option` object for the option.
+            *   The optional filter key to start filtering the options.
+
+        While filtering, the following keys are used instead of any
+        hot keys:
+
+            *   Characters: Add the character to the filter.
+            *   KEY_BACKSPACE: Remove the last character of the filter.
+            *   KEY_ESCAPE: Stop filtering, keeping the highlighted
+                option highlighted.
 
         :class:`thurible.Menu` modifies the behavior of the following
         active keys:
@@ -99,20 +272,41 @@ class Menu(Scroll, Title):
         For more information on active keys, see :ref:`active`.
 
     """
+    # The formatted options, hotkey index, and matcher are rebuilt
+    # rather than sent with the panel.
+    _transient: dict[str, Callable[[], Any]] = {
+        **Scroll._transient,
+        '_hotkey_index': lambda: None,
+        '_matcher': lambda: None,
+        '_option_lines': lambda: None,
+        '_shown_lines': lambda: None,
+        '_widths': lambda: None,
+    }
+
     # Magic methods.
     def __init__(
         self,
-        options: tuple[Option],
+        options: Sequence[Option],
         option_align_h: str = 'left',
         select_bg: str = '',
         select_fg: str = '',
         content_align_v: str = 'top',
+        filter_key: str = '',
         *args, **kwargs
     ) -> None:
+        self._footer = ''
+        self._hotkey_index: Optional[HotkeyIndex] = None
+        self._matcher: Optional[FuzzyMatcher] = None
+        self._matches: Optional[list[int]] = None
+        self._option_lines: Optional[list[str]] = None
+        self._query: Optional[str] = None
+        self._shown_lines: Optional[_ShownLines] = None
+        self._widths: Optional[Counter[int]] = None
         self.options = options
         self.option_align_h = option_align_h
         self.select_bg = select_bg
         self.select_fg = select_fg
+        self.filter_key = filter_key
         if (
             'content_pad_left' not in kwargs
             and 'conent_pad_right' not in kwargs
@@ -124,9 +318,8 @@ class Menu(Scroll, Title):
 
         self._selected = 0
         self._active_keys['KEY_ENTER'] = self._select
-        for option in self.options:
-            hotkey = f"'{option.hotkey}'"
-            self._active_keys[hotkey] = self._hotkey
+        for char in self._hotkeys.chars:
+            self._active_keys[f"'{char}'"] = self._hotkey
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, self.__class__):
@@ -140,23 +333,9 @@ class Menu(Scroll, Title):
 
     def __str__(self) -> str:
         """Return a string that will draw the entire panel."""
-        # Set up.
-        lines = self.lines
-        length = len(lines)
-        height = self.inner_height
-        width = self.content_width
-        y = self.inner_y
-        x = self.content_x
         self._start = 0
-        self._stop = height
-        result = super().__str__()
-
-        # Create the display string and return.
-        y += self._align_v(self.content_align_v, length, height)
-        result, height, y = self._flow(result, length, height, width, y, x)
-        self._overscroll(length, height)
-        result += self._visible(lines, width, y, x)
-        return result
+        self._stop = self.inner_height
+        return self._draw()
 
     # Properties.
     @property
@@ -167,29 +346,84 @@ class Menu(Scroll, Title):
         :return: A :class:`int` object.
         :rtype: int
         """
-        return max(len(opt.name) for opt in self.options)
+        if self._widths is None:
+            self._widths = Counter(len(opt.name) for opt in self.options)
+        return max(self._widths, default=0)
+
+    @property
+    def lines(self) -> Sequence[str]:
+        """A sequence of :class:`str` objects used to display the panel
+        in the terminal. The lines are kept until the options or their
+        alignment change. While filtering, only the lines of the
+        matching options are shown, and they are looked up as they
+        are needed.
+
+        :return: A :class:`collections.abc.Sequence` object of
+            :class:`str` objects.
+        :rtype: collections.abc.Sequence
+        """
+        if self._option_lines is None:
+            self._option_lines = self._format_options(self.options)
+            self._shown_lines = None
+        if self._matches is None:
+            return self._option_lines
+        if self._shown_lines is None:
+            self._shown_lines = _ShownLines(self._option_lines, self._matches)
+        return self._shown_lines
 
     @property
-    def lines(self) -> list[str]:
-        """A :class:`list` of :class:`str` objects used to display
-        the panel in the terminal.
+    def option_align_h(self) -> str:
+        """The horizontal alignment of the options within the area
+        that would be highlighted when the option is highlighted.
+
+        :return: A :class:`str` object.
+        :rtype: str
+        """
+        return self._option_align_h
+
+    @option_align_h.setter
+    def option_align_h(self, value: str) -> None:
+        self._option_align_h = value
+        self._option_lines = None
 
-        :return: A :class:`list` object of :class:`str` objects.
+    @property
+    def options(self) -> list[Option]:
+        """The options available to the user. Changing the options
+        rebuilds the lines of the menu, so use
+        :meth:`thurible.Menu.replace_option` to change one option
+        rather than changing the list.
+
+        :return: A :class:`list` object of :class:`thurible.Option`
+            objects.
         :rtype: list
         """
-        lines = []
-        fwidth = self.field_width
-        align = '<'
-        if self.option_align_h == 'center':
-            align = '^'
-        if self.option_align_h == 'right':
-            align = '>'
+        return self._options
+
+    @options.setter
+    def options(self, value: Sequence[Option]) -> None:
+        self._options = list(value)
+        self._hotkey_index = None
+        self._matcher = None
+        self._option_lines = None
+        self._widths = None
+        if self._query is not None:
+            self._search()
 
-        for option in self.options:
-            line = f'{option.name:{align}{fwidth}}'
-            lines.append(line)
+    @property
+    def _fuzzy(self) -> FuzzyMatcher:
+        """The matcher used to filter the options."""
+        if self._matcher is None:
+            self._matcher = FuzzyMatcher([opt.name for opt in self.options])
+        return self._matcher
 
-        return lines
+    @property
+    def _hotkeys(self) -> HotkeyIndex:
+        """The index used to find options by their hotkeys."""
+        if self._hotkey_index is None:
+            self._hotkey_index = HotkeyIndex(
+                option.hotkey for option in self.options
+            )
+        return self._hotkey_index
 
     # Public methods.
     def action(self, key: Keystroke) -> tuple[str, str]:
@@ -204,6 +438,19 @@ class Menu(Scroll, Title):
         x = self.content_x
         lines = self.lines
         length = len(lines)
+        start = self._start
+        selected = self._selected
+        overflow = (self._overflow_top, self._overflow_bottom)
+
+        # Changing the filter changes which options are shown, so the
+        # whole menu is written again. If that doesn't show the
+        # highlighted option, the menu scrolls to it.
+        filter_handler = self._get_filter_handler(key)
+        if filter_handler:
+            filter_handler(key)
+            self._start = 0
+            self._stop = height
+            return data, self._draw()
 
         # Handle input.
         if repr(key) in self._active_keys:
@@ -222,12 +469,128 @@ class Menu(Scroll, Title):
                 y, x
             )
             self._overscroll(length, height)
-            update += self._visible(lines, width, y, x)
+
+            # If the menu didn't scroll, only the rows of the options
+            # that were and are selected need to be written.
+            if (
+                start == self._start
+                and overflow == (self._overflow_top, self._overflow_bottom)
+            ):
+                visible = range(min(self._stop, length) - start)
+                rows = sorted(
+                    row for row in {selected - start, self._selected - start}
+                    if row in visible
+                )
+                if selected == self._selected:
+                    rows = []
+                update += self._visible(lines, width, y, x, rows)
+            else:
+                update += self._visible(lines, width, y, x)
 
         # Return the results.
         return data, update
 
+    def replace_option(self, index: int, option: Option) -> str:
+        """Replace one of the options in the menu. Only that option is
+        formatted and written to the terminal, unless the new option
+        changes the width of the options.
+
+        :param index: The position of the option in the menu.
+        :param option: The new option.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        # Replace the option.
+        old = self.options[index]
+        fwidth = self.field_width
+        self.options[index] = option
+        self._matcher = None
+        widths = self._widths
+        if widths is not None:
+            widths[len(old.name)] -= 1
+            if not widths[len(old.name)]:
+                del widths[len(old.name)]
+            widths[len(option.name)] += 1
+
+        # Update the hotkeys.
+        if old.hotkey != option.hotkey and self._hotkey_index is not None:
+            self._hotkey_index.remove(index, old.hotkey)
+            self._hotkey_index.add(index, option.hotkey)
+        if old.hotkey != option.hotkey:
+            chars = self._hotkeys.chars
+            for char in set(old.hotkey or '') - chars:
+                self._active_keys.pop(f"'{char}'", None)
+            for char in set(option.hotkey or ''):
+                self._active_keys[f"'{char}'"] = self._hotkey
+
+        # While filtering, the option may no longer match, so the
+        # options are filtered and written again.
+        if self._query is not None:
+            self._option_lines = None
+            self._search()
+            return str(self)
+
+        # If the width of the options changed, every option has to be
+        # formatted and written again.
+        lines = self._option_lines
+        width = self.content_width
+        y = self.inner_y
+        x = self.content_x
+        if lines is None:
+            return ''
+        if self.field_width != fwidth:
+            self._option_lines = None
+            return self.clear_contents() + self._visible(
+                self.lines, width, y, x
+            )
+
+        # Otherwise, only the new option has to be.
+        lines[index] = self._format_options([option])[0]
+        if not self._start <= index < min(self._stop, len(lines)):
+            return ''
+        rows = [index - self._start]
+        update = self._clear_rows(rows, y, x, width)
+        update += self._visible(lines, width, y, x, rows)
+        return update
+
+    def update(self, msg: Message) -> str:
+        result = super().update(msg)
+        if isinstance(msg, ReplaceOption):
+            result += self.replace_option(msg.index, msg.option)
+        return result
+
     # Private action handlers.
+    def _filter_add(self, key: Optional[Keystroke] = None) -> str:
+        """Add a character to the filter."""
+        self._query = f'{self._query}{key}'
+        self._search()
+        return ''
+
+    def _filter_back(self, key: Optional[Keystroke] = None) -> str:
+        """Remove the last character from the filter."""
+        self._query = self._query[:-1] if self._query else ''
+        self._search()
+        return ''
+
+    def _filter_end(self, key: Optional[Keystroke] = None) -> str:
+        """Stop filtering the options."""
+        if self._matches:
+            self._selected = self._matches[self._selected]
+        elif self._matches is not None:
+            self._selected = 0
+        self._query = None
+        self._matches = None
+        self.footer_text = self._footer
+        return ''
+
+    def _filter_start(self, key: Optional[Keystroke] = None) -> str:
+        """Start filtering the options."""
+        self._footer = self.footer_text
+        self._query = ''
+        self._search()
+        return ''
+
     def _end(self, key: Optional[Keystroke] = None) -> str:
         """Select the last option and scroll to it."""
         length = len(self.lines)
@@ -244,24 +607,19 @@ class Menu(Scroll, Title):
         return ''
 
     def _hotkey(self, key: Optional[Keystroke] = None) -> str:
-        hotkeys = [option.hotkey for option in self.options]
-        length = len(self.options)
-        height = self.inner_height
-        self._selected = hotkeys.index(str(key))
-        if self._start > self._selected:
-            self._start = self._selected
-            self._stop = self._start + height
-        elif self._stop <= self._selected:
-            self._stop = self._selected
-            self._start = self._stop - height
-            if length > height and self._selected == length - 2:
-                self._start += 1
-                self._stop += 1
+        """Select the option with the hotkey that starts with the
+        characters typed.
+        """
+        index = self._hotkeys.press(str(key))
+        if index is None:
+            return str(key)
+        self._selected = index
+        self._scroll_to(index)
         return ''
 
     def _line_down(self, key: Optional[Keystroke] = None) -> str:
         """Select the next option."""
-        if self._selected < len(self.options) - 1:
+        if self._selected < len(self.lines) - 1:
             self._selected += 1
         if self._selected >= self._stop:
             self._start += 1
@@ -301,7 +659,11 @@ class Menu(Scroll, Title):
 
     def _select(self, key: Optional[Keystroke] = None) -> str:
         """Return the name of the selected option."""
-        return self.options[self._selected].name
+        if self._matches is None:
+            return self.options[self._selected].name
+        if not self._matches:
+            return ''
+        return self.options[self._matches[self._selected]].name
 
     # Private helper methods.
     def _color_selection(self) -> str:
@@ -310,6 +672,87 @@ class Menu(Scroll, Title):
             result = self._get_color(self.select_fg, self.select_bg)
         return result
 
+    def _draw(self) -> str:
+        """Draw the entire panel from the current scroll position."""
+        # Set up. The whole menu is drawn, so any overflow indicators
+        # are drawn again.
+        self._overflow_bottom = False
+        self._overflow_top = False
+        lines = self.lines
+        length = len(lines)
+        height = self.inner_height
+        width = self.content_width
+        y = self.inner_y
+        x = self.content_x
+        result = super().__str__()
+
+        # Create the display string and return.
+        y += self._align_v(self.content_align_v, length, height)
+        result, height, y = self._flow(result, length, height, width, y, x)
+        if self._selected >= self._stop:
+            self._scroll_to(self._selected)
+            result, height, y = self._flow(
+                result,
+                length,
+                self.inner_height,
+                width,
+                self.inner_y,
+                x
+            )
+        self._overscroll(length, height)
+        result += self._visible(lines, width, y, x)
+        return result
+
+    def _get_filter_handler(self, key: Keystroke) -> Optional[Callable]:
+        """Find the handler for a key that changes the filter."""
+        printable = (
+            not key.is_sequence
+            and len(key) == 1
+            and category(str(key)) != 'Cc'
+        )
+        if self._query is None:
+            if self.filter_key and printable and key == self.filter_key:
+                return self._filter_start
+        elif key.name == 'KEY_ESCAPE':
+            return self._filter_end
+        elif key.name in ('KEY_BACKSPACE', 'KEY_DELETE'):
+            return self._filter_back
+        elif printable:
+            return self._filter_add
+        return None
+
+    def _format_options(self, options: Sequence[Option]) -> list[str]:
+        """Format the names of options for display."""
+        fwidth = self.field_width
+        align = '<'
+        if self.option_align_h == 'center':
+            align = '^'
+        if self.option_align_h == 'right':
+            align = '>'
+        return [f'{option.name:{align}{fwidth}}' for option in options]
+
+    def _highlight(self, line: str, index: int) -> str:
+        """Underline the characters of an option that match the
+        filter.
+        """
+        assert self._query is not None
+        name = self.options[index].name
+        offset = 0
+        if self.option_align_h == 'center':
+            offset = (self.field_width - len(name)) // 2
+        elif self.option_align_h == 'right':
+            offset = self.field_width - len(name)
+
+        chars = list(line)
+        for pos in self._fuzzy.positions(index, self._query):
+            if 0 <= offset + pos < len(chars):
+                chars[offset + pos] = (
+                    self.term.underline
+                    + chars[offset + pos]
+                    + self.term.no_underline
+                )
+        return ''.join(chars)
+
     def _overscroll(self, length: int, height: int) -> None:
         if self._selected < 0:
             self._selected = 0
@@ -317,13 +760,46 @@ class Menu(Scroll, Title):
             self._selected = length - 1
         super()._overscroll(length, height)
 
-    def _visible(self, lines: list[str], width: int, y: int, x: int) -> str:
-        """Output the lines in the display."""
+    def _scroll_to(self, index: int) -> None:
+        """Scroll the menu so the option at the index is visible."""
+        height = self.inner_height
+        if self._start > index:
+            self._start = index
+            self._stop = self._start + height
+        elif self._stop <= index:
+            self._stop = index + 1
+            self._start = self._stop - height
+
+    def _search(self) -> None:
+        """Filter the options and show the filter in the footer."""
+        assert self._query is not None
+        self._matches = None
+        if self._query:
+            self._matches = self._fuzzy.search(self._query)
+        self._shown_lines = None
+        self._selected = 0
+        self.footer_text = f'{self.filter_key}{self._query}'
+
+    def _visible(
+        self,
+        lines: Sequence[str],
+        width: int,
+        y: int,
+        x: int,
+        rows: Optional[Iterable[int]] = None
+    ) -> str:
+        """Output the lines in the display. If rows are given, only
+        the lines in those rows of the display are output.
+        """
+        if rows is None:
+            rows = range(min(self._stop, len(lines)) - self._start)
+
         # Set the base colors for the menu options.
         update = self._get_color(self.fg, self.bg)
 
         # Create the visible options.
-        for i, line in enumerate(lines[self._start: self._stop]):
+        for i in rows:
+            line = lines[self._start + i]
             x_mod = self._align_h(self.content_align_h, len(line), width)
 
             # Use the selection colors if the option is selected. The
@@ -334,6 +810,8 @@ class Menu(Scroll, Title):
             opt_index = i + self._start
             if opt_index == self._selected:
                 update += self._color_selection()
+            if self._query and self._matches is not None:
+                line = self._highlight(line, self._matches[opt_index])
 
             # Create the option.
             update += self.term.move(y + i, x + x_mod) + line
@@ -350,3 +828,35 @@ class Menu(Scroll, Title):
         if self.fg or self.bg:
             update += self.term.normal
         return update
+
+
+# Private classes.
+class _ShownLines(Sequence[str]):
+    """The lines of the options that match a filter. The lines are
+    looked up when they are needed, so the time it takes to filter
+    doesn't depend on the number of matches.
+    """
+    def __init__(self, lines: Sequence[str], matches: Sequence[int]) -> None:
+        self.lines = lines
+        self.matches = matches
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, list[str]]:
+        if isinstance(index, slice):
+            return [self.lines[i] for i in self.matches[index]]
+        return self.lines[self.matches[index]]
+
+    def __len__(self) -> int:
+        return len(self.matches)
@@ -30,6 +30,11 @@ by the manager to the application.
 .. autoclass:: thurible.Update
 .. autoclass:: thurible.Tick
 .. autoclass:: thurible.NoTick
+.. autoclass:: thurible.Append
+.. autoclass:: thurible.ReplaceOption
+.. autoclass:: thurible.AddRows
+.. autoclass:: thurible.Filter
+.. autoclass:: thurible.Sort
 
 
 .. _response-messages:
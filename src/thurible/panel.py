@@ -330,8 +330,8 @@ and action handlers.
     :class:`str.`
 
 """
-from collections.abc import Callable
-from typing import Optional
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Optional
 
 from blessed import Terminal
 from blessed.keyboard import Keystroke
@@ -360,6 +360,29 @@ class PanelPaddingAndAlignmentSetError(Exception):
     """You cannot set both panel padding and alignment."""
 
 
+# Descriptors.
+class layout_property(property):
+    """A :class:`property` for the size or position of part of a panel.
+    The value is calculated the first time it's read and then kept
+    until an attribute that changes the layout of the panel is set.
+
+    Each class that overrides a layout property keeps its own value,
+    so an override can still build on the value from its parent class
+    through :func:`super`.
+    """
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        layout = obj.__dict__.setdefault('_layout', {})
+        try:
+            return layout[self]
+        except KeyError:
+            if self.fget is None:
+                raise AttributeError('unreadable attribute')
+            value = layout[self] = self.fget(obj)
+            return value
+
+
 # Base classes.
 class Message:
     """A base class to allow all messages to be identified."""
@@ -444,6 +467,25 @@ class Panel:
         objects can be found in the :ref:`sizing` section below.
 
     """
+    # Attributes that change the layout of the panel. Setting one of
+    # them clears the cached values of the layout properties.
+    _geometry = frozenset((
+        'height', 'width', 'origin_x', 'origin_y',
+        'panel_pad_bottom', 'panel_pad_left', 'panel_pad_right',
+        'panel_pad_top', 'panel_relative_height', 'panel_relative_width',
+        'frame_type', 'title_text', 'footer_text',
+        'content_pad_left', 'content_pad_right', 'content_relative_width',
+        '_overflow_bottom', '_overflow_top',
+    ))
+
+    # Attributes that aren't copied when the panel is pickled or sent
+    # to another process, mapped to functions that create new values
+    # for them.
+    _transient: dict[str, Callable[[], Any]] = {
+        'term': get_terminal,
+        '_layout': dict,
+    }
+
     # Magic methods.
     def __init__(
         self,
@@ -498,6 +540,27 @@ class Panel:
             and self.fg == other.fg
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Setting an attribute to the value it already has doesn't
+        # change the layout.
+        changed = name in self._geometry and (
+            name not in self.__dict__ or self.__dict__[name] != value
+        )
+        super().__setattr__(name, value)
+        if changed:
+            self.__dict__['_layout'] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in self._transient:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        for name, factory in self._transient.items():
+            self.__dict__[name] = factory()
+
     def __str__(self) -> str:
         """Return a string that will draw the entire display."""
         result = ''
@@ -518,7 +581,7 @@ class Panel:
         """
         return self._active_keys.copy()
 
-    @property
+    @layout_property
     def inner_height(self) -> int:
         """The number of rows in the terminal contained within the
         interior of the panel.
@@ -531,7 +594,7 @@ class Panel:
         height -= self._panel_pad_offset_bottom
         return height
 
-    @property
+    @layout_property
     def inner_width(self) -> int:
         """The number of columns in the terminal contained within the
         interior of the panel.
@@ -544,7 +607,7 @@ class Panel:
         width -= self._panel_pad_offset_right
         return width
 
-    @property
+    @layout_property
     def inner_x(self) -> int:
         """The left-most column in the terminal of the interior of the
         panel.
@@ -554,7 +617,7 @@ class Panel:
         """
         return self.origin_x + self._panel_pad_offset_left
 
-    @property
+    @layout_property
     def inner_y(self) -> int:
         """The top-most row in the terminal of the interior of the panel.
 
@@ -564,21 +627,32 @@ class Panel:
         return self.origin_y + self._panel_pad_offset_top
 
     @property
+    def time_to_flush(self) -> Optional[float]:
+        """The number of seconds until the panel has updates it held
+        back that are ready to be written by :meth:`Panel.flush`. If
+        the panel isn't holding back any updates, this is `None`.
+
+        :return: A :class:`float` object or `None`.
+        :rtype: float | NoneType
+        """
+        return None
+
+    @layout_property
     def _panel_pad_offset_bottom(self) -> int:
         offset = self.height * self.panel_pad_bottom
         return int(offset)
 
-    @property
+    @layout_property
     def _panel_pad_offset_left(self) -> int:
         offset = self.width * self.panel_pad_left
         return int(offset)
 
-    @property
+    @layout_property
     def _panel_pad_offset_right(self) -> int:
         offset = self.width * self.panel_pad_right
         return int(offset)
 
-    @property
+    @layout_property
     def _panel_pad_offset_top(self) -> int:
         offset = self.height * self.panel_pad_top
         return int(offset)
@@ -621,6 +695,18 @@ class Panel:
             result += self.term.normal
         return result
 
+    def flush(self) -> str:
+        """Write any updates the panel held back that are ready to be
+        written. Panels that limit how often they update, such as
+        :class:`thurible.Log`, hold back updates, and managers call
+        this when :attr:`Panel.time_to_flush` passes.
+
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        return ''
+
     def register_key(self, key: str, handler: Callable) -> None:
         """Declare the key presses the class will react to, and define
         the action the class will take when that key is pressed.
@@ -651,6 +737,20 @@ class Panel:
         """
         return ''
 
+    def update_many(self, msgs: Sequence[Message]) -> str:
+        """Act on several messages sent by the application at once.
+        Managers use this when more than one message for the panel
+        is waiting, so panels that can collapse the updates for those
+        messages into a single repaint should override it.
+
+        :param msgs: The messages sent by the application in the order
+            they were sent.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        return ''.join(self.update(msg) for msg in msgs)
+
     # Private helper methods.
     def _get_color(self, fg: str = '', bg: str = '') -> str:
         color = fg
@@ -895,7 +995,7 @@ class Frame(Panel):
             )
         return result
 
-    @property
+    @layout_property
     def frame_height(self) -> int:
         """The height in rows of the frame in the terminal.
 
@@ -904,7 +1004,7 @@ class Frame(Panel):
         """
         return super().inner_height
 
-    @property
+    @layout_property
     def frame_width(self) -> int:
         """The width in columns of the frame in the terminal.
 
@@ -913,7 +1013,7 @@ class Frame(Panel):
         """
         return super().inner_width
 
-    @property
+    @layout_property
     def frame_origin_x(self) -> int:
         """The left-most column of the frame in the terminal.
 
@@ -922,7 +1022,7 @@ class Frame(Panel):
         """
         return super().inner_x
 
-    @property
+    @layout_property
     def frame_origin_y(self) -> int:
         """The top-most row of the frame in the terminal.
 
@@ -931,28 +1031,28 @@ class Frame(Panel):
         """
         return super().inner_y
 
-    @property
+    @layout_property
     def inner_height(self) -> int:
         height = super().inner_height
         if self.frame_type:
             height -= 2
         return height
 
-    @property
+    @layout_property
     def inner_width(self) -> int:
         width = super().inner_width
         if self.frame_type:
             width -= 2
         return width
 
-    @property
+    @layout_property
     def inner_x(self) -> int:
         x = super().inner_x
         if self.frame_type:
             x += 1
         return x
 
-    @property
+    @layout_property
     def inner_y(self) -> int:
         y = super().inner_y
         if self.frame_type:
@@ -1070,7 +1170,7 @@ class Content(Frame):
         )
 
     # Properties.
-    @property
+    @layout_property
     def content_width(self) -> int:
         """The width available to content within the panel after
         padding has been taken into account.
@@ -1083,7 +1183,7 @@ class Content(Frame):
         width -= self._offset_right
         return width
 
-    @property
+    @layout_property
     def content_x(self) -> int:
         """The left-most column available to content within the panel
         after padding has been taken into account.
@@ -1096,7 +1196,7 @@ class Content(Frame):
         return x
 
     @property
-    def lines(self) -> list[str]:
+    def lines(self) -> Sequence[str]:
         """The lines available to be displayed in the panel.
 
         :return: A :class:`list` object containing each line
@@ -1108,12 +1208,12 @@ class Content(Frame):
         # protocol.
         return ['',]
 
-    @property
+    @layout_property
     def _offset_left(self) -> int:
         offset = super().inner_width * self.content_pad_left
         return int(offset)
 
-    @property
+    @layout_property
     def _offset_right(self) -> int:
         offset = super().inner_width * self.content_pad_right
         return int(offset)
@@ -1147,6 +1247,70 @@ class Content(Frame):
             y_mod = v_space
         return y_mod
 
+    def _can_scroll_rows(self, shift: int, height: int) -> bool:
+        """Determine whether the terminal can shift the rows of the
+        interior of the panel. Since the terminal shifts whole rows,
+        the panel must fill the width of the terminal.
+        """
+        term = self.term
+        return (
+            0 < abs(shift) < height
+            and self.origin_x == 0
+            and self.width == term.width
+            and self.frame_origin_x == 0
+            and self.frame_width == self.width
+            and bool(term.csr)
+            and bool(term.ind)
+            and bool(term.ri)
+        )
+
+    def _clear_rows(
+        self,
+        rows: Iterable[int],
+        y: int,
+        x: int,
+        width: int
+    ) -> str:
+        """Clear rows of the interior of the panel, redrawing the sides
+        of the frame on those rows.
+        """
+        rows = list(rows)
+        update = ''
+        if self.frame_type:
+            bg = self.frame_bg if self.frame_bg else self.bg
+            fg = self.frame_fg if self.frame_fg else self.fg
+            side = Box(self.frame_type).side
+            left = self.frame_origin_x
+            right = left + self.frame_width - 1
+            update += self._get_color(fg, bg)
+            for i in rows:
+                update += self.term.move(y + i, left) + side
+                update += self.term.move(y + i, right) + side
+            if fg or bg:
+                update += self.term.normal
+        update += self._get_color(self.fg, self.bg)
+        for i in rows:
+            update += self.term.move(y + i, x) + ' ' * width
+        if self.fg or self.bg:
+            update += self.term.normal
+        return update
+
+    def _scroll_rows(self, shift: int, y: int, height: int) -> str:
+        """Shift the rows of the interior of the panel using the
+        terminal's scrolling region. A positive shift moves the rows
+        up, and a negative shift moves them down.
+        """
+        term = self.term
+        top = y
+        bottom = y + height - 1
+        update: str = term.csr(top, bottom)
+        if shift > 0:
+            update += term.move(bottom, 0) + term.ind * shift
+        else:
+            update += term.move(top, 0) + term.ri * -shift
+        update += term.csr(0, term.height - 1)
+        return update
+
     def _set_content_relative_horizontal_dimensions(
         self,
         left: Optional[float] = None,
@@ -1217,7 +1381,7 @@ class Scroll(Content):
     ) -> None:
         super().__init__(*args, **kwargs)
 
-        self._lines: list[str] = []
+        self._lines: Sequence[str] = []
         self._ofbot = '[▼]'
         self._oftop = '[▲]'
         self._overflow_bottom = False
@@ -1240,7 +1404,7 @@ class Scroll(Content):
         return super().__eq__(other)
 
     # Property.
-    @property
+    @layout_property
     def inner_height(self) -> int:
         height = super().inner_height
         if self._overflow_bottom:
@@ -1249,7 +1413,7 @@ class Scroll(Content):
             height -= 1
         return height
 
-    @property
+    @layout_property
     def inner_y(self) -> int:
         y = super().inner_y
         if self._overflow_top:
@@ -1268,24 +1432,24 @@ class Scroll(Content):
         y = self.inner_y
         x = self.inner_x
         lines = self.lines
-        length = len(lines)
+        length = self._count_lines(lines, height + 1)
 
         # Handle input.
         if length <= height and key.name in self._active_keys:
             ...
         elif key.name in self._active_keys:
+            start = self._start
+            overflow = (self._overflow_top, self._overflow_bottom)
             action = self._active_keys[key.name]
             action()
-            update, height, y = self._flow(
-                update,
-                length,
+            update = self._move_view(
+                lines,
+                start,
+                overflow,
                 height,
                 width,
                 y, x
             )
-            self._overscroll(length, height)
-            update += self.clear_contents()
-            update += self._visible(lines, width, y, x)
         else:
             data = str(key)
 
@@ -1391,6 +1555,56 @@ class Scroll(Content):
             y += 1
         return update, height, y
 
+    def _move_view(
+        self,
+        lines: Sequence[str],
+        start: int,
+        overflow: tuple[bool, bool],
+        height: int,
+        width: int,
+        y: int,
+        x: int,
+        changed: Optional[int] = None
+    ) -> str:
+        """Update the display after the view has moved from the given
+        start line or the lines from the changed line on have changed.
+        The height, width, y, and x are those of the interior before
+        the view moved.
+        """
+        update = ''
+        length = self._count_lines(lines, self._stop + 2)
+        update, height, y = self._flow(update, length, height, width, y, x)
+        self._overscroll(length, height)
+
+        # If the view moved by less than a screen and the overflow
+        # indicators didn't change, have the terminal shift the
+        # lines that are still visible, and only write the new or
+        # changed ones.
+        shift = self._start - start
+        if (
+            overflow == (self._overflow_top, self._overflow_bottom)
+            and (
+                (changed is not None and not shift)
+                or self._can_scroll_rows(shift, height)
+            )
+        ):
+            rows: set[int] = set()
+            if shift > 0:
+                rows.update(range(height - shift, height))
+            elif shift < 0:
+                rows.update(range(-shift))
+            if changed is not None:
+                end = min(self._stop, length) - self._start
+                rows.update(range(max(changed - self._start, 0), end))
+            if shift:
+                update += self._scroll_rows(shift, y, height)
+            update += self._clear_rows(sorted(rows), y, x, width)
+            update += self._visible(lines, width, y, x, sorted(rows))
+        else:
+            update += self.clear_contents()
+            update += self._visible(lines, width, y, x)
+        return update
+
     def _overscroll(self, length: int, height: int) -> None:
         """Manage situations where the visible area is scrolled beyond
         the text.
@@ -1405,11 +1619,33 @@ class Scroll(Content):
             self._stop = length
             self._start = 0
 
-    def _visible(self, lines: list[str], width: int, y: int, x: int) -> str:
-        """Output the lines in the display."""
+    def _count_lines(self, lines: Sequence[str], limit: int) -> int:
+        """Count the lines of the content. If the lines can be counted
+        lazily, counting stops at the limit, since the display only
+        needs to know whether there are more lines than that.
+        """
+        if hasattr(lines, 'count_to'):
+            return lines.count_to(limit)
+        return len(lines)
+
+    def _visible(
+        self,
+        lines: Sequence[str],
+        width: int,
+        y: int,
+        x: int,
+        rows: Optional[Iterable[int]] = None
+    ) -> str:
+        """Output the lines in the display. If rows are given, only
+        the lines in those rows of the display are output.
+        """
+        if rows is None:
+            length = self._count_lines(lines, self._stop)
+            rows = range(min(self._stop, length) - self._start)
         update = ''
         update += self._get_color(self.fg, self.bg)
-        for i, line in enumerate(lines[self._start: self._stop]):
+        for i in rows:
+            line = lines[self._start + i]
             x_mod = self._align_h(self.content_align_h, len(line), width)
             update += self.term.move(y + i, x + x_mod) + line
         if self.fg or self.bg:
@@ -1559,7 +1795,7 @@ class Title(Frame):
                 result += self.term.normal
         return result
 
-    @property
+    @layout_property
     def inner_height(self) -> int:
         height = super().inner_height
         if self.frame_type is None and self.title_text:
@@ -1568,10 +1804,10 @@ class Title(Frame):
             height -= 1
         return height
 
-    @property
+    @layout_property
     def inner_y(self) -> int:
         y = super().inner_y
-        if self.frame_type is None and self.title:
+        if self.frame_type is None and self.title_text:
             y += 1
         return y
 
@@ -250,7 +250,32 @@ class Progress(Content, Title):
         :rtype: str
         """
         result = ''
+        if self._apply_update(msg):
+            result += self._make_display()
+        return result
+
+    def update_many(self, msgs: Sequence[Message]) -> str:
+        """Act on several messages sent by the application at once.
+        The progress bar and status messages are only redrawn once,
+        no matter how many of the messages changed them.
 
+        :param msgs: The messages sent by the application in the order
+            they were sent.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        result = ''
+        changed = [self._apply_update(msg) for msg in msgs]
+        if any(changed):
+            result += self._make_display()
+        return result
+
+    # Private helper methods.
+    def _apply_update(self, msg: Message) -> bool:
+        """Change the state of the panel in response to a message,
+        returning whether the display needs to be redrawn.
+        """
         # If a tick is received, advance the progress bar.
         if isinstance(msg, Tick):
             if self._notick and self.max_messages:
@@ -260,7 +285,7 @@ class Progress(Content, Title):
             if self.max_messages:
                 self._add_message(msg.message)
                 self._wrapped_width = -1
-            result += self._make_display()
+            return True
 
         # If a notick is received, update the status messages but
         # don't advance the progress bar.
@@ -270,11 +295,10 @@ class Progress(Content, Title):
             self._notick = True
             self._add_message(msg.message)
             self._wrapped_width = -1
-            result += self._make_display()
+            return True
 
-        return result
+        return False
 
-    # Private helper methods.
     def _add_message(self, msg) -> None:
         if self.timestamp:
             stamp = datetime.now() - self._t0
@@ -0,0 +1,467 @@
+"""
+render
+~~~~~~
+
+Tools managers use to write updates to the terminal.
+"""
+import os
+import re
+import sys
+from time import monotonic
+from typing import Optional
+
+from blessed import Terminal
+from wcwidth import wcwidth  # type: ignore[import-untyped]
+
+
+# Common values.
+# Matches the escape sequences the screen understands: control sequences,
+# character set selections, and other two character escapes.
+_sequence = re.compile(
+    r'\x1b\[([0-?]*[ -/]*)([@-~])'
+    r'|\x1b[()][0-9A-Za-z]'
+    r'|\x1b[^\[()]'
+)
+
+
+# Classes.
+class Renderer:
+    """Create a new :class:`thurible.render.Renderer` object. This
+    class collects the updates managers make to the terminal display
+    in a buffer and writes them in a single write no more than a
+    given number of times per second. This keeps a program that sends
+    many updates from flooding the terminal with small writes.
+
+    :param term: A :class:`blessed.Terminal` instance for the terminal
+        the updates are written to.
+    :param fps: (Optional.) The maximum number of times per second
+        the updates are written to the terminal. If it's zero, updates
+        are written as soon as :meth:`Renderer.flush` is called. It
+        defaults to 60.
+    :param diff: (Optional.) Whether to pass the updates through a
+        :class:`thurible.render.Screen`, so only the parts of the
+        terminal that changed are written. This is ignored if the
+        terminal doesn't support styling. It defaults to false.
+    :return: A :class:`thurible.render.Renderer` object.
+    :rtype: thurible.render.Renderer
+    :usage:
+        To create a :class:`thurible.render.Renderer` object that
+        writes to the terminal thirty times a second:
+
+        .. testcode::
+
+            from thurible.render import Renderer
+            from thurible.util import get_terminal
+
+            renderer = Renderer(get_terminal(), fps=30)
+
+    """
+    def __init__(
+        self,
+        term: Terminal,
+        fps: float = 60.0,
+        diff: bool = False
+    ) -> None:
+        self.term = term
+        self.fps = fps
+        self.screen: Optional[Screen] = None
+        if diff and term.does_styling:
+            self.screen = Screen(term)
+
+        self._buffer: list[str] = []
+        self._fd = self._get_fd(term)
+        self._last = 0.0
+
+    # Properties.
+    @property
+    def pending(self) -> bool:
+        """Whether there are updates waiting to be written.
+
+        :return: A :class:`bool` object.
+        :rtype: bool
+        """
+        return bool(self._buffer)
+
+    @property
+    def time_to_frame(self) -> float:
+        """The number of seconds until the buffer can next be written
+        to the terminal.
+
+        :return: A :class:`float` object.
+        :rtype: float
+        """
+        if not self.fps:
+            return 0.0
+        remaining = self._last + 1 / self.fps - monotonic()
+        return max(remaining, 0.0)
+
+    # Public methods.
+    def flush(self, force: bool = False) -> bool:
+        """Write the buffered updates to the terminal if enough time
+        has passed since the last write.
+
+        :param force: (Optional.) Write the buffered updates even if
+            not enough time has passed since the last write.
+        :return: Whether anything was written as a :class:`bool`.
+        :rtype: bool
+        """
+        if not self._buffer or (not force and self.time_to_frame):
+            return False
+        data = ''.join(self._buffer)
+        self._buffer.clear()
+        if self.screen:
+            data = self.screen.render(data)
+        self._write(data)
+        self._last = monotonic()
+        return True
+
+    def write(self, update: str) -> None:
+        """Add an update to the buffer.
+
+        :param update: The update to write to the terminal.
+        :return: None.
+        :rtype: NoneType
+        """
+        if update:
+            self._buffer.append(update)
+
+    # Private helper methods.
+    def _get_fd(self, term: Terminal) -> Optional[int]:
+        """Get the file descriptor for the terminal, if the updates
+        can be written to it directly.
+        """
+        if not term.is_a_tty:
+            return None
+        try:
+            return term.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _write(self, data: str) -> None:
+        """Write the data to the terminal."""
+        if self._fd is None:
+            print(data, end='', flush=True)
+            return
+
+        encoding = getattr(self.term.stream, 'encoding', None)
+        encoded = data.encode(encoding or sys.getdefaultencoding())
+        view = memoryview(encoded)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+
+class Screen:
+    """Create a new :class:`thurible.render.Screen` object. This class
+    keeps a copy of what is shown in the terminal, so updates can be
+    compared to it. Only the cells of the terminal the updates change
+    are written, which makes redrawing a whole panel to change a few
+    characters cost about as much as changing those characters.
+
+    The updates are read for cursor movement, color and style changes,
+    and clearing the terminal. Any other escape sequence means the
+    screen can't be sure what the terminal shows, so those updates are
+    written as they are, and the next update redraws the whole
+    terminal from the screen's copy.
+
+    :param term: A :class:`blessed.Terminal` instance for the terminal
+        the updates are written to.
+    :return: A :class:`thurible.render.Screen` object.
+    :rtype: thurible.render.Screen
+    :usage:
+        To only write the changes made by redrawing a panel:
+
+        .. testcode::
+
+            from thurible import Splash
+            from thurible.render import Screen
+            from thurible.util import get_terminal
+
+            term = get_terminal()
+            screen = Screen(term)
+            splash = Splash('spam')
+            first = screen.render(str(splash))
+            splash.content = 'eggs'
+            second = screen.render(str(splash))
+
+    """
+    def __init__(self, term: Terminal) -> None:
+        self.term = term
+        self.height = term.height
+        self.width = term.width
+
+        self._cells = self._blank()
+        self._valid = False
+
+    # Public methods.
+    def invalidate(self) -> None:
+        """Forget what the terminal shows, so the next update redraws
+        the whole terminal.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        self._valid = False
+
+    def render(self, update: str) -> str:
+        """Apply an update to the screen, returning the shortest
+        update that makes the terminal match the screen.
+
+        :param update: The update to write to the terminal.
+        :return: A :class:`str` object.
+        :rtype: str
+        """
+        if (self.term.height, self.term.width) != (self.height, self.width):
+            self.height = self.term.height
+            self.width = self.term.width
+            self._cells = self._blank()
+            self._valid = False
+
+        cells = [row[:] for row in self._cells]
+        scrolls: list[tuple[int, int, int]] = []
+        if not self._apply(update, cells, scrolls):
+            self._cells = cells
+            self._valid = False
+            return update
+
+        # Scrolling the terminal is cheaper than redrawing the rows
+        # that were scrolled, so scroll the terminal's copy the same
+        # way before comparing it to the new cells.
+        if self._valid:
+            old = [row[:] for row in self._cells]
+            result = ''
+            for top, bottom, count in scrolls:
+                self._scroll(old, top, bottom, count)
+                result += self._scroll_update(top, bottom, count)
+            result += self._diff(old, cells)
+        else:
+            result = self.term.clear + self._diff(self._blank(), cells)
+        self._cells = cells
+        self._valid = True
+        return result
+
+    # Private helper methods.
+    def _apply(
+        self,
+        update: str,
+        cells: list[list[tuple[str, str]]],
+        scrolls: list[tuple[int, int, int]]
+    ) -> bool:
+        """Apply the update to the cells, adding any scrolling of the
+        terminal to the scrolls. Return false if the update contains
+        an escape sequence the screen doesn't understand, which means
+        the cells may not match the terminal.
+        """
+        y = x = 0
+        top, bottom = 0, self.height - 1
+        attr = ''
+        pos = 0
+        known = True
+        # The reset added to the end of the update lets the loop handle
+        # any text after the last escape sequence.
+        for match in _sequence.finditer(update + '\x1b[0m'):
+            # Line feeds move the cursor down, scrolling the scrolling
+            # region if the cursor is at the bottom of it.
+            text = update[pos:match.start()].split('\n')
+            y, x = self._put(text[0], cells, y, x, attr)
+            for part in text[1:]:
+                if y == bottom:
+                    self._scroll(cells, top, bottom, 1, scrolls)
+                else:
+                    y = min(y + 1, self.height - 1)
+                y, x = self._put(part, cells, y, 0, attr)
+            pos = match.end()
+            seq = match.group()
+            params, final = match.group(1, 2)
+
+            # Reverse index moves the cursor up, scrolling the scrolling
+            # region if the cursor is at the top of it.
+            if seq == '\x1bM':
+                if y == top:
+                    self._scroll(cells, top, bottom, -1, scrolls)
+                else:
+                    y = max(y - 1, 0)
+                continue
+
+            # Character set selections only come from resetting the
+            # style, which the SGR that follows them handles.
+            if final is None and seq[1] in '()':
+                continue
+            if final is None:
+                known = False
+                continue
+
+            # Private parameters and intermediate bytes change what a
+            # control sequence means, so the screen can't follow them.
+            if params.strip('0123456789;'):
+                known = False
+                continue
+            nums = [int(n) if n else 0 for n in params.split(';')]
+
+            # Select graphic rendition.
+            if final == 'm':
+                if not any(nums):
+                    attr = ''
+                else:
+                    attr += seq
+
+            # Set the scrolling region.
+            elif final == 'r':
+                nums += [0, 0]
+                top = max(nums[0] - 1, 0)
+                bottom = min(nums[1] or self.height, self.height) - 1
+                y = x = 0
+
+            # Cursor movement.
+            elif final in 'Hf':
+                y = max((nums + [0])[0] - 1, 0)
+                x = max((nums + [0, 0])[1] - 1, 0)
+            elif final == 'A':
+                y = max(y - max(nums[0], 1), 0)
+            elif final == 'B':
+                y += max(nums[0], 1)
+            elif final == 'C':
+                x += max(nums[0], 1)
+            elif final == 'D':
+                x = max(x - max(nums[0], 1), 0)
+            elif final == 'G':
+                x = max(nums[0] - 1, 0)
+            elif final == 'd':
+                y = max(nums[0] - 1, 0)
+
+            # Clear the screen.
+            elif final == 'J' and nums[0] == 2:
+                cells[:] = self._blank()
+
+            else:
+                known = False
+        return known
+
+    def _blank(self) -> list[list[tuple[str, str]]]:
+        """Create the cells for an empty terminal."""
+        return [[('', ' ')] * self.width for _ in range(self.height)]
+
+    def _diff(
+        self,
+        old: list[list[tuple[str, str]]],
+        new: list[list[tuple[str, str]]]
+    ) -> str:
+        """Create the update that turns the old cells into the new."""
+        result: list[str] = []
+        cursor: Optional[tuple[int, int]] = None
+        shown = ''
+        for y, (old_row, new_row) in enumerate(zip(old, new)):
+            if old_row == new_row:
+                continue
+            x = 0
+            while x < self.width:
+                if old_row[x] == new_row[x]:
+                    x += 1
+                    continue
+
+                # The second half of a wide character is drawn by the
+                # first half.
+                while x and new_row[x][1] == '':
+                    x -= 1
+
+                if cursor != (y, x):
+                    result.append(self.term.move(y, x))
+                attr, char = new_row[x]
+                if attr != shown:
+                    result.append(self.term.normal + attr)
+                    shown = attr
+                result.append(char)
+                x += 1
+                while x < self.width and new_row[x][1] == '':
+                    x += 1
+                cursor = (y, x) if x < self.width else None
+        if shown:
+            result.append(self.term.normal)
+        return ''.join(result)
+
+    def _scroll(
+        self,
+        cells: list[list[tuple[str, str]]],
+        top: int,
+        bottom: int,
+        count: int,
+        scrolls: Optional[list[tuple[int, int, int]]] = None
+    ) -> None:
+        """Scroll the rows from top to bottom up by count rows, or down
+        if count is negative, adding the scroll to the scrolls.
+        """
+        rows = cells[top:bottom + 1]
+        blanks = [[('', ' ')] * self.width for _ in range(abs(count))]
+        if count > 0:
+            rows = rows[count:] + blanks
+        else:
+            rows = blanks + rows[:count]
+        cells[top:bottom + 1] = rows[:bottom + 1 - top]
+
+        if scrolls is None:
+            return
+        if scrolls and scrolls[-1][:2] == (top, bottom) and (
+            (scrolls[-1][2] > 0) == (count > 0)
+        ):
+            count += scrolls.pop()[2]
+        scrolls.append((top, bottom, count))
+
+    def _scroll_update(self, top: int, bottom: int, count: int) -> str:
+        """Create the update that scrolls the terminal."""
+        term = self.term
+        result: str = term.csr(top, bottom)
+        if count > 0:
+            result += term.move(bottom, 0) + term.ind * count
+        else:
+            result += term.move(top, 0) + term.ri * -count
+        result += term.csr(0, self.height - 1)
+        return result
+
+    def _put(
+        self,
+        text: str,
+        cells: list[list[tuple[str, str]]],
+        y: int,
+        x: int,
+        attr: str
+    ) -> tuple[int, int]:
+        """Write text to the cells, returning where the cursor is left.
+        """
+        for char in text:
+            if char == '\r':
+                x = 0
+                continue
+            if char == '\b':
+                x = max(x - 1, 0)
+                continue
+
+            width = wcwidth(char)
+            if width < 0:
+                continue
+            if y >= self.height:
+                continue
+
+            # Zero width characters combine with the character before
+            # them.
+            if width == 0:
+                if x and x <= self.width:
+                    prev_attr, prev = cells[y][x - 1]
+                    cells[y][x - 1] = (prev_attr, prev + char)
+                continue
+
+            if x + width <= self.width:
+                row = cells[y]
+
+                # Overwriting half of a wide character erases the rest
+                # of it.
+                if row[x][1] == '' and x:
+                    row[x - 1] = (row[x - 1][0], ' ')
+                end = x + width
+                if end < self.width and row[end][1] == '':
+                    row[end] = (row[end][0], ' ')
+
+                row[x] = (attr, char)
+                if width == 2:
+                    row[x + 1] = (attr, '')
+            x += width
+        return y, x
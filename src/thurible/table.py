@@ -7,10 +7,29 @@ An object for displaying a data table in a terminal.
 from __future__ import annotations
 
 import unicodedata as ucd
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
 from dataclasses import astuple, dataclass, fields
-from typing import TYPE_CHECKING, Any, Optional, Protocol, Sequence
+from functools import lru_cache
+from heapq import merge
+from itertools import compress
+from numbers import Integral
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Optional,
+    Protocol,
+    Sequence,
+    Union,
+    cast,
+    overload
+)
 
-from thurible.panel import Scroll, Title
+from blessed.keyboard import Keystroke
+
+from thurible.panel import Message, Scroll, Title
 from thurible.util import Box as Frame
 
 
@@ -18,6 +37,333 @@ if TYPE_CHECKING:
     from _typeshed import DataclassInstance
 
 
+# Common values.
+# The number of formatted rows kept in memory.
+CACHE_SIZE = 256
+# The number of rows formatted together.
+CHUNK_SIZE = 64
+# The number of values with control characters kept after the control
+# characters are replaced.
+SANITIZE_CACHE_SIZE = 4096
+# The most records looked at to determine the widths of the fields.
+WIDTH_SAMPLE = 1000
+# Replaces the control characters in values with spaces, so they don't
+# affect the terminal. Unicode doesn't change which characters are
+# control characters, and they are all below U+00A0.
+CONTROL_CHARS = {
+    n: ' ' for n in range(0xa0) if ucd.category(chr(n)) == 'Cc'
+}
+
+
+# Data sources.
+class ColumnSource(Protocol):
+    """The methods an object needs to provide the data for a
+    :class:`thurible.Table` one column at a time. Each column must be
+    a sequence that can be indexed and sliced, such as a :class:`list`,
+    an :class:`array.array`, or a NumPy array.
+    """
+    @property
+    def field_names(self) -> list[str]:
+        """The names of the columns."""
+        ...
+
+    def __len__(self) -> int:
+        """The number of rows."""
+        ...
+
+    def column(self, name: str) -> Sequence[Any]:
+        """The values in a column."""
+        ...
+
+
+class Columns:
+    """Create a new :class:`thurible.table.Columns` object. This
+    provides the data for a :class:`thurible.Table` from a mapping of
+    field names to the values in that field.
+
+    :param columns: A mapping of the names of the fields to the
+        sequences of values in each field. Each sequence must be the
+        same length.
+    :return: A :class:`thurible.table.Columns` object.
+    :rtype: thurible.table.Columns
+    :usage:
+        To create a table from two columns of data:
+
+        .. testcode::
+
+            from array import array
+            import thurible
+
+            columns = {
+                'name': ['Graham', 'Michael', 'John'],
+                'count': array('l', (1, 2, 3)),
+            }
+            table = thurible.Table(columns)
+
+    """
+    def __init__(self, columns: Mapping[str, Sequence[Any]]) -> None:
+        self.columns = columns
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            reason = 'The columns must be the same length.'
+            raise ValueError(reason)
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    # Properties.
+    @property
+    def field_names(self) -> list[str]:
+        """The names of the columns.
+
+        :return: A :class:`list` object of :class:`str` objects.
+        :rtype: list
+        """
+        return list(self.columns)
+
+    # Public methods.
+    def column(self, name: str) -> Sequence[Any]:
+        """The values in a column.
+
+        :param name: The name of the column.
+        :return: The sequence of values in the column.
+        :rtype: collections.abc.Sequence
+        """
+        return self.columns[name]
+
+
+class Records:
+    """Create a new :class:`thurible.table.Records` object. This
+    provides the data for a :class:`thurible.Table` from a sequence
+    of dataclasses, one column at a time.
+
+    :param records: A sequence of dataclasses.
+    :return: A :class:`thurible.table.Records` object.
+    :rtype: thurible.table.Records
+    """
+    def __init__(self, records: Sequence[DataclassInstance]) -> None:
+        self.records = records
+        self._columns: dict[str, FieldView] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # Properties.
+    @property
+    def field_names(self) -> list[str]:
+        """The names of the fields of the dataclasses.
+
+        :return: A :class:`list` object of :class:`str` objects.
+        :rtype: list
+        """
+        return [f.name for f in fields(self.records[0])]
+
+    # Public methods.
+    def column(self, name: str) -> Sequence[Any]:
+        """The values of a field of the dataclasses.
+
+        :param name: The name of the field.
+        :return: A :class:`thurible.table.FieldView` object.
+        :rtype: thurible.table.FieldView
+        """
+        if name not in self._columns:
+            self._columns[name] = FieldView(self.records, name)
+        return self._columns[name]
+
+
+class FieldView(Sequence[Any]):
+    """Create a new :class:`thurible.table.FieldView` object. This
+    is a sequence of the values of one field of a sequence of
+    dataclasses. The values are read from the dataclasses when they
+    are asked for.
+
+    :param records: A sequence of dataclasses.
+    :param name: The name of the field.
+    :return: A :class:`thurible.table.FieldView` object.
+    :rtype: thurible.table.FieldView
+    """
+    def __init__(
+        self,
+        records: Sequence[DataclassInstance],
+        name: str
+    ) -> None:
+        self.records = records
+        self.name = name
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [getattr(r, self.name) for r in self.records[index]]
+        return getattr(self.records[index], self.name)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+# Available update messages.
+@dataclass
+class AddRows(Message):
+    """Create a new :class:`thurible.AddRows` object. This object
+    is a command message used to instruct the currently displayed
+    :class:`thurible.Table` to add the records given in the message
+    to the end of its records.
+
+    :param records: The records to add. If the table was created with
+        a sequence of dataclasses, this is a sequence of dataclasses
+        with the same fields. Otherwise, it's a mapping of each field
+        name to the sequence of values to add to that field. See
+        :meth:`thurible.Table.extend`.
+    :return: A :class:`thurible.AddRows` object.
+    :rtype: thurible.AddRows
+    :usage:
+        To add two records to a table created from columns:
+
+        .. testcode::
+
+            from thurible import AddRows
+
+            msg = AddRows({'name': ['Terry', 'Eric'], 'count': [4, 5]})
+
+    """
+    records: Union[Sequence[DataclassInstance], Mapping[str, Sequence[Any]]]
+
+
+@dataclass
+class Filter(Message):
+    """Create a new :class:`thurible.Filter` object. This object
+    is a command message used to instruct the currently displayed
+    :class:`thurible.Table` to only show the records with a value in
+    a field the predicate accepts.
+
+    :param name: (Optional.) The name of the field to filter on. If
+        it's empty, the filter is removed.
+    :param predicate: (Optional.) A function that is passed a value
+        of the field and returns whether to show the record.
+    :return: A :class:`thurible.Filter` object.
+    :rtype: thurible.Filter
+    :usage:
+        To only show the records with an age over fifty:
+
+        .. testcode::
+
+            from thurible import Filter
+
+            msg = Filter('age', lambda age: age > 50)
+
+    """
+    name: str = ''
+    predicate: Optional[Callable[[Any], bool]] = None
+
+
+@dataclass
+class Sort(Message):
+    """Create a new :class:`thurible.Sort` object. This object
+    is a command message used to instruct the currently displayed
+    :class:`thurible.Table` to sort its records by a field.
+
+    :param name: (Optional.) The name of the field to sort by. If it's
+        empty, the records are shown in their original order.
+    :param reverse: (Optional.) Whether to sort in descending order.
+        It defaults to false.
+    :return: A :class:`thurible.Sort` object.
+    :rtype: thurible.Sort
+    :usage:
+        To sort the records by age:
+
+        .. testcode::
+
+            from thurible import Sort
+
+            msg = Sort('age')
+
+    """
+    name: str = ''
+    reverse: bool = False
+
+
+# Utility classes.
+class TableLines(Sequence[str]):
+    """Create a new :class:`thurible.table.TableLines` object. This
+    class is a sequence of the lines used to display a
+    :class:`thurible.Table`. Rather than formatting every record at
+    once, it only formats the records whose lines are asked for, so
+    the time it takes to show the first screen of a table doesn't
+    depend on the number of records. Records are formatted
+    :data:`thurible.table.CHUNK_SIZE` at a time, one column at a
+    time.
+
+    :param table: The table being displayed.
+    :param cache_size: (Optional.) The number of formatted records
+        kept in memory. It defaults to 256.
+    :return: A :class:`thurible.table.TableLines` object.
+    :rtype: thurible.table.TableLines
+    """
+    def __init__(self, table: Table, cache_size: int = CACHE_SIZE) -> None:
+        self.table = table
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, list[str]] = OrderedDict()
+        self._divider: Optional[str] = None
+        self._framed = bool(table.inner_frame and table.frame_type)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, list[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('line index out of range')
+
+        # When the cells are framed, every other line divides records.
+        if self._framed:
+            index, divider = divmod(index, 2)
+            if divider:
+                if self._divider is None:
+                    self._divider = self.table._format_divider()
+                return self._divider
+
+        # Format the chunk of records if it isn't already.
+        chunk, offset = divmod(index, CHUNK_SIZE)
+        if chunk in self._cache:
+            self._cache.move_to_end(chunk)
+            return self._cache[chunk][offset]
+        start = chunk * CHUNK_SIZE
+        stop = min(start + CHUNK_SIZE, self.table._row_count)
+        lines = self.table._format_rows(start, stop)
+        self._cache[chunk] = lines
+        while len(self._cache) > 1 and len(self._cache) * CHUNK_SIZE > (
+            self.cache_size
+        ):
+            self._cache.popitem(last=False)
+        return lines[offset]
+
+    def __len__(self) -> int:
+        length = self.table._row_count
+        if self._framed and length:
+            length = length * 2 - 1
+        return length
+
+    # Public methods.
+    def discard(self, row: int) -> None:
+        """Forget the formatted records from the given record on, so
+        they are formatted again the next time they are displayed.
+
+        :param row: The index of the first record to forget.
+        :return: None.
+        :rtype: NoneType
+        """
+        first = row // CHUNK_SIZE
+        for chunk in [chunk for chunk in self._cache if chunk >= first]:
+            del self._cache[chunk]
+
+
 # Classes.
 class Table(Scroll, Title):
     """Create a new :class:`thurible.Table` object. This class displays
@@ -26,15 +372,23 @@ class Table(Scroll, Title):
     it can also take those parameters and has those public methods,
     properties, and active keys.
 
-    :param records: A sequence of dataclasses that will be displayed
-        within the panel. The data held by the dataclass can be of
-        any type, but it must be able to be coerced into a :class:str.
+    :param records: The data that will be displayed within the
+        panel. This can be a sequence of dataclasses, a mapping of
+        field names to the sequences of values in each field, or a
+        :class:`thurible.table.ColumnSource`. Mappings and column
+        sources are read one column at a time, which avoids creating
+        an object for each record. The data can be of any type, but
+        it must be able to be coerced into a :class:str.
     :param inner_frame: (Optional.) Whether there should be a visible
         frame around each cell in the panel.
     :param content_align_h: (Optional.) The horizontal alignment
         of the contents of the panel. It defaults to "left".
     :param content_align_v: (Optional.) The vertical alignment
         of the contents of the panel. It defaults to "top".
+    :param scroll_h: (Optional.) Whether the fields that don't fit
+        in the panel are scrolled to with the left and right arrow
+        keys rather than narrowed to fit. Only the fields that are
+        visible are formatted. It defaults to false.
     :return: A :class:`thurible.Table` object.
     :rtype: thurible.Table
     :usage:
@@ -58,18 +412,46 @@ class Table(Scroll, Title):
 
         Information on the sizing of :class:`thurible.Table`
         objects can be found in the :ref:`sizing` section below.
+    :active keys:
+        This class defines the following :ref:`active keys<active>`
+        when `scroll_h` is true:
+
+            *   KEY_LEFT: Scroll one field left in the records.
+            *   KEY_RIGHT: Scroll one field right in the records.
 
     """
+    # The formatted lines and sorted orders of the records are rebuilt
+    # rather than sent with the panel. The filter predicate can't be
+    # sent, so only the filter it made is kept.
+    _transient: dict[str, Callable[[], Any]] = {
+        **Scroll._transient,
+        '_column_source': lambda: None,
+        '_filter_by': lambda: ('', None),
+        '_lines_key': lambda: None,
+        '_order': lambda: None,
+        '_sort_orders': dict,
+        '_table_lines': lambda: None,
+    }
+
     def __init__(
         self,
-        records: Sequence[DataclassInstance],
+        records: Union[
+            Sequence[DataclassInstance],
+            Mapping[str, Sequence[Any]],
+            ColumnSource,
+        ],
         inner_frame: bool = False,
         content_align_h: str = 'left',
         content_align_v: str = 'top',
+        scroll_h: bool = False,
         *args, **kwargs
     ) -> None:
+        self._column_source: Optional[ColumnSource] = None
+        self._lines_key: Optional[tuple] = None
+        self._table_lines: Optional[TableLines] = None
         self.records = records
         self.inner_frame = inner_frame
+        self.scroll_h = scroll_h
         kwargs['content_align_h'] = content_align_h
         kwargs['content_align_v'] = content_align_v
         super().__init__(*args, **kwargs)
@@ -77,6 +459,11 @@ class Table(Scroll, Title):
         self._char_true = '█'
         self._char_false = '▁'
 
+        # Register the keyboard input the class responds to.
+        if self.scroll_h:
+            self.register_key('KEY_LEFT', self._field_left)
+            self.register_key('KEY_RIGHT', self._field_right)
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, self.__class__):
             return NotImplemented
@@ -84,30 +471,22 @@ class Table(Scroll, Title):
             super().__eq__(other)
             and self.records == other.records
             and self.inner_frame == other.inner_frame
+            and self.scroll_h == other.scroll_h
             and self._char_true == other._char_true
             and self._char_false == other._char_false
             and self._ofr == other._ofr
         )
 
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        if self._sort_by[0] or self._mask is not None:
+            self._reorder()
+
     def __str__(self) -> str:
         """Return a string that will draw the entire panel."""
-        # Set up.
-        lines = self.lines
-        length = len(lines)
-        height = self.inner_height
-        width = self.inner_width
-        y = self.inner_y
-        x = self.inner_x
         self._start = 0
-        self._stop = height
-        result = super().__str__()
-
-        # Create the display string and return.
-        y += self._align_v(self.content_align_v, length, height)
-        result, height, y = self._flow(result, length, height, width, y, x)
-        self._overscroll(length, height)
-        result += self._visible(lines, width, y, x)
-        return result
+        self._stop = self.inner_height
+        return self._draw(super().__str__())
 
     # Properties.
     @property
@@ -120,14 +499,18 @@ class Table(Scroll, Title):
         :rtype: list
         """
         if '_field_names' not in self.__dict__:
-            self._field_names = [f.name for f in fields(self.records[0])]
+            self._field_names = self._source.field_names
         return self._field_names
 
     @property
     def field_widths(self) -> list[int]:
         """The width in characters of each field in the table, as
         determined by the longest value for this field found in
-        the dataclasses.
+        the records. If there are more than
+        :data:`thurible.table.WIDTH_SAMPLE` records, only that many
+        records spread evenly through the records are used. If the
+        fields don't fit in the panel, the widest are narrowed, unless
+        the table scrolls horizontally.
 
         :return: A :class:`list` object containing each width as an
             :class:`int`.
@@ -136,79 +519,337 @@ class Table(Scroll, Title):
         """
         if '_field_widths' not in self.__dict__:
             fnames = self.field_names
-            fwidths = self._calc_field_widths(self.records, fnames)
-            if sum(fwidths) + len(fwidths) - 1 > self.inner_width:
-                fwidths = self._calc_field_widths_overflow(fwidths)
-            self._field_widths = fwidths
+            self._max_widths = self._calc_field_widths(fnames)
+            self._field_widths = self._fit_field_widths(self._max_widths)
         return self._field_widths
 
     @property
-    def lines(self) -> list[str]:
+    def lines(self) -> TableLines:
         """The lines of text available to be displayed in the panel
         after they have been wrapped to fit the width of the
-        interior of the panel.
+        interior of the panel. Records are only formatted when their
+        lines are displayed.
 
-        :return: A :class:`list` object containing each line of
-            text as a :class:`str`.
-        :rtype: list
+        :return: A :class:`thurible.table.TableLines` object
+            containing each line of text as a :class:`str`.
+        :rtype: thurible.table.TableLines
         """
-        lines = []
+        key = (
+            self.inner_width,
+            tuple(self.field_widths),
+            self._shown_fields,
+            self.content_align_h,
+            self.frame_type,
+            self.inner_frame,
+        )
+        if self._table_lines is None or self._lines_key != key:
+            self._lines_key = key
+            self._table_lines = TableLines(self)
+        return self._table_lines
 
-        align = '<'
-        if self.content_align_h == 'center':
-            align = '^'
-        elif self.content_align_h == 'right':
-            align = '>'
-        width = self.inner_width
-        fnames = self.field_names
+    @property
+    def records(self) -> Union[
+        Sequence[DataclassInstance],
+        Mapping[str, Sequence[Any]],
+        ColumnSource,
+    ]:
+        """The data displayed in the table.
+
+        :return: A sequence of dataclasses, a mapping of field names
+            to sequences, or a :class:`thurible.table.ColumnSource`.
+        :rtype: collections.abc.Sequence | collections.abc.Mapping |
+            thurible.table.ColumnSource
+        """
+        return self._records
+
+    @records.setter
+    def records(self, value: Union[
+        Sequence[DataclassInstance],
+        Mapping[str, Sequence[Any]],
+        ColumnSource,
+    ]) -> None:
+        self._records = value
+        self._column_source = None
+        self._owned = False
+        self._first_field = 0
+        self._filter_by: tuple[str, Optional[Callable[[Any], bool]]] = (
+            '', None
+        )
+        self._mask: Optional[bytearray] = None
+        self._order: Optional[array[int]] = None
+        self._sort_by: tuple[str, bool] = ('', False)
+        self._sort_orders: dict[
+            tuple[str, bool],
+            tuple[array[int], Callable[[Any], Any]]
+        ] = {}
+        self._table_lines = None
+        self.__dict__.pop('_field_names', None)
+        self.__dict__.pop('_field_widths', None)
+        self.__dict__.pop('_max_widths', None)
+
+    @property
+    def _row_count(self) -> int:
+        """The number of records shown."""
+        if self._order is not None:
+            return len(self._order)
+        return len(self._source)
+
+    @property
+    def _shown_fields(self) -> range:
+        """The indices of the fields that fit in the panel, starting
+        with the first field shown.
+        """
         fwidths = self.field_widths
-        if self.frame_type:
-            frame = Frame(self.frame_type)
-
-        for record in self.records:
-            line = ''
-            seperator = ' '
-            if self.inner_frame and self.frame_type:
-                seperator = frame.mver
-            for fname, fwidth in zip(fnames, fwidths):
-                line += self._get_field_value(record, fname, fwidth)
-                if fname != fnames[-1]:
-                    line += seperator
-            line = f'{line:{align}{width}}'
-            if self.frame_type:
-                line = frame.mver + line + frame.mver
-            lines.append(line)
-
-            if self.inner_frame and self.frame_type:
-                line = ''
-                seperator = frame.mid
-                for fname, fwidth in zip(fnames, fwidths):
-                    line += frame.mhor * fwidth
-                    if fname != fnames[-1]:
-                        line += seperator
-                line = f'{line:{frame.mhor}{align}{width}}'
-                line = frame.lside + line + frame.rside
-                lines.append(line)
+        if not self.scroll_h:
+            return range(len(fwidths))
+        first = self._first_field
+        avail = self.inner_width + 1
+        stop = first + 1
+        used = fwidths[first] + 1
+        for fwidth in fwidths[stop:]:
+            used += fwidth + 1
+            if used > avail:
+                break
+            stop += 1
+        return range(first, stop)
 
-        if self.inner_frame and self.frame_type:
-            lines = lines[:-1]
-        return lines
+    @property
+    def _source(self) -> ColumnSource:
+        """The data of the table, read one column at a time."""
+        source = self._column_source
+        if source is None:
+            records = self.records
+            if isinstance(records, Mapping):
+                source = Columns(records)
+            elif hasattr(records, 'column'):
+                source = cast(ColumnSource, records)
+            else:
+                source = Records(cast('Sequence[DataclassInstance]', records))
+            self._column_source = source
+        return source
 
-    # Private helper methods.
-    def _calc_field_widths(
+    # Public methods.
+    def action(self, key: Keystroke) -> tuple[str, str]:
+        # Scrolling through the fields moves every line, so it's
+        # handled here rather than as a vertical scroll.
+        if self.scroll_h and key.name in ('KEY_LEFT', 'KEY_RIGHT'):
+            return '', self._active_keys[key.name](key)
+        return super().action(key)
+
+    def extend(self, records: Union[
+        Sequence[DataclassInstance],
+        Mapping[str, Sequence[Any]],
+    ]) -> str:
+        """Add records to the end of the records of the table. The
+        widths of the fields only grow if the new records need more
+        room, and only the new records that are visible are written
+        to the terminal unless the fields grew.
+
+        The data the table was created with isn't changed. The first
+        time records are added, the table copies its data, keeping
+        columns in :class:`array.array` objects as arrays and putting
+        other columns in lists. The new records are checked before
+        any are added, so records that can't be added leave the table
+        as it was.
+
+        :param records: The records to add. If the table was created
+            with a sequence of dataclasses, this is a sequence of
+            dataclasses with the same fields. Otherwise, it's a mapping
+            of each field name to the sequence of values to add to
+            that field.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        return self._extend([records,])
+
+    def filter(
         self,
-        records: Sequence[DataclassInstance],
-        names: list[str],
-    ) -> list[int]:
-        result = []
-        for name in names:
-            data = [getattr(record, name) for record in records]
-            width = 1
-            if not isinstance(data[0], bool):
-                width = self._calc_max_width(data)
-            result.append(width)
+        name: str = '',
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> str:
+        """Only show the records with a value in a field the predicate
+        accepts. The records aren't copied. Only the positions of the
+        records that are shown are kept.
+
+        :param name: (Optional.) The name of the field to filter on.
+            If it's empty, the filter is removed.
+        :param predicate: (Optional.) A function that is passed a
+            value of the field and returns whether to show the record.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        self._filter_by = (name, predicate)
+        self._mask = None
+        if name and predicate:
+            column = self._source.column(name)
+            self._mask = bytearray(map(bool, map(predicate, column)))
+        self._reorder()
+        return self._redraw()
+
+    def sort(self, name: str = '', reverse: bool = False) -> str:
+        """Sort the records by a field. The records aren't copied.
+        Only the order of their positions is kept, and the order for
+        each field and direction is kept, so sorting by a field again
+        doesn't have to compare the records. Records with equal values
+        keep their order, and records without a value, where the value
+        is None, are shown last, or first when descending. Values that
+        can't be compared to each other are grouped by type.
+
+        :param name: (Optional.) The name of the field to sort by. If
+            it's empty, the records are shown in their original order.
+        :param reverse: (Optional.) Whether to sort in descending
+            order. It defaults to false.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        self._sort_by = (name, reverse)
+        self._reorder()
+        return self._redraw()
+
+    def update(self, msg: Message) -> str:
+        result = super().update(msg)
+        if isinstance(msg, AddRows):
+            result += self.extend(msg.records)
+        elif isinstance(msg, Filter):
+            result += self.filter(msg.name, msg.predicate)
+        elif isinstance(msg, Sort):
+            result += self.sort(msg.name, msg.reverse)
+        return result
+
+    def update_many(self, msgs: Sequence[Message]) -> str:
+        """Act on several messages sent by the application at once.
+        The records of consecutive :class:`thurible.AddRows` messages
+        are added at once, so the table is only written once.
+
+        :param msgs: The messages sent by the application in the order
+            they were sent.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        result = ''
+        pages: list[Any] = []
+        for msg in msgs:
+            if isinstance(msg, AddRows):
+                pages.append(msg.records)
+                continue
+            if pages:
+                result += self._extend(pages)
+                pages = []
+            result += self.update(msg)
+        if pages:
+            result += self._extend(pages)
         return result
 
+    # Private action handlers.
+    def _field_left(self, key: Optional[Keystroke] = None) -> str:
+        """Scroll one field left in the records."""
+        if self._first_field <= 0:
+            return ''
+        self._first_field -= 1
+        return self._redraw_fields()
+
+    def _field_right(self, key: Optional[Keystroke] = None) -> str:
+        """Scroll one field right in the records."""
+        if self._shown_fields.stop >= len(self.field_names):
+            return ''
+        self._first_field += 1
+        return self._redraw_fields()
+
+    # Private helper methods.
+    def _add_records(self, page: Any) -> None:
+        """Add a page of records checked by
+        :meth:`thurible.Table._check_records` to the data of the table.
+        """
+        data = self._records
+        if isinstance(data, list):
+            data.extend(page)
+        else:
+            columns = cast(dict[str, Any], data)
+            for name, values in page.items():
+                columns[name].extend(values)
+
+    def _check_records(self, records: Any) -> Any:
+        """Check that records can be added to the table, and put them
+        in the form they are stored in.
+        """
+        names = self.field_names
+        data = self._records
+
+        # Records of dataclasses need the fields of the table.
+        if isinstance(data, list):
+            if isinstance(records, (str, Mapping)) or not isinstance(
+                records, Sequence
+            ):
+                reason = 'Records must be added as a sequence of dataclasses.'
+                raise TypeError(reason)
+            for record in records:
+                if not all(hasattr(record, name) for name in names):
+                    reason = f'Records must have the fields {names}.'
+                    raise ValueError(reason)
+            return list(records)
+
+        # Columns need a value for each field, and the values need to
+        # fit in arrays.
+        columns = cast(dict[str, Any], data)
+        if not isinstance(records, Mapping):
+            reason = 'Records must be added as a mapping of columns.'
+            raise TypeError(reason)
+        if set(records) != set(names):
+            reason = f'Records must have the fields {names}.'
+            raise ValueError(reason)
+        Columns(records)
+        page: dict[str, Union[list[Any], array]] = {}
+        for name in names:
+            column = columns[name]
+            if isinstance(column, array):
+                try:
+                    page[name] = array(column.typecode, records[name])
+                except (OverflowError, TypeError):
+                    reason = f'The values for {name} don\'t fit its array.'
+                    raise TypeError(reason)
+            else:
+                page[name] = list(records[name])
+        return page
+
+    def _own_records(self) -> None:
+        """Copy the data of the table, so records can be added without
+        changing the data the table was created with.
+        """
+        if self._owned:
+            return
+        records = self._records
+        source = self._source
+        data: Union[list[Any], dict[str, Any]]
+        if isinstance(records, Sequence) and not hasattr(records, 'column'):
+            data = list(records)
+        else:
+            data = {}
+            for name in self.field_names:
+                column = source.column(name)
+                if isinstance(column, array):
+                    data[name] = array(column.typecode, column)
+                else:
+                    data[name] = list(column)
+        self._records = data
+        self._column_source = None
+        self._owned = True
+
+    def _calc_column_width(self, data: Sequence[Any]) -> int:
+        """Determine the width of a field from its values."""
+        if isinstance(data[0], bool):
+            return 1
+        return self._calc_max_width(data)
+
+    def _calc_field_widths(self, names: list[str]) -> list[int]:
+        return [
+            self._calc_column_width(self._sample(self._source.column(name)))
+            for name in names
+        ]
+
     def _calc_field_widths_overflow(self, fwidths: list[int]) -> list[int]:
         # We don't want to affect the small fields, so calculate the
         # size of an average field to use to determine which fields are
@@ -244,8 +885,7 @@ class Table(Scroll, Title):
 
     def _calc_max_width(self, data: Sequence[Any]) -> int:
         """Determine the length of the longest string."""
-        strings = (str(datum) for datum in data)
-        return max(len(s) for s in strings)
+        return max(map(len, map(str, data)))
 
     def _frame(
         self,
@@ -270,7 +910,7 @@ class Table(Scroll, Title):
         result += self._get_color(foreground, background)
 
         if self.inner_frame and self.frame_type:
-            fwidths = self.field_widths[:-1]
+            fwidths = [self.field_widths[i] for i in self._shown_fields][:-1]
             x = origin_x + 1
             bottom_y = origin_y + height - 1
             for fwidth in fwidths:
@@ -283,37 +923,298 @@ class Table(Scroll, Title):
             result += self.term.normal
         return result
 
-    def _get_field_value(
-        self,
-        record: DataclassInstance,
-        field: str,
-        width: int
-    ) -> str:
+    def _draw(self, update: str) -> str:
+        """Add the visible records to the update, keeping the position
+        of the view.
+        """
+        # Set up.
+        lines = self.lines
+        length = len(lines)
+        height = self.inner_height
+        width = self.inner_width
+        y = self.inner_y
+        x = self.inner_x
+
+        # Create the display string and return.
+        y += self._align_v(self.content_align_v, length, height)
+        update, height, y = self._flow(update, length, height, width, y, x)
+        self._overscroll(length, height)
+        update += self._visible(lines, width, y, x)
+        return update
+
+    def _extend(self, pages: Sequence[Any]) -> str:
+        """Add pages of records to the table, and write the new
+        records that are visible.
+        """
+        # Set up.
+        lines = self._table_lines
+        length = len(lines) if lines is not None else 0
+        first = len(self._source)
+        self._own_records()
+        checked = [self._check_records(records) for records in pages]
+        for page in checked:
+            self._add_records(page)
+        self._column_source = None
+
+        # Keep the widths of the fields and the order of the records
+        # up to date with the new records.
+        reflow = self._grow_field_widths(first)
+        if self._sort_by[0] or self._mask is not None:
+            self._extend_order(first)
+        elif lines is not None:
+            lines.discard(first)
+
+        # If the table hasn't been displayed, there is nothing to
+        # update.
+        if lines is None:
+            return ''
+
+        # When the fields grew or the records are aligned to something
+        # other than the top, every visible record moves.
+        start = self._start
+        height = self.inner_height
+        self._stop = start + height
+        if reflow or (self.content_align_v != 'top' and length < height):
+            return self._draw(super().__str__())
+
+        # Otherwise, only write the new records. Sorted records can be
+        # added anywhere, so the whole view is written for them.
+        changed = start if self._sort_by[0] else length
+        overflow = (self._overflow_top, self._overflow_bottom)
+        return self._move_view(
+            self.lines,
+            start,
+            overflow,
+            height,
+            self.inner_width,
+            self.inner_y,
+            self.inner_x,
+            changed
+        )
+
+    def _extend_order(self, first: int) -> None:
+        """Add the records from first on to the order the records are
+        shown in.
+        """
+        source = self._source
+        length = len(source)
+
+        # Filter the new records. The predicate isn't sent with the
+        # panel, so after being sent, all new records are shown.
+        if self._mask is not None:
+            name, predicate = self._filter_by
+            if predicate is not None:
+                column = source.column(name)
+                self._mask.extend(map(bool, map(predicate, column[first:])))
+            else:
+                self._mask.extend(b'\x01' * (length - first))
+
+        # Merge the new records into the order of the sorted field.
+        # The orders of the other fields are sorted again if needed.
+        # If the new values can't be compared the same way as the old
+        # ones, the field is sorted again.
+        sort_by = self._sort_by
+        orders = {}
+        if sort_by in self._sort_orders:
+            name, reverse = sort_by
+            column = source.column(name)
+            old, key = self._sort_orders[sort_by]
+            added, added_key = _sort_positions(
+                column, range(first, length), reverse
+            )
+            if added_key is key:
+                try:
+                    orders[sort_by] = (array('Q', merge(
+                        old,
+                        added,
+                        key=lambda i: key(column[i]),
+                        reverse=reverse
+                    )), key)
+                except TypeError:
+                    pass
+            if sort_by not in orders:
+                orders[sort_by] = _sort_positions(
+                    column, range(length), reverse
+                )
+        self._sort_orders = orders
+        self._reorder()
+
+    def _fit_field_widths(self, widths: list[int]) -> list[int]:
+        """Shrink the widths of the fields if they don't fit in the
+        panel. If the table scrolls horizontally, only the fields
+        wider than the panel are shrunk.
+        """
+        if self.scroll_h:
+            return [min(w, self.inner_width) for w in widths]
+        fwidths = widths[:]
+        if sum(fwidths) + len(fwidths) - 1 > self.inner_width:
+            fwidths = self._calc_field_widths_overflow(fwidths)
+        return fwidths
+
+    def _format_divider(self) -> str:
+        """Format the line dividing records when the cells are
+        framed.
+        """
+        assert self.frame_type
+        frame = Frame(self.frame_type)
+        align = self._get_align()
+        width = self.inner_width
+        fwidths = self.field_widths
+        line = frame.mid.join(
+            frame.mhor * fwidths[i] for i in self._shown_fields
+        )
+        line = f'{line:{frame.mhor}{align}{width}}'
+        return frame.lside + line + frame.rside
+
+    def _format_rows(self, start: int, stop: int) -> list[str]:
+        """Format the records from start to stop as lines of the
+        table, one column at a time.
+        """
+        source = self._source
+        order = self._order
+        fnames = self.field_names
+        fwidths = self.field_widths
+        columns = []
+        for i in self._shown_fields:
+            column = source.column(fnames[i])
+            fwidth = fwidths[i]
+            if order is None:
+                values = column[start:stop]
+            else:
+                values = [column[i] for i in order[start:stop]]
+            columns.append([self._get_field_value(v, fwidth) for v in values])
+
+        align = self._get_align()
+        width = self.inner_width
+        seperator = ' '
+        sides = ''
+        if self.inner_frame and self.frame_type:
+            seperator = Frame(self.frame_type).mver
+        if self.frame_type:
+            sides = Frame(self.frame_type).mver
+        return [
+            f'{sides}{seperator.join(cells):{align}{width}}{sides}'
+            for cells in zip(*columns)
+        ]
+
+    def _get_align(self) -> str:
+        """Get the format specification for the alignment of the
+        table.
+        """
         align = '<'
-        value = getattr(record, field)
+        if self.content_align_h == 'center':
+            align = '^'
+        elif self.content_align_h == 'right':
+            align = '>'
+        return align
 
+    def _get_field_value(self, value: Any, width: int) -> str:
+        align = '<'
         if isinstance(value, bool) and value:
             value = self._char_true
         elif isinstance(value, bool):
             value = self._char_false
-        elif value and isinstance(value, int):
+        elif value and isinstance(value, Integral):
             align = '>'
 
         value = str(value)
         if len(value) > width:
             value = value[:width - 3] + self._ofr
 
-        for i, char in enumerate(value):
-            if ucd.category(char) == 'Cc':
-                value = value[0:i] + ' ' + value[i + 1:]
+        if not value.isprintable():
+            value = _sanitize(value)
 
         return f'{value:{align}{width}}'
 
-    def _visible(self, lines: list[str], width: int, y: int, x: int) -> str:
-        """Output the lines in the display."""
+    def _grow_field_widths(self, first: int) -> bool:
+        """Widen the fields that the records from first on need more
+        room for. Return whether the widths of the fields changed.
+        """
+        if '_field_widths' not in self.__dict__:
+            return False
+        source = self._source
+        widths = self._max_widths
+        for i, name in enumerate(self.field_names):
+            data = self._sample(source.column(name)[first:])
+            if len(data):
+                widths[i] = max(widths[i], self._calc_column_width(data))
+        fwidths = self._fit_field_widths(widths)
+        grew = fwidths != self._field_widths
+        self._field_widths = fwidths
+        return grew
+
+    def _redraw(self) -> str:
+        """Write the records to the terminal again, starting from the
+        first record.
+        """
+        self._overflow_bottom = False
+        self._overflow_top = False
+        self._start = 0
+        self._stop = self.inner_height
+        if self.inner_frame and self.frame_type:
+            return self._draw(super().__str__())
+        return self._draw(self.clear_contents())
+
+    def _redraw_fields(self) -> str:
+        """Write the records to the terminal again after the fields
+        shown changed, keeping the position of the view. If the cells
+        are framed, the frame is written again, too.
+        """
+        if self.inner_frame and self.frame_type:
+            return self._draw(super().__str__())
+        return self._draw(self.clear_contents())
+
+    def _reorder(self) -> None:
+        """Determine the order the records are shown in."""
+        name, reverse = self._sort_by
+        length = len(self._source)
+        order: Optional[array[int]] = None
+        if name:
+            if (name, reverse) not in self._sort_orders:
+                column = self._source.column(name)
+                self._sort_orders[(name, reverse)] = _sort_positions(
+                    column, range(length), reverse
+                )
+            order = self._sort_orders[(name, reverse)][0]
+
+        # Filter the records.
+        mask = self._mask
+        if mask is not None and order is None:
+            order = array('Q', compress(range(length), mask))
+        elif mask is not None and order is not None:
+            kept = order
+            order = array('Q', (i for i in kept if mask[i]))
+
+        self._order = order
+        self._table_lines = None
+
+    def _sample(self, column: Sequence[Any]) -> Sequence[Any]:
+        """Choose the values in a column used to determine the width
+        of the field.
+        """
+        length = len(column)
+        if length <= WIDTH_SAMPLE:
+            return column
+        step = (length - 1) / (WIDTH_SAMPLE - 1)
+        return [column[round(i * step)] for i in range(WIDTH_SAMPLE)]
+
+    def _visible(
+        self,
+        lines: Sequence[str],
+        width: int,
+        y: int,
+        x: int,
+        rows: Optional[Iterable[int]] = None
+    ) -> str:
+        """Output the lines in the display. If rows are given, only
+        the lines in those rows of the display are output.
+        """
+        if rows is None:
+            rows = range(min(self._stop, len(lines)) - self._start)
         update = ''
         update += self._get_color(self.fg, self.bg)
-        for i, line in enumerate(lines[self._start: self._stop]):
+        for i in rows:
+            line = lines[self._start + i]
             x_mod = self._align_h(self.content_align_h, len(line), width)
             if self.frame_type:
                 x_mod -= 1
@@ -321,3 +1222,40 @@ class Table(Scroll, Title):
         if self.fg or self.bg:
             update += self.term.normal
         return update
+
+
+# Private functions.
+def _by_type(value: Any) -> tuple[bool, str, Any]:
+    """Sort values after grouping them by type, with None last."""
+    return value is None, type(value).__name__, value
+
+
+def _by_value(value: Any) -> tuple[bool, Any]:
+    """Sort values with None last."""
+    return value is None, value
+
+
+def _sort_positions(
+    column: Sequence[Any],
+    positions: Iterable[int],
+    reverse: bool = False
+) -> tuple[array[int], Callable[[Any], Any]]:
+    """Sort the positions of records by their values in a column,
+    returning the order and the key used to compare the values. Ties
+    keep the order of the records. If the values can't be compared to
+    each other, they are grouped by type.
+    """
+    positions = list(positions)
+    by: Callable[[Any], Any] = _by_value
+    try:
+        order = sorted(positions, key=lambda i: by(column[i]), reverse=reverse)
+    except TypeError:
+        by = _by_type
+        order = sorted(positions, key=lambda i: by(column[i]), reverse=reverse)
+    return array('Q', order), by
+
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def _sanitize(value: str) -> str:
+    """Replace the control characters in a value with spaces."""
+    return value.translate(CONTROL_CHARS)
@@ -4,13 +4,509 @@ text
 
 An object for displaying a text area in a terminal.
 """
+import codecs
+import mmap
+import os
+import textwrap
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from itertools import accumulate, islice
+from pathlib import Path
+from threading import Event, RLock, Thread
+from typing import Any, Optional, Union, overload
+
 from blessed import Terminal
 from blessed.keyboard import Keystroke
 
-from thurible.panel import Scroll, Title
+from thurible.panel import Message, Scroll, Title
 from thurible.util import Box
 
 
+# Common values.
+# How many wrapped paragraphs of text are kept in memory.
+CACHE_SIZE = 256
+
+# How many lines past the ones needed for display are wrapped ahead
+# of time, so scrolling doesn't have to wait for them.
+READ_AHEAD = 50
+
+# How many paragraphs are counted in the background before letting
+# the panel wrap the lines it needs.
+COUNT_BATCH = 100
+
+# How many bytes from the start of a file are checked when testing
+# whether the file can be decoded.
+SNIFF_SIZE = 2 ** 16
+
+# How much of the text is looked at when counting the lines of many
+# short paragraphs at once.
+INDEX_BLOCK = 2 ** 16
+
+
+# Available update message.
+@dataclass
+class Append(Message):
+    """Create a new :class:`thurible.text.Append` object. This
+    object is a command message used to instruct the currently
+    displayed :class:`thurible.Text` to add the text given in the
+    message to the end of its content.
+
+    :param text: The text to add to the panel.
+    :return: An :class:`thurible.Append` object.
+    :rtype: thurible.Append
+    :usage:
+        To create a new :class:`thurible.Append` object:
+
+        .. testcode::
+
+            import thurible
+
+            append = thurible.Append('spam\n')
+
+    """
+    text: str
+
+
+# Utility classes.
+class MappedText:
+    """Create a new :class:`thurible.text.MappedText` object. This
+    class gives the text of a file to a :class:`thurible.Text` without
+    reading the whole file into memory. The file is mapped into memory
+    with :mod:`mmap`, and the text is decoded a paragraph at a time
+    as it is needed. Since the operating system only loads the pages
+    of the file that are read, and can drop them again when memory is
+    needed, very large files can be browsed using little memory.
+
+    Positions in the text are positions in the bytes of the file, so
+    the encoding must be one where a newline is a single byte that
+    can't be part of another character, such as UTF-8 or Latin-1.
+
+    :param path: The path to the file.
+    :param encoding: (Optional.) The encoding of the file. It
+        defaults to UTF-8.
+    :param errors: (Optional.) How to handle bytes that can't be
+        decoded. See :meth:`bytes.decode`. It defaults to "replace".
+    :return: A :class:`thurible.text.MappedText` object.
+    :rtype: thurible.text.MappedText
+    :usage:
+        To browse a file in a :class:`thurible.Text`::
+
+            import thurible
+            from thurible.text import MappedText
+
+            text = thurible.Text(MappedText('spam.txt'))
+
+        The map is kept until :meth:`thurible.text.MappedText.close`
+        is called. It can also be used as a context manager, which
+        closes it on exit::
+
+            with MappedText('spam.txt') as content:
+                first = content[:80]
+
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        encoding: str = 'utf_8',
+        errors: str = 'replace'
+    ) -> None:
+        if '\n'.encode(encoding) != b'\n':
+            reason = f'Encoding {encoding} is not compatible with ASCII.'
+            raise ValueError(reason)
+        self.path = Path(path)
+        self.encoding = encoding
+        self.errors = errors
+        self._map = self._open()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return (
+            self.path == other.path
+            and self.encoding == other.encoding
+            and self.errors == other.errors
+        )
+
+    def __enter__(self) -> 'MappedText':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getitem__(self, index: slice) -> str:
+        return self._map[index].decode(self.encoding, self.errors)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_map']
+        return state
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._map = self._open()
+
+    def __str__(self) -> str:
+        return self[:]
+
+    # Public methods.
+    def close(self) -> None:
+        """Unmap the file.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def find(self, sub: str, start: int = 0) -> int:
+        """Find the position of a string in the text.
+
+        :param sub: The string to find.
+        :param start: (Optional.) The position to start looking from.
+            It defaults to the start of the text.
+        :return: The position of the string or -1 if it isn't found.
+        :rtype: int
+        """
+        return self._map.find(sub.encode(self.encoding), start)
+
+    def is_decodable(self, size: int = SNIFF_SIZE) -> bool:
+        """Check whether the start of the file can be decoded with the
+        encoding without errors. Only the start of the file is checked,
+        so checking doesn't read the whole file.
+
+        :param size: (Optional.) The number of bytes to check. It
+            defaults to 65,536.
+        :return: Whether the start of the file can be decoded.
+        :rtype: bool
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding)('strict')
+        try:
+            decoder.decode(self._map[:size], final=size >= len(self))
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    # Private helper methods.
+    def _open(self) -> Union[mmap.mmap, bytes]:
+        """Map the file into memory. Empty files can't be mapped, so
+        they are given as empty bytes.
+        """
+        with open(self.path, 'rb') as fh:
+            if not os.fstat(fh.fileno()).st_size:
+                return b''
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class WrappedLines(Sequence[str]):
+    """Create a new :class:`thurible.text.WrappedLines` object. This
+    class is a sequence of the lines of a text after the text has been
+    wrapped to a width. Rather than wrapping the whole text at once,
+    it only wraps the paragraphs it needs to find the lines that are
+    asked for, so the time it takes to show the first screen of a text
+    doesn't depend on the length of the text.
+
+    It keeps an index of where each paragraph starts and how many
+    lines it wraps to. Once lines have been asked for, the rest of
+    the text is counted in a background thread, so the total number
+    of lines is usually known by the time it is needed.
+
+    Lines past the part of the text that has been counted, such as
+    the end of the text, can only be found by counting the lines of
+    every paragraph before them. Paragraphs of printable ASCII are
+    counted without :meth:`blessed.Terminal.wrap`, which is much
+    faster, but other text is wrapped by the terminal. The index uses
+    sixteen bytes for each paragraph, so it grows with the length of
+    the text.
+
+    :param text: The text to wrap. This can be a :class:`str` or a
+        :class:`thurible.text.MappedText`.
+    :param width: The width to wrap the text to.
+    :param term: The :class:`blessed.Terminal` used to wrap the text.
+    :param cache_size: (Optional.) The number of wrapped paragraphs
+        kept in memory. It defaults to 256.
+    :param background: (Optional.) Whether to count the lines of the
+        text in a background thread. It defaults to true.
+    :return: A :class:`thurible.text.WrappedLines` object.
+    :rtype: thurible.text.WrappedLines
+    :usage:
+        To wrap a text and get its first line:
+
+        .. testcode::
+
+            from thurible.text import WrappedLines
+            from thurible.util import get_terminal
+
+            lines = WrappedLines('spam eggs bacon', 5, get_terminal())
+            print(lines[0])
+
+        .. testoutput::
+
+            spam
+
+    """
+    def __init__(
+        self,
+        text: Union[str, MappedText],
+        width: int,
+        term: Terminal,
+        cache_size: int = CACHE_SIZE,
+        background: bool = True
+    ) -> None:
+        self.text = text
+        self.width = width
+        self.term = term
+        self.cache_size = cache_size
+        self.background = background
+
+        # Private attributes.
+        self._appended: list[str] = []
+        self._base: Optional[int] = None
+        self._cache: OrderedDict[int, list[str]] = OrderedDict()
+        self._counter: Optional[Thread] = None
+        self._done = not text
+        self._ends = array('Q')
+        self._lock = RLock()
+        self._open = False
+        self._starts = array('Q', (0,))
+        self._slow_until = 0
+        self._stopped = Event()
+        self._wrapper = _PlainWrapper(width)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, list[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or self.count_to(index + 1) <= index:
+            raise IndexError('line index out of range')
+        paragraph = bisect_right(self._ends, index)
+        first = self._ends[paragraph - 1] if paragraph else 0
+        return self._wrapped(paragraph)[index - first]
+
+    def __len__(self) -> int:
+        with self._lock:
+            while not self._done:
+                self._index_block()
+            return self._count
+
+    # Public methods.
+    def append(self, text: str) -> int:
+        """Add text to the end of the text. Only the new text is
+        wrapped, along with the last paragraph of the existing text
+        if it didn't end with a newline.
+
+        :param text: The text to add.
+        :return: The index of the first line that changed.
+        :rtype: int
+        """
+        with self._lock:
+            while not self._done:
+                self._index_block()
+            if self._base is None:
+                size = len(self.text)
+                self._base = len(self._ends)
+                self._open = bool(size) and self.text[size - 1:] != '\n'
+
+            # If the last paragraph didn't end, the new text continues
+            # it, so it has to be wrapped again.
+            old: list[str] = []
+            if self._open and self._ends:
+                paragraph = len(self._ends) - 1
+                old = self._wrapped(paragraph)
+                text = self._source(paragraph) + text
+                self._ends.pop()
+                self._cache.pop(paragraph, None)
+                if paragraph < self._base:
+                    self._base = paragraph
+                else:
+                    self._appended.pop()
+
+            # Wrap the new paragraphs.
+            first = self._count
+            paragraphs = text.split('\n')
+            self._open = bool(paragraphs[-1])
+            if not self._open:
+                paragraphs.pop()
+            for paragraph_text in paragraphs:
+                lines = self._wrap(paragraph_text)
+                self._store(len(self._ends), lines)
+                self._ends.append(self._count + len(lines))
+                self._appended.append(paragraph_text)
+
+            # Lines at the start of a continued paragraph that wrap the
+            # same way didn't change.
+            if old and paragraphs:
+                new = self._wrapped(len(self._ends) - len(paragraphs))
+                for old_line, new_line in zip(old, new):
+                    if old_line != new_line:
+                        break
+                    first += 1
+            return first
+
+    def count_to(self, limit: int) -> int:
+        """Count the lines of the text, stopping once the limit is
+        reached. This allows the panel to tell whether the text fills
+        the display without wrapping the whole text.
+
+        :param limit: The most lines to count.
+        :return: The number of lines, or the limit if there are more
+            lines than that.
+        :rtype: int
+        """
+        with self._lock:
+            while not self._done and self._count < limit + READ_AHEAD:
+                self._index_next(store=True)
+            count = self._count
+        if self.background and not self._done:
+            self._count_in_background()
+        return min(count, limit)
+
+    def stop(self) -> None:
+        """Stop counting the lines in the background.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        self._stopped.set()
+
+    # Private properties.
+    @property
+    def _count(self) -> int:
+        """The number of lines counted so far."""
+        return self._ends[-1] if self._ends else 0
+
+    # Private helper methods.
+    def _count_in_background(self) -> None:
+        """Start a thread to count the rest of the lines."""
+        if self._counter is None:
+            self._counter = Thread(target=self._count_rest, daemon=True)
+            self._counter.start()
+
+    def _count_rest(self) -> None:
+        """Count the rest of the lines, a batch of paragraphs at a
+        time so the panel can still get the lines it needs.
+        """
+        while not self._stopped.is_set():
+            with self._lock:
+                for _ in range(COUNT_BATCH):
+                    if self._done:
+                        return
+                    self._index_block()
+
+    def _index_block(self) -> None:
+        """Find the next paragraphs and count the lines they wrap to.
+        When the next part of the text is printable ASCII, all of its
+        paragraphs are counted at once, and paragraphs no wider than
+        the text aren't wrapped, since they are one line.
+        """
+        start = self._starts[-1]
+        if start < self._slow_until:
+            self._index_next()
+            return
+        block = self.text[start:start + INDEX_BLOCK]
+        last = block.rfind('\n')
+        body = block[:last]
+        if (
+            last == -1
+            or not body.isascii()
+            or not body.replace('\n', ' ').isprintable()
+        ):
+            self._slow_until = start + len(block)
+            self._index_next()
+            return
+
+        # Since the block is ASCII, its characters are the same as the
+        # bytes of a mapped file.
+        paragraphs = body.split('\n')
+        width = self.width
+        counts = [
+            1 if len(paragraph) <= width else len(self._wrap(paragraph))
+            for paragraph in paragraphs
+        ]
+        ends = accumulate(counts, initial=self._count)
+        self._ends.extend(islice(ends, 1, None))
+        starts = accumulate(
+            paragraphs,
+            lambda total, paragraph: total + len(paragraph) + 1,
+            initial=start
+        )
+        self._starts.extend(islice(starts, 1, None))
+        if self._starts[-1] >= len(self.text):
+            self._done = True
+
+    def _index_next(self, store: bool = False) -> None:
+        """Find the next paragraph and count the lines it wraps to."""
+        start = self._starts[-1]
+        end = self.text.find('\n', start)
+        if end == -1:
+            end = len(self.text)
+        lines = self._wrap(self.text[start:end])
+        if store:
+            self._store(len(self._ends), lines)
+        self._ends.append(self._count + len(lines))
+        self._starts.append(end + 1)
+        if end + 1 >= len(self.text):
+            self._done = True
+
+    def _store(self, paragraph: int, lines: list[str]) -> None:
+        """Keep the wrapped lines of a paragraph, forgetting the least
+        recently used paragraph if there are too many.
+        """
+        self._cache[paragraph] = lines
+        self._cache.move_to_end(paragraph)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _wrap(self, paragraph: str) -> list[str]:
+        """Wrap one paragraph of the text. Printable ASCII doesn't
+        contain terminal sequences or wide characters, so it can be
+        wrapped without the terminal.
+        """
+        if not paragraph.isascii():
+            return self.term.wrap(paragraph, self.width) or ['']
+        if paragraph.isprintable():
+            if not paragraph.strip():
+                return ['']
+            if len(paragraph) <= self.width:
+                return [paragraph.rstrip()]
+            return self._wrapper.wrap(paragraph)
+        if paragraph.replace('\t', ' ').isprintable():
+            return self._wrapper.wrap(paragraph) or ['']
+        return self.term.wrap(paragraph, self.width) or ['']
+
+    def _wrapped(self, paragraph: int) -> list[str]:
+        """Get the wrapped lines of an indexed paragraph."""
+        with self._lock:
+            if paragraph in self._cache:
+                self._cache.move_to_end(paragraph)
+                return self._cache[paragraph]
+            lines = self._wrap(self._source(paragraph))
+            self._store(paragraph, lines)
+            return lines
+
+    def _source(self, paragraph: int) -> str:
+        """Get the text of an indexed paragraph."""
+        if self._base is not None and paragraph >= self._base:
+            return self._appended[paragraph - self._base]
+        start = self._starts[paragraph]
+        end = self._starts[paragraph + 1] - 1
+        return self.text[start:end]
+
+
 class Text(Scroll, Title):
     """Create a new :class:`thurible.Text` object. This class displays
     text to the document and allows the user to scroll through that
@@ -20,11 +516,16 @@ class Text(Scroll, Title):
     properties, and active keys.
 
     :param content: (Optional.) The text to display in the interior
-        of the panel.
+        of the panel. To display the text of a large file without
+        reading it into memory, give a
+        :class:`thurible.text.MappedText`.
     :param content_align_h: (Optional.) The horizontal alignment
         of the contents of the panel. It defaults to "left".
     :param content_align_v: (Optional.) The vertical alignment
         of the contents of the panel. It defaults to "top".
+    :param follow: (Optional.) Whether the panel scrolls to show
+        text added to the end of the content when it was showing the
+        end before the text was added. It defaults to false.
     :return: A :class:`thurible.Text` object.
     :rtype: thurible.Text
     :usage:
@@ -60,15 +561,26 @@ class Text(Scroll, Title):
             *   KEY_UP: Scroll one line up in the content.
 
     """
+    # The wrapped lines are rebuilt rather than sent with the panel.
+    _transient: dict[str, Callable[[], Any]] = {
+        **Scroll._transient,
+        '_lines': list,
+        '_wrapped_width': lambda: -1,
+    }
+
     # Magic methods.
     def __init__(
         self,
-        content: str = '',
+        content: Union[str, MappedText] = '',
         content_align_h: str = 'left',
         content_align_v: str = 'top',
+        follow: bool = False,
         *args, **kwargs
     ) -> None:
+        self._content: Union[str, MappedText] = ''
+        self._parts: list[str] = []
         self.content = content
+        self.follow = follow
         kwargs['content_align_h'] = content_align_h
         kwargs['content_align_v'] = content_align_v
         super().__init__(*args, **kwargs)
@@ -85,13 +597,13 @@ class Text(Scroll, Title):
         """Return a string that will draw the entire panel."""
         # Set up.
         lines = self.lines
-        length = len(lines)
         height = self.inner_height
         width = self.inner_width
         y = self.inner_y
         x = self.inner_x
         self._start = 0
         self._stop = height
+        length = self._count_lines(lines, self._stop + 2)
         result = super().__str__()
 
         # Create the display string and return.
@@ -103,18 +615,138 @@ class Text(Scroll, Title):
 
     # Properties.
     @property
-    def lines(self) -> list[str]:
+    def content(self) -> Union[str, MappedText]:
+        """The text displayed in the panel.
+
+        :return: A :class:`str` or :class:`thurible.text.MappedText`
+            object.
+        :rtype: str | thurible.text.MappedText
+        """
+        if self._parts and isinstance(self._content, str):
+            self._content = ''.join([self._content, *self._parts])
+            self._parts = []
+        return self._content
+
+    @content.setter
+    def content(self, value: Union[str, MappedText]) -> None:
+        self._content = value
+        self._parts = []
+        self._wrapped_width = -1
+
+    @property
+    def lines(self) -> WrappedLines:
         """The lines of text available to be displayed in the panel
         after they have been wrapped to fit the width of the
-        interior of the panel.
+        interior of the panel. The text is only wrapped as the lines
+        are needed. See :class:`thurible.text.WrappedLines`.
 
-        :return: A :class:`list` object containing each line of
-            text as a :class:`str`.
-        :rtype: list
+        :return: A :class:`thurible.text.WrappedLines` object
+            containing each line of text as a :class:`str`.
+        :rtype: thurible.text.WrappedLines
         """
+        lines = self._lines
         width = self.inner_width
-        if width != self._wrapped_width:
-            wrapped = self.term.wrap(self.content, width)
-            self._lines = wrapped
+        if not isinstance(lines, WrappedLines) or width != self._wrapped_width:
+            if isinstance(lines, WrappedLines):
+                lines.stop()
+            lines = WrappedLines(self.content, width, self.term)
+            self._lines = lines
             self._wrapped_width = width
-        return self._lines
+        return lines
+
+    # Public methods.
+    def append(self, text: str) -> str:
+        """Add text to the end of the content of the panel. Only the
+        new text is wrapped, and only the lines that changed are
+        written to the terminal.
+
+        :param text: The text to add.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        if not isinstance(self._content, str):
+            reason = 'Cannot append to text mapped from a file.'
+            raise TypeError(reason)
+        self._parts.append(text)
+
+        # If the lines haven't been wrapped to the current width, the
+        # new text will be wrapped with the rest when they are.
+        lines = self._lines
+        width = self.inner_width
+        if not isinstance(lines, WrappedLines) or self._wrapped_width != width:
+            return ''
+
+        # Add the new lines and update the display. If the end of the
+        # content was visible, the view can now extend past it.
+        height = self.inner_height
+        y = self.inner_y
+        x = self.inner_x
+        start = self._start
+        overflow = (self._overflow_top, self._overflow_bottom)
+        changed = lines.append(text)
+        self._stop = start + height
+        if self.follow and not self._overflow_bottom:
+            self._end()
+        return self._move_view(
+            lines,
+            start,
+            overflow,
+            height,
+            width,
+            y, x,
+            changed
+        )
+
+    def update(self, msg: Message) -> str:
+        result = super().update(msg)
+        if isinstance(msg, Append):
+            result += self.append(msg.text)
+        return result
+
+    def update_many(self, msgs: Sequence[Message]) -> str:
+        """Act on several messages sent by the application at once.
+        The text of consecutive :class:`thurible.text.Append` messages
+        is added at once, so it is only wrapped and written once.
+
+        :param msgs: The messages sent by the application in the order
+            they were sent.
+        :return: A :class:`str` object containing any updates needed to
+            be made to the terminal display.
+        :rtype: str
+        """
+        result = ''
+        texts: list[str] = []
+        for msg in msgs:
+            if isinstance(msg, Append):
+                texts.append(msg.text)
+                continue
+            if texts:
+                result += self.append(''.join(texts))
+                texts = []
+            result += self.update(msg)
+        if texts:
+            result += self.append(''.join(texts))
+        return result
+
+
+# Private classes.
+class _PlainWrapper(textwrap.TextWrapper):
+    """Wrap printable ASCII the same way :meth:`blessed.Terminal.wrap`
+    does, without looking for terminal sequences.
+    """
+    def _handle_long_word(
+        self,
+        reversed_chunks: list[str],
+        cur_line: list[str],
+        cur_len: int,
+        width: int
+    ) -> None:
+        # Unlike textwrap, blessed doesn't break long words at hyphens.
+        space_left = 1 if width < 1 else width - cur_len
+        if self.break_long_words:
+            chunk = reversed_chunks[-1]
+            cur_line.append(chunk[:space_left])
+            reversed_chunks[-1] = chunk[space_left:]
+        elif not cur_line:
+            cur_line.append(reversed_chunks.pop())
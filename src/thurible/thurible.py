@@ -4,25 +4,35 @@ thurible
 
 Managers for the data displays.
 """
+import selectors
+import sys
 from collections import deque
 from dataclasses import dataclass
-from queue import Queue
-from typing import Optional
+from typing import Iterable, Iterator, Optional, cast
 
 from blessed import Terminal
 
 from thurible import messages as tm
 from thurible.dialog import Dialog
 from thurible.panel import Panel
-from thurible.util import get_terminal
+from thurible.render import Renderer
+from thurible.util import MessageQueue, NotifyingQueue, get_terminal
+
+
+# Common values.
+# How long, in seconds, an idle manager sleeps before checking whether
+# the terminal has been resized.
+IDLE_TIMEOUT = 0.25
 
 
 # Manager.
 def queued_manager(
-    q_to: Queue,
-    q_from: Queue,
+    q_to: MessageQueue,
+    q_from: MessageQueue,
     term: Optional[Terminal] = None,
-    displays: Optional[dict] = None
+    displays: Optional[dict] = None,
+    fps: float = 60.0,
+    diff: bool = False
 ) -> None:
     """Manage a terminal display by sending and receiving
     :class:`thurible.messages.Message` objects through
@@ -35,12 +45,35 @@ def queued_manager(
         application from completing execution. This is why it is a
         "queued" manager.
 
+    .. note::
+        If `q_to` is a :class:`thurible.util.NotifyingQueue`, like the
+        one returned by :func:`thurible.get_queues`, or a
+        :class:`thurible.transport.PipeQueue`, and the terminal
+        has a keyboard, the manager sleeps until the user presses a
+        key or the application sends a message. Otherwise, it checks
+        for both roughly every hundredth of a second.
+
+    .. note::
+        Updates to the terminal are collected and written at most
+        `fps` times per second. Updates are always written before
+        the manager responds to a message, such as sending a
+        :class:`thurible.messages.Pong` in response to a
+        :class:`thurible.messages.Ping`.
+
     :param q_to: A queue for messages the program sends to the manager.
     :param q_from: A queue for messages the manager sends to the program.
     :param term: An instance of `blessed.Terminal` used to interact with
         the terminal.
     :param displays: (Optional.) Storage for the panels the program may
         want the manager to display.
+    :param fps: (Optional.) The maximum number of times per second
+        the manager writes to the terminal. If it's zero, updates are
+        written as soon as they are made. It defaults to 60.
+    :param diff: (Optional.) Whether to only write the parts of the
+        terminal that changed since the last frame. This reduces the
+        amount written to the terminal, which helps over slow
+        connections. See :class:`thurible.render.Screen`. It defaults
+        to false.
     :return: None.
     :rtype: NoneType
     :usage:
@@ -80,35 +113,36 @@ def queued_manager(
     exception: Optional[Exception] = None
     last_height = term.height
     last_width = term.width
+    selector = _get_selector(q_to, term)
+    timeout = 0.0 if selector else .01
+    renderer = Renderer(term, fps, diff)
 
     # Program loop.
     with term.fullscreen(), term.cbreak(), term.hidden_cursor():
         while True:
             try:
 
-                # If the terminal height has changed, change the height
-                # of the showing panel to match.
-                if (
-                    showing
-                    and displays[showing].height == last_height
-                    and term.height != last_height
-                ):
-                    displays[showing].height = term.height
-                    last_height = term.height
-                    print(term.clear, end='', flush=True)
-                    print(str(displays[showing]), end='', flush=True)
-
-                # If the terminal width has changed, change the width
-                # of the showing panel to match.
-                if (
-                    showing
-                    and displays[showing].width == last_width
-                    and term.width != last_width
-                ):
-                    displays[showing].width = term.width
-                    last_width = term.width
-                    print(term.clear, end='', flush=True)
-                    print(str(displays[showing]), end='', flush=True)
+                # If the manager can be woken by events, sleep until
+                # there is something to do.
+                if selector:
+                    wait = IDLE_TIMEOUT
+                    if renderer.pending:
+                        wait = min(wait, renderer.time_to_frame)
+                    flush = _time_to_flush(displays, showing)
+                    if flush is not None:
+                        wait = min(wait, flush)
+                    _wait_for_event(selector, q_to, term, wait)
+
+                # If the terminal size has changed, change the size of
+                # the showing panel to match.
+                last_height, last_width = check_resize(
+                    displays,
+                    showing,
+                    term,
+                    last_height,
+                    last_width,
+                    renderer
+                )
 
                 # Manage messages from the application.
                 (
@@ -118,13 +152,27 @@ def queued_manager(
                     q_from,
                     displays,
                     showing,
-                    history
+                    history,
+                    renderer
                 )
                 if end:
                     break
 
                 # Manage messages from the user.
-                check_input(q_from, displays, showing, term)
+                check_input(
+                    q_from,
+                    displays,
+                    showing,
+                    term,
+                    timeout,
+                    renderer
+                )
+
+                # Write any updates the showing panel held back.
+                check_flush(displays, showing, renderer)
+
+                # Write any updates if it's time for the next frame.
+                renderer.flush()
 
             # Handle any exceptions that occurred while managing the
             # messages.
@@ -133,19 +181,56 @@ def queued_manager(
                 exception = ex
                 break
 
+        # Write anything left before leaving full screen mode.
+        try:
+            renderer.flush(force=True)
+        except OSError:
+            ...
+
     # After exiting full screen mode, print the farewell message and
     # inform the program the manager is ending.
+    if selector:
+        selector.close()
     if farewell:
         print(farewell)
-    q_from.put(tm.Ending(reason, exception))
+    q_from.put_nowait(tm.Ending(reason, exception))
 
 
 # Manager core functions.
+def check_flush(
+    displays: dict[str, Panel],
+    showing: str,
+    renderer: Optional[Renderer] = None
+) -> None:
+    """Write any updates the showing panel held back if they are
+    ready to be written. See :meth:`thurible.panel.Panel.flush`.
+
+    :param displays: Storage for the panels the program may want the
+        manager to display.
+    :param showing: The display currently showing in the terminal.
+    :param renderer: (Optional.) The object that writes updates to the
+        terminal. If not given, updates are printed immediately.
+    :returns: None.
+    :rtype: NoneType.
+
+    """
+    delay = _time_to_flush(displays, showing)
+    if delay is None or delay > 0:
+        return
+    update = displays[showing].flush()
+    if update and renderer:
+        renderer.write(update)
+    elif update:
+        print(update, end='', flush=True)
+
+
 def check_input(
-    q_from: Queue,
+    q_from: MessageQueue,
     displays: dict[str, Panel],
     showing: str,
-    term: Terminal
+    term: Terminal,
+    timeout: float = .01,
+    renderer: Optional[Renderer] = None
 ) -> None:
     """Check if input from the user was received and act on any
     received.
@@ -156,33 +241,45 @@ def check_input(
     :param showing: The display currently showing in the terminal.
     :param term: A :class:`blessed.Terminal` instance for formatting
         text for terminal display.
+    :param timeout: (Optional.) How long to wait for input in seconds.
+    :param renderer: (Optional.) The object that writes updates to the
+        terminal. If not given, updates are printed immediately.
     :returns: None.
     :rtype: NoneType.
 
     """
-    key = term.inkey(timeout=.01)
+    key = term.inkey(timeout=timeout)
     if key:
         update = ''
         data = str(key)
         if showing and isinstance(displays[showing], Panel):
             data, update = displays[showing].action(key)
-        if update:
+        if update and renderer:
+            renderer.write(update)
+        elif update:
             print(update, end='', flush=True)
         if data:
             msg = tm.Data(data)
-            q_from.put(msg)
+            q_from.put_nowait(msg)
 
 
 def check_messages(
-    q_to: Queue,
-    q_from: Queue,
+    q_to: MessageQueue,
+    q_from: MessageQueue,
     displays: dict[str, Panel],
     showing: str,
-    history: deque[str]
+    history: deque[str],
+    renderer: Optional[Renderer] = None
 ) -> tuple[dict[str, Panel], str, bool, str, str, deque[str]]:
     """Check if messages from the program were received and act on any
     received.
 
+    All of the messages waiting when this is called are handled before
+    it returns. Any resulting updates to the terminal are written at
+    once after the messages are handled, and runs of messages sent to
+    the showing panel are passed to :meth:`Panel.update_many`, so the
+    panel can collapse them into a single repaint.
+
     :param q_to: A queue for messages the program sends to the manager.
     :param q_from: A queue for messages the manager sends to the program.
     :param displays: Storage for the panels the program may want the
@@ -190,6 +287,105 @@ def check_messages(
     :param showing: The display currently showing in the terminal.
     :param history: A running history of the panels that have been
         shown in the terminal.
+    :param renderer: (Optional.) The object that writes updates to the
+        terminal. If not given, updates are printed immediately.
+    :returns: A :class:`tuple` object.
+    :rtype: tuple
+
+    """
+    # Only handle the messages that are already waiting, so a program
+    # that sends messages faster than they are handled can't keep the
+    # manager from checking for input.
+    return handle_messages(
+        _get_waiting(q_to),
+        q_from,
+        displays,
+        showing,
+        history,
+        renderer
+    )
+
+
+def check_resize(
+    displays: dict[str, Panel],
+    showing: str,
+    term: Terminal,
+    last_height: int,
+    last_width: int,
+    renderer: Optional[Renderer] = None
+) -> tuple[int, int]:
+    """Check if the terminal was resized, and resize the showing panel
+    to match if it was the size of the terminal.
+
+    :param displays: Storage for the panels the program may want the
+        manager to display.
+    :param showing: The display currently showing in the terminal.
+    :param term: A :class:`blessed.Terminal` instance for formatting
+        text for terminal display.
+    :param last_height: The height of the terminal the last time it
+        was checked.
+    :param last_width: The width of the terminal the last time it
+        was checked.
+    :param renderer: (Optional.) The object that writes updates to the
+        terminal. If not given, updates are printed immediately.
+    :returns: The height and width of the terminal as a :class:`tuple`.
+    :rtype: tuple
+
+    """
+    update = ''
+
+    # If the terminal height has changed, change the height of the
+    # showing panel to match.
+    if (
+        showing
+        and displays[showing].height == last_height
+        and term.height != last_height
+    ):
+        displays[showing].height = term.height
+        last_height = term.height
+        update = term.clear + str(displays[showing])
+
+    # If the terminal width has changed, change the width of the
+    # showing panel to match.
+    if (
+        showing
+        and displays[showing].width == last_width
+        and term.width != last_width
+    ):
+        displays[showing].width = term.width
+        last_width = term.width
+        update = term.clear + str(displays[showing])
+
+    if update and renderer:
+        renderer.write(update)
+    elif update:
+        print(update, end='', flush=True)
+    return last_height, last_width
+
+
+def handle_messages(
+    msgs: Iterable[tm.Message],
+    q_from: MessageQueue,
+    displays: dict[str, Panel],
+    showing: str,
+    history: deque[str],
+    renderer: Optional[Renderer] = None
+) -> tuple[dict[str, Panel], str, bool, str, str, deque[str]]:
+    """Act on messages from the program. This does the work of
+    :func:`check_messages` for messages that have already been taken
+    from the queue. Handling stops at a :class:`thurible.messages.End`
+    message, and the rest of the messages are not taken from `msgs`.
+
+    :param msgs: The messages to act on.
+    :param q_from: A queue for messages the manager sends to the program.
+        It can be a :class:`queue.Queue` or an :class:`asyncio.Queue`.
+    :param displays: Storage for the panels the program may want the
+        manager to display.
+    :param showing: The display currently showing in the terminal.
+    :param history: A running history of the panels that have been
+        shown in the terminal.
+    :param renderer: (Optional.) The object that writes updates to the
+        terminal. If not given, updates are printed immediately.
     :returns: A :class:`tuple` object.
     :rtype: tuple
 
@@ -197,81 +393,193 @@ def check_messages(
     end = False
     reason = ''
     farewell = ''
-    if not q_to.empty():
-        msg = q_to.get()
-
-        # End the manager.
-        if isinstance(msg, tm.End):
-            farewell = msg.text
-            reason = 'Received End message.'
-            end = True
-
-        # Prove the manager is still responding.
-        elif isinstance(msg, tm.Ping):
-            pong = tm.Pong(msg.name)
-            q_from.put(pong)
-
-        # Display a stored panel.
-        elif isinstance(msg, tm.Show):
-            if showing:
+    output: list[str] = []
+    responses: list[tm.Message] = []
+    batch: list[tm.Message] = []
+
+    try:
+        for msg in msgs:
+            # Messages the manager doesn't act on are sent to the
+            # showing panel. They are gathered until another message
+            # is received, so the panel can act on them all at once.
+            if not _is_command(msg, showing):
+                batch.append(msg)
+                continue
+            if batch:
+                output.append(displays[showing].update_many(batch))
+                batch = []
+
+            # End the manager.
+            if isinstance(msg, tm.End):
+                farewell = msg.text
+                reason = 'Received End message.'
+                end = True
+                break
+
+            # Prove the manager is still responding.
+            elif isinstance(msg, tm.Ping):
+                pong = tm.Pong(msg.name)
+                responses.append(pong)
+
+            # Display a stored panel.
+            elif isinstance(msg, tm.Show):
+                if showing:
+                    history.appendleft(showing)
+                showing = msg.name
+                output.append(str(displays[showing]))
+
+            # Check what panel is currently displayed.
+            elif isinstance(msg, tm.Showing):
+                shown = tm.Shown(msg.name, showing)
+                responses.append(shown)
+
+            # Store a panel for display.
+            elif isinstance(msg, tm.Store):
+                displays[msg.name] = msg.display
+
+            # Remove a panel from storage.
+            elif isinstance(msg, tm.Delete):
+                del displays[msg.name]
+
+            # Check what panels are currently stored.
+            elif isinstance(msg, tm.Storing):
+                stored = tm.Stored(
+                    msg.name,
+                    tuple(key for key in displays)
+                )
+                responses.append(stored)
+
+            # Show an alert.
+            elif isinstance(msg, tm.Alert):
+                height = len(get_terminal().wrap(
+                    msg.text,
+                    width=int(displays[showing].width * 0.6)
+                ))
+                rel_height = (height + 3) / displays[showing].height
+                displays[msg.name] = Dialog(
+                    message_text=msg.text,
+                    options=msg.options,
+                    title_text=msg.title,
+                    frame_type='light',
+                    panel_align_h='center',
+                    panel_align_v='middle',
+                    panel_relative_height=rel_height,
+                    panel_relative_width=0.6,
+                    height=displays[showing].height,
+                    width=displays[showing].width
+                )
                 history.appendleft(showing)
-            showing = msg.name
-            print(str(displays[showing]), end='', flush=True)
-
-        # Check what panel is currently displayed.
-        elif isinstance(msg, tm.Showing):
-            shown = tm.Shown(msg.name, showing)
-            q_from.put(shown)
-
-        # Store a panel for display.
-        elif isinstance(msg, tm.Store):
-            displays[msg.name] = msg.display
-
-        # Remove a panel from storage.
-        elif isinstance(msg, tm.Delete):
-            del displays[msg.name]
-
-        # Check what panels are currently stored.
-        elif isinstance(msg, tm.Storing):
-            stored = tm.Stored(
-                msg.name,
-                tuple(key for key in displays)
-            )
-            q_from.put(stored)
-
-        # Show an alert.
-        elif isinstance(msg, tm.Alert):
-            height = len(get_terminal().wrap(
-                msg.text,
-                width=int(displays[showing].width * 0.6)
-            ))
-            rel_height = (height + 3) / displays[showing].height
-            displays[msg.name] = Dialog(
-                message_text=msg.text,
-                options=msg.options,
-                title_text=msg.title,
-                frame_type='light',
-                panel_align_h='center',
-                panel_align_v='middle',
-                panel_relative_height=rel_height,
-                panel_relative_width=0.6,
-                height=displays[showing].height,
-                width=displays[showing].width
-            )
-            history.appendleft(showing)
-            showing = msg.name
-            print(str(displays[showing]), end='', flush=True)
-
-        # Dismiss the alert.
-        elif isinstance(msg, tm.Dismiss) and msg.name == showing:
-            history.appendleft(showing)
-            showing = history[1]
-            print(str(displays[showing]), end='', flush=True)
-
-        # Send unrecognized messages to the showing panel.
-        else:
-            update = displays[showing].update(msg)
-            if update:
-                print(update, end='', flush=True)
+                showing = msg.name
+                output.append(str(displays[showing]))
+
+            # Dismiss the alert.
+            elif isinstance(msg, tm.Dismiss):
+                history.appendleft(showing)
+                showing = history[1]
+                output.append(str(displays[showing]))
+
+        # Send any remaining messages to the showing panel.
+        if batch:
+            output.append(displays[showing].update_many(batch))
+
+    # Write the updates and send the responses even if handling one of
+    # the messages failed, since the messages before it were handled.
+    # The responses are sent after the updates are written, so the
+    # program knows the display is current when it gets them.
+    finally:
+        update = ''.join(output)
+        if renderer:
+            renderer.write(update)
+            if responses:
+                renderer.flush(force=True)
+        elif update:
+            print(update, end='', flush=True)
+        for response in responses:
+            q_from.put_nowait(response)
 
     return displays, showing, end, farewell, reason, history
+
+
+# Private functions.
+def _get_selector(
+    q_to: MessageQueue,
+    term: Terminal
+) -> Optional[selectors.BaseSelector]:
+    """Return a selector that wakes when the user presses a key or the
+    application sends a message. If the queue or terminal can't be
+    watched that way, return None. Windows can't select on the
+    console, so it always polls.
+    """
+    fd = term._keyboard_fd
+    if sys.platform == 'win32' or fd is None or not _is_notifying(q_to):
+        return None
+
+    selector = selectors.DefaultSelector()
+    try:
+        selector.register(cast(int, fd), selectors.EVENT_READ)
+        selector.register(cast(NotifyingQueue, q_to), selectors.EVENT_READ)
+    except (OSError, ValueError):
+        selector.close()
+        return None
+    return selector
+
+
+def _get_waiting(q_to: MessageQueue) -> Iterator[tm.Message]:
+    """Take the messages that are waiting in the queue."""
+    for _ in range(q_to.qsize()):
+        yield q_to.get_nowait()
+
+
+def _is_command(msg: tm.Message, showing: str) -> bool:
+    """Determine whether the manager acts on the message itself rather
+    than sending it to the showing panel.
+    """
+    commands = (
+        tm.End, tm.Ping, tm.Show, tm.Showing, tm.Store, tm.Delete,
+        tm.Storing, tm.Alert,
+    )
+    if isinstance(msg, tm.Dismiss):
+        return msg.name == showing
+    return isinstance(msg, commands)
+
+
+def _is_notifying(q_to: MessageQueue) -> bool:
+    """Determine whether the queue can be watched by a selector, like
+    a :class:`thurible.util.NotifyingQueue`.
+    """
+    if isinstance(q_to, NotifyingQueue):
+        return True
+    return (
+        hasattr(q_to, 'clear_notifications')
+        and hasattr(q_to, 'fileno')
+    )
+
+
+def _time_to_flush(
+    displays: dict[str, Panel],
+    showing: str
+) -> Optional[float]:
+    """Get the time until the showing panel has held back updates
+    ready to write.
+    """
+    if showing and isinstance(displays.get(showing), Panel):
+        return displays[showing].time_to_flush
+    return None
+
+
+def _wait_for_event(
+    selector: selectors.BaseSelector,
+    q_to: MessageQueue,
+    term: Terminal,
+    timeout: float = IDLE_TIMEOUT
+) -> None:
+    """Sleep until the user presses a key, the application sends a
+    message, or the timeout passes. The queue must be able to wake
+    the selector, like a :class:`thurible.util.NotifyingQueue`.
+    """
+    # Clear the notifications before checking the queue, so a message
+    # sent after the check still wakes the selector.
+    cast(NotifyingQueue, q_to).clear_notifications()
+    if not q_to.empty() or term._keyboard_buf:
+        return
+    selector.select(timeout)
@@ -0,0 +1,791 @@
+"""
+transport
+~~~~~~~~~
+
+Tools for running a manager in a separate process from the
+application.
+"""
+import codecs
+import locale
+import multiprocessing as mp
+import os
+from array import array, typecodes
+from collections import deque
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from importlib import import_module
+from queue import Empty
+from struct import Struct
+from threading import Lock, Thread
+from typing import Any, Optional
+
+from blessed import Terminal
+
+from thurible.panel import Panel
+from thurible.text import MappedText
+from thurible.thurible import queued_manager
+
+
+# Common values.
+# The first bytes of every encoded message. The last byte is the
+# version of the encoding, which is raised whenever the encoding
+# changes in a way older versions can't read.
+MAGIC = b'THR'
+VERSION = 1
+
+# The tags identifying the type of each encoded value.
+TAG_NONE = b'N'
+TAG_TRUE = b'T'
+TAG_FALSE = b'F'
+TAG_INT = b'I'
+TAG_FLOAT = b'D'
+TAG_STR = b'S'
+TAG_BYTES = b'B'
+TAG_BYTEARRAY = b'Y'
+TAG_ARRAY = b'A'
+TAG_LIST = b'L'
+TAG_TUPLE = b'U'
+TAG_SET = b'E'
+TAG_FROZENSET = b'Z'
+TAG_DICT = b'M'
+TAG_DEQUE = b'Q'
+TAG_DATETIME = b'W'
+TAG_DATACLASS = b'C'
+TAG_PANEL = b'P'
+TAG_METHOD = b'R'
+TAG_EXCEPTION = b'X'
+TAG_MAPPED_TEXT = b'G'
+
+_double = Struct('>d')
+
+# The classes outside of thurible that can be encoded, by the module
+# and qualified name they are sent with.
+_registered: dict[tuple[str, str], type] = {}
+
+
+# Encoding.
+def decode(data: bytes) -> Any:
+    """Decode a message encoded by :func:`thurible.transport.encode`.
+
+    Only types :func:`thurible.transport.encode` can encode are
+    decoded. Only dataclasses, :class:`thurible.panel.Panel`
+    subclasses, and exceptions will be created, and only if they are
+    part of :mod:`thurible`, built-in exceptions, or classes added
+    with :func:`thurible.transport.register`. No other modules are
+    imported. Exceptions of other classes are decoded as
+    :class:`Exception`. Since panels are created without calling
+    their :meth:`__init__`, their attributes are restored as they
+    were when the panel was encoded.
+
+    :param data: The encoded message.
+    :return: The decoded message.
+    :rtype: Any
+    """
+    header = MAGIC + bytes((VERSION,))
+    if data[:len(header) - 1] != MAGIC:
+        reason = 'Data was not encoded by thurible.'
+        raise ValueError(reason)
+    if data[:len(header)] != header:
+        version = data[len(header) - 1]
+        reason = f'Cannot decode version {version} messages.'
+        raise ValueError(reason)
+
+    decoder = _Decoder(memoryview(data), len(header))
+    value = decoder.read()
+    if decoder.pos != len(data):
+        reason = 'Data continues after the end of the message.'
+        raise ValueError(reason)
+    return value
+
+
+def encode(value: Any) -> bytes:
+    """Encode a message for sending to another process.
+
+    This is a compact binary encoding of the values messages contain:
+    :class:`None`, :class:`bool`, :class:`int`, :class:`float`,
+    :class:`str`, :class:`bytes`, :class:`bytearray`, the built-in
+    collections, :class:`array.array`, :class:`collections.deque`,
+    :class:`datetime.datetime`, :class:`thurible.text.MappedText`,
+    dataclasses (including all :ref:`messages`), panels, and
+    exceptions. Unlike :mod:`pickle`, it doesn't allow arbitrary
+    objects to be created when the message is decoded, and it leaves
+    out the :class:`blessed.Terminal` held by panels. Dataclasses and
+    panels that aren't part of :mod:`thurible` must be added with
+    :func:`thurible.transport.register` before they can be encoded.
+
+    :param value: The message to encode.
+    :return: A :class:`bytes` object.
+    :rtype: bytes
+    :usage:
+        To encode a :class:`thurible.messages.Store` message:
+
+        .. testcode::
+
+            from thurible import Splash
+            from thurible.messages import Store
+            from thurible.transport import decode, encode
+
+            msg = Store('spam', Splash('SPAM!'))
+            data = encode(msg)
+            assert decode(data) == msg
+
+    """
+    encoder = _Encoder()
+    encoder.out += MAGIC + bytes((VERSION,))
+    encoder.write(value)
+    return bytes(encoder.out)
+
+
+def register(cls: type) -> type:
+    """Allow a dataclass, panel, or exception that isn't part of
+    :mod:`thurible` to be encoded and decoded. It must be registered
+    in both the process that sends it and the process that receives
+    it. The class is returned, so this can be used as a decorator.
+
+    :param cls: The class to allow.
+    :return: The class.
+    :rtype: type
+    :usage:
+        To allow a dataclass used for the records of a
+        :class:`thurible.Table` to be sent to another process:
+
+        .. testcode::
+
+            from dataclasses import dataclass
+            from thurible.transport import register
+
+            @register
+            @dataclass
+            class Record:
+                name: str
+                count: int
+
+    """
+    _registered[(cls.__module__, cls.__qualname__)] = cls
+    return cls
+
+
+# Queues.
+class PipeQueue:
+    """Create a new :class:`thurible.transport.PipeQueue` object. This
+    is a queue for sending messages between processes through a pipe.
+    Messages are encoded with :func:`thurible.transport.encode`
+    rather than pickled, so panels can be sent without their
+    terminal.
+
+    It has the methods of :class:`queue.Queue` the managers use, and
+    it can be watched with :mod:`selectors` like a
+    :class:`thurible.util.NotifyingQueue`, so a manager can sleep
+    until a message arrives. Messages put without waiting are written
+    to the pipe by a thread, so a full pipe doesn't stop the process
+    sending them. Call :meth:`PipeQueue.flush` before the process
+    ends to make sure they are sent.
+
+    :return: None.
+    :rtype: NoneType
+    """
+    def __init__(self) -> None:
+        self._reader, self._writer = mp.Pipe(duplex=False)
+        self._rlock = mp.Lock()
+        self._wlock = mp.Lock()
+        self._buffer: deque[Any] = deque()
+        self._feeder: Optional[Thread] = None
+        self._pending: deque[bytes] = deque()
+        self._plock = Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_buffer'] = deque()
+        for name in ('_feeder', '_pending', '_plock'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._feeder = None
+        self._pending = deque()
+        self._plock = Lock()
+
+    # Public methods.
+    def clear_notifications(self) -> None:
+        """Messages waiting in the pipe are what make it readable,
+        so there are no notifications to clear. This is here so the
+        queue can be watched like a
+        :class:`thurible.util.NotifyingQueue`.
+
+        :return: None.
+        :rtype: NoneType
+        """
+
+    def close(self) -> None:
+        """Close this process's ends of the pipe.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        self.flush()
+        self._reader.close()
+        self._writer.close()
+
+    def empty(self) -> bool:
+        """Whether there are no messages waiting in the queue.
+
+        :return: A :class:`bool` object.
+        :rtype: bool
+        """
+        return not self.qsize()
+
+    def fileno(self) -> int:
+        """The file descriptor that becomes readable when a message is
+        put into the queue.
+
+        :return: An :class:`int` object.
+        :rtype: int
+        """
+        return self._reader.fileno()
+
+    def flush(self) -> None:
+        """Wait until the messages put without waiting are written to
+        the pipe.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        feeder = self._feeder
+        if feeder is not None:
+            feeder.join()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return a message from the queue.
+
+        :param block: (Optional.) Whether to wait for a message if
+            there isn't one waiting. It defaults to true.
+        :param timeout: (Optional.) How long to wait for a message in
+            seconds. If it's not given, it waits until there is one.
+        :return: The message.
+        :rtype: Any
+        """
+        if self._buffer:
+            return self._buffer.popleft()
+        if not block:
+            timeout = 0.0
+        with self._rlock:
+            if not self._reader.poll(timeout):
+                raise Empty
+            data = self._reader.recv_bytes()
+        return decode(data)
+
+    def get_nowait(self) -> Any:
+        """Remove and return a message from the queue without waiting.
+
+        :return: The message.
+        :rtype: Any
+        """
+        return self.get(False)
+
+    def put(
+        self,
+        item: Any,
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Put a message into the queue. If the pipe is full, this
+        waits until the other process reads from it, unless `block`
+        is false. The `timeout` parameter is only accepted to match
+        :meth:`queue.Queue.put`.
+
+        :param item: The message.
+        :param block: (Optional.) Whether to wait until the message is
+            written to the pipe. It defaults to true.
+        :param timeout: (Optional.) Unused.
+        :return: None.
+        :rtype: NoneType
+        """
+        if not block:
+            self.put_nowait(item)
+            return
+
+        # Messages still waiting to be written go first.
+        self.flush()
+        data = encode(item)
+        with self._wlock:
+            self._writer.send_bytes(data)
+
+    def put_nowait(self, item: Any) -> None:
+        """Put a message into the queue without waiting for it to be
+        written to the pipe.
+
+        :param item: The message.
+        :return: None.
+        :rtype: NoneType
+        """
+        data = encode(item)
+        with self._plock:
+            self._pending.append(data)
+            if self._feeder is None:
+                feeder = Thread(target=self._feed, daemon=True)
+                self._feeder = feeder
+                feeder.start()
+
+    def qsize(self) -> int:
+        """The number of messages waiting in the queue.
+
+        :return: An :class:`int` object.
+        :rtype: int
+        """
+        with self._rlock:
+            while self._reader.poll(0):
+                data = self._reader.recv_bytes()
+                self._buffer.append(decode(data))
+        return len(self._buffer)
+
+    # Private helper methods.
+    def _feed(self) -> None:
+        """Write the messages put without waiting to the pipe, until
+        there are none left.
+        """
+        while True:
+            with self._plock:
+                if not self._pending:
+                    self._feeder = None
+                    return
+                data = self._pending.popleft()
+            with self._wlock:
+                self._writer.send_bytes(data)
+
+
+# Managers.
+def get_process_queues() -> tuple[PipeQueue, PipeQueue]:
+    """Create two :class:`thurible.transport.PipeQueue` objects for
+    communicating with a manager running in another process.
+
+    :return: A :class:`tuple` object containing two
+        :class:`thurible.transport.PipeQueue` objects.
+    :rtype: tuple
+    """
+    return PipeQueue(), PipeQueue()
+
+
+def process_manager(
+    q_to: PipeQueue,
+    q_from: PipeQueue,
+    displays: Optional[dict] = None,
+    fps: float = 60.0,
+    diff: bool = False
+) -> None:
+    """Run a :func:`thurible.queued_manager` as the target of a
+    :class:`multiprocessing.Process`.
+
+    Processes started by :mod:`multiprocessing` don't read from the
+    terminal, so the :class:`blessed.Terminal` the manager uses reads
+    keys from the controlling terminal instead of standard input.
+    Messages the manager sent without waiting are written to the pipe
+    before the process ends.
+
+    :param q_to: A queue for messages the program sends to the manager.
+    :param q_from: A queue for messages the manager sends to the program.
+    :param displays: (Optional.) Storage for the panels the program may
+        want the manager to display.
+    :param fps: (Optional.) The maximum number of times per second
+        the manager writes to the terminal. It defaults to 60.
+    :param diff: (Optional.) Whether to only write the parts of the
+        terminal that changed since the last frame. It defaults to
+        false.
+    :return: None.
+    :rtype: NoneType
+    :usage:
+        To run the manager in its own process::
+
+            from multiprocessing import Process
+
+            from thurible import get_process_queues, process_manager
+            from thurible.messages import End
+
+            # Create the queues for talking to the manager.
+            q_to, q_from = get_process_queues()
+
+            # Run the manager in a separate process.
+            P = Process(target=process_manager, args=(q_to, q_from))
+            P.start()
+
+            # End the process running the manager.
+            q_to.put(End('Ending.'))
+            P.join()
+
+    """
+    term = _keyboard_terminal()
+    try:
+        queued_manager(
+            q_to,
+            q_from,
+            term=term,
+            displays=displays,
+            fps=fps,
+            diff=diff
+        )
+    finally:
+        q_from.flush()
+
+
+# Private classes.
+class _Decoder:
+    """Read encoded values from a buffer."""
+    def __init__(self, data: memoryview, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+        self._panels: list[Panel] = []
+
+    def read(self) -> Any:
+        """Read the next value."""
+        tag = self._take(1)
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_TRUE:
+            return True
+        if tag == TAG_FALSE:
+            return False
+        if tag == TAG_INT:
+            n = self._read_varint()
+            return (n >> 1) ^ -(n & 1)
+        if tag == TAG_FLOAT:
+            return _double.unpack(self._take(8))[0]
+        if tag == TAG_STR:
+            return self._read_str()
+        if tag == TAG_BYTES:
+            return bytes(self._take(self._read_varint()))
+        if tag == TAG_BYTEARRAY:
+            return bytearray(self._take(self._read_varint()))
+        if tag == TAG_ARRAY:
+            return self._read_array()
+        if tag == TAG_LIST:
+            return self._read_items()
+        if tag == TAG_TUPLE:
+            return tuple(self._read_items())
+        if tag == TAG_SET:
+            return set(self._read_items())
+        if tag == TAG_FROZENSET:
+            return frozenset(self._read_items())
+        if tag == TAG_DICT:
+            return self._read_dict()
+        if tag == TAG_DEQUE:
+            maxlen = self.read()
+            return deque(self._read_items(), maxlen=maxlen)
+        if tag == TAG_DATETIME:
+            return datetime.fromisoformat(self._read_str())
+        if tag == TAG_DATACLASS:
+            return self._read_dataclass()
+        if tag == TAG_PANEL:
+            return self._read_panel()
+        if tag == TAG_METHOD:
+            return self._read_method()
+        if tag == TAG_EXCEPTION:
+            return self._read_exception()
+        if tag == TAG_MAPPED_TEXT:
+            return self._read_mapped_text()
+        reason = f'Unknown tag {tag!r} at {self.pos - 1}.'
+        raise ValueError(reason)
+
+    # Private helper methods.
+    def _read_array(self) -> array:
+        typecode = self._read_str()
+        if len(typecode) != 1 or typecode not in typecodes:
+            reason = f'Unknown array type code {typecode!r}.'
+            raise ValueError(reason)
+        value = array(typecode)
+        data = self._take(self._read_varint())
+        if len(data) % value.itemsize:
+            reason = 'Array data is not a whole number of items.'
+            raise ValueError(reason)
+        value.frombytes(data)
+        return value
+
+    def _read_class(self, allowed: tuple[type, ...] = ()) -> type:
+        module = self._read_str()
+        qualname = self._read_str()
+
+        # The name comes from the sender, so only modules that are
+        # part of thurible are imported.
+        cls: Any = _registered.get((module, qualname))
+        if cls is None and not _is_importable(module):
+            reason = f'Cannot decode {module}.{qualname}.'
+            raise ValueError(reason)
+        if cls is None:
+            try:
+                cls = import_module(module)
+                for name in qualname.split('.'):
+                    cls = getattr(cls, name)
+            except (AttributeError, ImportError):
+                reason = f'Cannot find class {module}.{qualname}.'
+                raise ValueError(reason)
+        if not isinstance(cls, type) or not (
+            issubclass(cls, allowed)
+            or (not allowed and is_dataclass(cls))
+        ):
+            reason = f'Cannot decode {module}.{qualname}.'
+            raise ValueError(reason)
+        return cls
+
+    def _read_dataclass(self) -> Any:
+        cls: Any = self._read_class()
+        obj = cls.__new__(cls)
+        for name, value in self._read_dict().items():
+            object.__setattr__(obj, name, value)
+        return obj
+
+    def _read_dict(self) -> dict:
+        count = self._read_varint()
+        return {self.read(): self.read() for _ in range(count)}
+
+    def _read_exception(self) -> BaseException:
+        # Exceptions of classes that can't be decoded are still
+        # decoded, so their text reaches the application.
+        cls: type = Exception
+        try:
+            cls = self._read_class((BaseException,))
+        except ValueError:
+            ...
+        args = self.read()
+        try:
+            return cls(*args)
+        except TypeError:
+            return Exception(*args)
+
+    def _read_items(self) -> list:
+        count = self._read_varint()
+        return [self.read() for _ in range(count)]
+
+    def _read_mapped_text(self) -> MappedText:
+        # The file is mapped again in this process rather than sent.
+        path = self._read_str()
+        encoding = self._read_str()
+        errors = self._read_str()
+        return MappedText(path, encoding, errors)
+
+    def _read_method(self) -> Any:
+        name = self._read_str()
+        if not self._panels:
+            reason = 'Found a method outside of a panel.'
+            raise ValueError(reason)
+        return getattr(self._panels[-1], name)
+
+    def _read_panel(self) -> Panel:
+        cls: Any = self._read_class((Panel,))
+        panel = cls.__new__(cls)
+        self._panels.append(panel)
+        try:
+            state = self.read()
+        finally:
+            self._panels.pop()
+        panel.__setstate__(state)
+        return panel
+
+    def _read_str(self) -> str:
+        return str(self._take(self._read_varint()), 'utf8')
+
+    def _read_varint(self) -> int:
+        n = 0
+        shift = 0
+        while True:
+            byte = self._take(1)[0]
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def _take(self, size: int) -> memoryview:
+        end = self.pos + size
+        if end > len(self.data):
+            reason = 'Data ended before the end of the message.'
+            raise ValueError(reason)
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+
+class _Encoder:
+    """Write encoded values to a buffer."""
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self._panels: list[Panel] = []
+
+    def write(self, value: Any) -> None:
+        """Write a value."""
+        out = self.out
+        if value is None:
+            out += TAG_NONE
+        elif value is True:
+            out += TAG_TRUE
+        elif value is False:
+            out += TAG_FALSE
+        elif isinstance(value, int):
+            out += TAG_INT
+            self._write_varint(value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out += TAG_FLOAT + _double.pack(value)
+        elif isinstance(value, str):
+            out += TAG_STR
+            self._write_str(value)
+        elif isinstance(value, bytes):
+            out += TAG_BYTES
+            self._write_varint(len(value))
+            out += value
+        elif isinstance(value, bytearray):
+            out += TAG_BYTEARRAY
+            self._write_varint(len(value))
+            out += value
+        elif isinstance(value, array):
+            out += TAG_ARRAY
+            self._write_str(value.typecode)
+            data = value.tobytes()
+            self._write_varint(len(data))
+            out += data
+        elif isinstance(value, list):
+            out += TAG_LIST
+            self._write_items(value)
+        elif isinstance(value, tuple):
+            out += TAG_TUPLE
+            self._write_items(value)
+        elif isinstance(value, set):
+            out += TAG_SET
+            self._write_items(value)
+        elif isinstance(value, frozenset):
+            out += TAG_FROZENSET
+            self._write_items(value)
+        elif isinstance(value, dict):
+            out += TAG_DICT
+            self._write_dict(value)
+        elif isinstance(value, deque):
+            out += TAG_DEQUE
+            self.write(value.maxlen)
+            self._write_items(value)
+        elif isinstance(value, datetime):
+            out += TAG_DATETIME
+            self._write_str(value.isoformat())
+        elif isinstance(value, MappedText):
+            out += TAG_MAPPED_TEXT
+            self._write_str(str(value.path))
+            self._write_str(value.encoding)
+            self._write_str(value.errors)
+        elif isinstance(value, Panel):
+            self._check_class(type(value))
+            self._write_panel(value)
+        elif is_dataclass(value) and not isinstance(value, type):
+            self._check_class(type(value))
+            out += TAG_DATACLASS
+            self._write_class(type(value))
+            self._write_dict({
+                field.name: getattr(value, field.name)
+                for field in fields(value)
+            })
+        elif isinstance(value, BaseException):
+            self._write_exception(value)
+        elif self._panels and getattr(value, '__self__', None) is (
+            self._panels[-1]
+        ):
+            out += TAG_METHOD
+            self._write_str(_method_name(value))
+        else:
+            reason = f'Cannot encode {type(value).__name__} objects.'
+            raise TypeError(reason)
+
+    # Private helper methods.
+    def _check_class(self, cls: type) -> None:
+        """Only classes that can be decoded are encoded."""
+        key = (cls.__module__, cls.__qualname__)
+        if key not in _registered and not _is_importable(cls.__module__):
+            reason = (
+                f'Cannot encode {cls.__qualname__} objects. Register the '
+                'class with thurible.transport.register().'
+            )
+            raise TypeError(reason)
+
+    def _write_class(self, cls: type) -> None:
+        self._write_str(cls.__module__)
+        self._write_str(cls.__qualname__)
+
+    def _write_dict(self, value: dict) -> None:
+        self._write_varint(len(value))
+        for key in value:
+            self.write(key)
+            self.write(value[key])
+
+    def _write_exception(self, value: BaseException) -> None:
+        # Exceptions can carry anything in their arguments. If they
+        # can't be encoded, send their text instead.
+        start = len(self.out)
+        self.out += TAG_EXCEPTION
+        self._write_class(type(value))
+        try:
+            self.write(value.args)
+        except TypeError:
+            del self.out[start:]
+            self.out += TAG_EXCEPTION
+            self._write_class(Exception)
+            self.write((str(value),))
+
+    def _write_items(self, value: Any) -> None:
+        self._write_varint(len(value))
+        for item in value:
+            self.write(item)
+
+    def _write_panel(self, value: Panel) -> None:
+        self.out += TAG_PANEL
+        self._write_class(type(value))
+        self._panels.append(value)
+        try:
+            self.write(value.__getstate__())
+        finally:
+            self._panels.pop()
+
+    def _write_str(self, value: str) -> None:
+        encoded = value.encode('utf8')
+        self._write_varint(len(encoded))
+        self.out += encoded
+
+    def _write_varint(self, n: int) -> None:
+        while n >= 0x80:
+            self.out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        self.out.append(n)
+
+
+# Private functions.
+def _is_importable(module: str) -> bool:
+    """Whether classes from the module can be decoded without being
+    registered.
+    """
+    return (
+        module in ('builtins', 'thurible')
+        or module.startswith('thurible.')
+    )
+
+
+def _method_name(method: Any) -> str:
+    """Get the name of a bound method as an attribute of its object,
+    including the mangling of private names.
+    """
+    name = method.__func__.__name__
+    if name.startswith('__') and not name.endswith('__'):
+        owner = method.__func__.__qualname__.split('.')[-2]
+        name = f'_{owner.lstrip("_")}{name}'
+    return name
+
+
+def _keyboard_terminal() -> Terminal:
+    """Create a terminal that reads keys from the controlling terminal
+    if standard input was disconnected when the process was started.
+    :class:`blessed.Terminal` only reads keys from standard input, so
+    the keyboard is set up the way it would have been.
+    """
+    term = Terminal()
+    if term._keyboard_fd is not None or not term.is_a_tty:
+        return term
+    try:
+        fd = os.open('/dev/tty', os.O_RDONLY)
+    except OSError:
+        return term
+    encoding = locale.getpreferredencoding() or 'UTF-8'
+    term._encoding = encoding
+    term._keyboard_decoder = codecs.getincrementaldecoder(encoding)()
+    term._keyboard_fd = fd
+    return term
@@ -5,17 +5,47 @@ util
 Miscellaneous utility functions and classes for the `thurible`
 package.
 """
+import socket
+from bisect import insort
+from collections import Counter
 from queue import Queue
-from typing import Optional
+from time import monotonic
+from typing import Any, Iterable, Optional, Protocol
 
 from blessed import Terminal
 
 
 # Common values.
+# How long, in seconds, the user has after a key press to type the
+# next character of a hotkey.
+TYPEAHEAD_TIMEOUT = 1.0
 _term: Optional[Terminal] = None
 
 
 # Common classes.
+class MessageQueue(Protocol):
+    """The methods of a queue the managers use to take messages from
+    the application and send messages back. :class:`queue.Queue`,
+    :class:`asyncio.Queue`, and :class:`thurible.transport.PipeQueue`
+    all have them.
+    """
+    def empty(self) -> bool:
+        """Whether there are no messages waiting."""
+        ...
+
+    def get_nowait(self) -> Any:
+        """Remove and return a message without waiting."""
+        ...
+
+    def put_nowait(self, item: Any) -> None:
+        """Add a message without waiting."""
+        ...
+
+    def qsize(self) -> int:
+        """The number of messages waiting."""
+        ...
+
+
 class Box:
     """Create a new :class:`thurible.util.Box` object. These objects
     track the characters used to draw a frame in a terminal. It has
@@ -110,6 +140,206 @@ class Box:
             raise ValueError(reason)
 
 
+class HotkeyIndex:
+    """Create a new :class:`thurible.util.HotkeyIndex` object. This
+    finds options by their hotkeys without searching through the
+    options. Hotkeys can be more than one character long. Characters
+    typed within the timeout of each other are treated as one hotkey,
+    and typing the start of a hotkey finds the first option with a
+    hotkey that starts that way.
+
+    :param hotkeys: (Optional.) The hotkeys of the options in order.
+        Options without a hotkey can be given as `None` or an empty
+        string.
+    :param timeout: (Optional.) How long, in seconds, the user has
+        after a key press to type the next character of a hotkey. It
+        defaults to one second.
+    :return: None.
+    :rtype: NoneType
+    :usage:
+        To find an option from its hotkey:
+
+        .. testcode::
+
+            from thurible.util import HotkeyIndex
+
+            hotkeys = HotkeyIndex(['s', 'e', 'ba'])
+            assert hotkeys.press('e') == 1
+            assert hotkeys.press('b') == 2
+
+    """
+    def __init__(
+        self,
+        hotkeys: Iterable[Optional[str]] = (),
+        timeout: float = TYPEAHEAD_TIMEOUT
+    ) -> None:
+        self.timeout = timeout
+        self._buffer = ''
+        self._chars: Counter[str] = Counter()
+        self._exact: dict[str, list[int]] = {}
+        self._last = 0.0
+        self._prefixes: dict[str, list[int]] = {}
+        for index, hotkey in enumerate(hotkeys):
+            self.add(index, hotkey)
+
+    # Properties.
+    @property
+    def chars(self) -> set[str]:
+        """The characters used in any hotkey.
+
+        :return: A :class:`set` object of :class:`str` objects.
+        :rtype: set
+        """
+        return set(self._chars)
+
+    # Public methods.
+    def add(self, index: int, hotkey: Optional[str]) -> None:
+        """Add the hotkey of an option.
+
+        :param index: The position of the option.
+        :param hotkey: The hotkey of the option.
+        :return: None.
+        :rtype: NoneType
+        """
+        if not hotkey:
+            return
+        insort(self._exact.setdefault(hotkey, []), index)
+        for i in range(1, len(hotkey) + 1):
+            insort(self._prefixes.setdefault(hotkey[:i], []), index)
+        self._chars.update(hotkey)
+
+    def press(self, char: str, now: Optional[float] = None) -> Optional[int]:
+        """Find the option for a typed character, adding it to any
+        characters typed before it within the timeout.
+
+        :param char: The character typed.
+        :param now: (Optional.) The :func:`time.monotonic` time the
+            character was typed. It defaults to the current time.
+        :return: The position of the option as an :class:`int`, or
+            `None` if no hotkey starts with the typed characters.
+        :rtype: int | None
+        """
+        if now is None:
+            now = monotonic()
+        buffer = char
+        if self._buffer and now - self._last <= self.timeout:
+            buffer = self._buffer + char
+            if buffer not in self._prefixes:
+                buffer = char
+        self._last = now
+
+        if buffer not in self._prefixes:
+            self._buffer = ''
+            return None
+        self._buffer = buffer
+        if buffer in self._exact:
+            return self._exact[buffer][0]
+        return self._prefixes[buffer][0]
+
+    def remove(self, index: int, hotkey: Optional[str]) -> None:
+        """Remove the hotkey of an option.
+
+        :param index: The position of the option.
+        :param hotkey: The hotkey of the option.
+        :return: None.
+        :rtype: NoneType
+        """
+        if not hotkey:
+            return
+        self._discard(self._exact, hotkey, index)
+        for i in range(1, len(hotkey) + 1):
+            self._discard(self._prefixes, hotkey[:i], index)
+        for char in hotkey:
+            self._chars[char] -= 1
+            if not self._chars[char]:
+                del self._chars[char]
+
+    # Private helper methods.
+    def _discard(
+        self,
+        indices: dict[str, list[int]],
+        key: str,
+        index: int
+    ) -> None:
+        """Remove an option from the options for a key."""
+        indices[key].remove(index)
+        if not indices[key]:
+            del indices[key]
+
+
+class NotifyingQueue(Queue):
+    """Create a new :class:`thurible.util.NotifyingQueue` object. This
+    is a :class:`queue.Queue` that also writes a byte to an internal
+    socket every time an item is put into it. That makes the queue
+    usable with :mod:`selectors`, which allows a manager to sleep
+    until either the user presses a key or the application sends it
+    a message rather than repeatedly checking whether the queue is
+    empty.
+
+    :param maxsize: (Optional.) The maximum number of items the queue
+        can hold. See :class:`queue.Queue` for more information.
+    :return: None.
+    :rtype: NoneType
+    """
+    def __init__(self, maxsize: int = 0) -> None:
+        super().__init__(maxsize)
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def __del__(self) -> None:
+        self.close()
+
+    # Public methods.
+    def clear_notifications(self) -> None:
+        """Discard any pending notifications. This should be called
+        before checking whether the queue is empty and then waiting
+        on :meth:`NotifyingQueue.fileno`, so an item put after the
+        check will still wake the waiter.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        try:
+            while self._reader.recv(4096):
+                ...
+        except (BlockingIOError, OSError):
+            ...
+
+    def close(self) -> None:
+        """Close the sockets used to send notifications.
+
+        :return: None.
+        :rtype: NoneType
+        """
+        for sock in (
+            self.__dict__.get('_reader'),
+            self.__dict__.get('_writer'),
+        ):
+            if sock is not None:
+                sock.close()
+
+    def fileno(self) -> int:
+        """The file descriptor that becomes readable when an item is
+        put into the queue.
+
+        :return: An :class:`int` object.
+        :rtype: int
+        """
+        return self._reader.fileno()
+
+    # Private helper methods.
+    def _put(self, item: Any) -> None:
+        super()._put(item)
+
+        # If the socket buffer is full, the reading end is already
+        # readable, so there is no need to add to it.
+        try:
+            self._writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            ...
+
+
 # Common functions.
 def get_queues() -> tuple[Queue, Queue]:
     """Create two :class:`queue.Queue` objects for use in communicating
@@ -117,11 +347,15 @@ def get_queues() -> tuple[Queue, Queue]:
     for convenience, allowing you to use :func:`thurible.queued_manager`
     without having to import :mod:`queue`. It doesn't store the queues.
 
+    The queue for messages sent to the manager is a
+    :class:`thurible.util.NotifyingQueue`, which allows the manager
+    to sleep while there is nothing for it to do.
+
     :return: A :class:`tuple` objects, containing two
         :class:`queue.Queue` objects.
     :rtype: tuple
     """
-    q_to: Queue = Queue()
+    q_to: Queue = NotifyingQueue()
     q_from: Queue = Queue()
     return q_to, q_from
 
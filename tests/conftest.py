@@ -6,8 +6,10 @@ Common fixtures for :mod:`thurible` tests.
 """
 from pathlib import Path
 from queue import Queue
+from unittest.mock import PropertyMock
 
 import pytest as pt
+from blessed import Terminal
 from blessed.keyboard import Keystroke
 
 from thurible import menu
@@ -89,6 +91,22 @@ def term():
     return get_terminal()
 
 
+@pt.fixture
+def styled_term(mocker):
+    """A small terminal object that supports styling."""
+    mocker.patch(
+        'blessed.Terminal.height',
+        new_callable=PropertyMock,
+        return_value=5
+    )
+    mocker.patch(
+        'blessed.Terminal.width',
+        new_callable=PropertyMock,
+        return_value=10
+    )
+    return Terminal(kind='xterm-256color', force_styling=True)
+
+
 # Common key strokes.
 @pt.fixture
 def KEY_BACKSPACE(term):
@@ -132,6 +150,12 @@ def KEY_ENTER(term):
     return Keystroke('\n', term.KEY_ENTER, 'KEY_ENTER')
 
 
+@pt.fixture
+def KEY_ESCAPE(term):
+    """The escape key."""
+    return Keystroke('\x1b', term.KEY_ESCAPE, 'KEY_ESCAPE')
+
+
 @pt.fixture
 def KEY_F1(term):
     """The F1 key."""
@@ -0,0 +1,142 @@
+"""
+test_asyncmanager
+~~~~~~~~~~~~~~~~~
+
+Unit tests for the :mod:`thurible.asyncmanager` module.
+"""
+import asyncio
+import socket
+
+import pytest as pt
+from blessed.keyboard import Keystroke
+
+from thurible import asyncmanager as am
+from thurible import messages as tm
+from thurible import splash
+
+
+# Fixtures.
+@pt.fixture
+def modes(mocker):
+    """The terminal modes are mocked."""
+    mocker.patch('blessed.Terminal.cbreak')
+    mocker.patch('blessed.Terminal.fullscreen')
+    mocker.patch('blessed.Terminal.hidden_cursor')
+
+
+# Utility functions.
+async def run_manager(msgs, term, displays=None, until=tm.Ending):
+    """Start the manager, send it the messages, and collect its
+    responses until one of the given type is received. The manager
+    is ended before returning.
+    """
+    q_to = asyncio.Queue()
+    q_from = asyncio.Queue()
+    task = asyncio.create_task(
+        am.async_manager(q_to, q_from, term, displays)
+    )
+    for msg in msgs:
+        await q_to.put(msg)
+
+    resps = []
+    while not resps or not isinstance(resps[-1], until):
+        resp = await asyncio.wait_for(q_from.get(), 1)
+        resps.append(resp)
+
+    if not task.done():
+        await q_to.put(tm.End())
+    await asyncio.wait_for(task, 1)
+    return resps
+
+
+# Test cases.
+class TestAsyncManager:
+    def test_ends(self, capsys, modes, term):
+        """Sent an End message, async_manager() should print the
+        farewell and send an Ending message.
+        """
+        resps = asyncio.run(run_manager([tm.End('spam')], term))
+        assert resps == [tm.Ending('Received End message.'),]
+        captured = capsys.readouterr()
+        assert captured.out == 'spam\n'
+
+    def test_responds_to_ping(self, capsys, modes, term):
+        """Sent a Ping message, async_manager() should send a Pong
+        message.
+        """
+        msgs = [tm.Ping('spam'),]
+        resps = asyncio.run(run_manager(msgs, term, until=tm.Pong))
+        assert resps == [tm.Pong('spam'),]
+
+    def test_sends_exception(self, capsys, modes, term):
+        """If an exception is raised while handling a message,
+        async_manager() should end and send the exception in an
+        Ending message.
+        """
+        msgs = [tm.Show('spam'),]
+        resps = asyncio.run(run_manager(msgs, term))
+        assert len(resps) == 1
+        assert resps[0].reason == 'Exception.'
+        assert isinstance(resps[0].ex, KeyError)
+
+    def test_sends_input_from_event_loop_reader(
+        self, capsys, mocker, modes, term
+    ):
+        """When the event loop sees the keyboard is ready,
+        async_manager() should read the key and send it to the
+        application as a Data message.
+        """
+        keyboard, typist = socket.socketpair()
+        keyboard.setblocking(False)
+
+        def inkey(timeout=None):
+            try:
+                return Keystroke(keyboard.recv(1).decode())
+            except BlockingIOError:
+                return Keystroke('')
+
+        mocker.patch.object(term, '_keyboard_fd', keyboard.fileno())
+        mock_inkey = mocker.patch(
+            'blessed.Terminal.inkey',
+            side_effect=inkey
+        )
+
+        async def type_x():
+            await asyncio.sleep(0.05)
+            typist.send(b'x')
+
+        async def main():
+            typing = asyncio.create_task(type_x())
+            resps = await run_manager([], term, until=tm.Data)
+            await typing
+            return resps
+
+        try:
+            resps = asyncio.run(main())
+        finally:
+            keyboard.close()
+            typist.close()
+        assert resps == [tm.Data('x'),]
+        for inkey_call in mock_inkey.mock_calls:
+            assert inkey_call.kwargs == {'timeout': 0.0}
+
+    def test_show_display(self, capsys, modes, term):
+        """Sent a Show message, async_manager() should write the
+        panel to the terminal.
+        """
+        msgs = [
+            tm.Store('spam', splash.Splash('spam', height=5, width=20)),
+            tm.Show('spam'),
+            tm.Ping('test_show_display'),
+        ]
+        resps = asyncio.run(run_manager(msgs, term, until=tm.Pong))
+        assert resps == [tm.Pong('test_show_display'),]
+        captured = capsys.readouterr()
+        assert captured.out == (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(2, 8)}spam'
+        )
@@ -4,7 +4,10 @@ test_dialog
 
 Unit tests for the `thurible.dialog` module.
 """
+import pickle
+
 import pytest as pt
+from blessed.keyboard import Keystroke
 
 from thurible import dialog
 
@@ -136,6 +139,36 @@ def test_action_hotkey(term, KEY_Y):
     ))
 
 
+def test_action_hotkey_after_pickling(term, KEY_Y):
+    """After being pickled, `Dialog.action()` should still move the
+    selection to the option assigned to the hot key.
+    """
+    d = dialog.Dialog('spam', height=5, width=10)
+    d = pickle.loads(pickle.dumps(d))
+    assert d.action(KEY_Y) == ('', (
+        f'{term.move(4, 6)}[No]'
+        f'{term.reverse}'
+        f'{term.move(4, 0)}[Yes]'
+        f'{term.normal}'
+    ))
+
+
+def test_action_hotkey_after_options_change(KEY_ENTER, KEY_Y):
+    """After the options are changed, `Dialog.action()` should use the
+    hot keys of the new options.
+    """
+    d = dialog.Dialog('spam', height=5, width=10)
+    d.options = (
+        dialog.Option('Eggs', 'e'),
+        dialog.Option('Bacon', 'y'),
+        dialog.Option('Ham', 'h'),
+    )
+    assert d.action(KEY_ENTER) == ('Ham', '')
+    d.action(KEY_Y)
+    assert d.action(KEY_ENTER) == ('Bacon', '')
+    assert d.action(Keystroke('n')) == ('n', '')
+
+
 def test_action_left(term, KEY_LEFT):
     """When a left arrow is received, `Dialog.action()` should move
     the selection to the option assigned to the hot key.
@@ -61,3 +61,84 @@ def test_starts_queued_manager_and_ends(mocker, queues):
     # The test is checking to make sure event_manager doesn't hang.
     # If it does, you should be able to ^C out of it.
     mgr = em.event_manager()
+
+
+def test_idle_invoked_after_timeout(mocker, queues):
+    """When no message arrives from the UI before the timeout,
+    :func:`eventmanager.event_manager` calls the idle script.
+    """
+    calls = []
+
+    def idle(q_to, calls=calls):
+        calls.append(q_to)
+        return len(calls) < 3
+
+    mocker.patch('thurible.eventmanager.Thread')
+    q_to, q_from = queues
+    mgr = em.event_manager(timeout=0.01, idle=idle)
+    assert calls == [q_to, q_to, q_to]
+
+
+def test_events_dispatched_to_closest_parent(mocker, queues):
+    """When the event map doesn't contain the type of a message,
+    :func:`eventmanager.event_manager` sends the message to the
+    callable mapped to the closest parent class of the message.
+    A callable mapped to :class:`thurible.panel.Message` catches
+    any message without a closer match.
+    """
+    calls = []
+
+    def data(msg, q_to, calls=calls):
+        calls.append(('data', msg))
+        return True
+
+    def catch_all(msg, q_to, calls=calls):
+        calls.append(('catch_all', msg))
+        return not isinstance(msg, tm.Ending)
+
+    class Spam(tm.Data):
+        """A subclass of :class:`thurible.messages.Data`."""
+
+    mocker.patch('thurible.eventmanager.Thread')
+    q_to, q_from = queues
+    msgs = [Spam('eggs'), tm.Pong('bacon'), tm.Ending('ham')]
+    for msg in msgs:
+        q_from.put(msg)
+
+    event_map = {tm.Message: catch_all, tm.Data: data,}
+    mgr = em.event_manager(event_map)
+    assert calls == [
+        ('data', msgs[0]),
+        ('catch_all', msgs[1]),
+        ('catch_all', msgs[2]),
+    ]
+
+
+def test_events_invoke_each_mapped_callable(mocker, queues):
+    """When a type is mapped to a sequence of callables,
+    :func:`eventmanager.event_manager` calls each of them in
+    order, and it ends if any of them return `False`.
+    """
+    calls = []
+
+    def first(msg, q_to, calls=calls):
+        calls.append(('first', msg.value))
+        return True
+
+    def second(msg, q_to, calls=calls):
+        calls.append(('second', msg.value))
+        return msg.value != 'q'
+
+    mocker.patch('thurible.eventmanager.Thread')
+    q_to, q_from = queues
+    for msg in [tm.Data('p'), tm.Data('q'), tm.Data('x')]:
+        q_from.put(msg)
+
+    mgr = em.event_manager({tm.Data: [first, second],})
+    assert calls == [
+        ('first', 'p'),
+        ('second', 'p'),
+        ('first', 'q'),
+        ('second', 'q'),
+    ]
+    assert q_from.get() == tm.Data('x')
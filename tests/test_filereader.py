@@ -108,7 +108,7 @@ class TestCreateText:
         """
         path = 'tests/data/simple.txt'
         text = fr.create_text(path)
-        assert text.content == 'spam eggs bacon'
+        assert str(text.content) == 'spam eggs bacon'
         assert text.title_text == path
         assert text.title_frame
         assert text.footer_text == TEXT_FOOT
@@ -126,7 +126,7 @@ class TestCreateText:
         """
         path = 'tests/data/invalid_utf_8.txt'
         text = fr.create_text(path)
-        assert text.content == '\xc3\x28\n'
+        assert str(text.content) == '\xc3\x28\n'
         assert text.title_text == path
 
 
@@ -322,7 +322,7 @@ class TestMain:
         assert q_to.get() == tm.Store(
             '\n\x1etests/data/simple.txt',
             text.Text(
-                content='spam eggs bacon',
+                content=text.MappedText('tests/data/simple.txt'),
                 title_text='tests/data/simple.txt',
                 title_frame=True,
                 footer_text=TEXT_FOOT,
@@ -349,7 +349,7 @@ class TestMain:
         assert q_to.get() == tm.Store(
             '\n\x1etests/data/simple.txt',
             text.Text(
-                content='spam eggs bacon',
+                content=text.MappedText('tests/data/simple.txt'),
                 title_text='tests/data/simple.txt',
                 title_frame=True,
                 footer_text=TEXT_FOOT,
@@ -451,7 +451,7 @@ def test_get_hex():
 
 def test_read_file_as_binary():
     """When called with a file path that is a file,
-    read_file_as_text() opens the file and returns the
+    read_file_as_binary() opens the file and returns the
     contents of the file as bytes.
     """
     path = Path('tests/data/simple.txt')
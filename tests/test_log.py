@@ -6,6 +6,8 @@ Unit tests for the `thurible.log` module.
 """
 from collections import deque
 
+import pytest as pt
+
 from thurible import log
 
 
@@ -207,3 +209,176 @@ def test_update_overflows_maxlen(term):
         f'{term.move(0, 0)}bacon'
         f'{term.move(1, 0)}eggs'
     )
+
+
+def test_update_many(term):
+    """Given several Update messages, Log.update_many() should add
+    each string to the top of the log but only redraw the log once.
+    """
+    panel = log.Log(
+        content=('spam',),
+        height=3,
+        width=6
+    )
+    msgs = [log.Update('eggs'), log.Update('bacon')]
+    assert panel.update_many(msgs) == (
+        f'{term.move(0, 0)}      '
+        f'{term.move(1, 0)}      '
+        f'{term.move(2, 0)}      '
+        f'{term.move(0, 0)}bacon'
+        f'{term.move(1, 0)}eggs'
+        f'{term.move(2, 0)}spam'
+    )
+
+
+def test_update_after_shown(term):
+    """Given an Update message after the log has been drawn,
+    Log.update() should only write the rows that changed.
+    """
+    panel = log.Log(
+        content=('spam', 'eggs',),
+        height=5,
+        width=6
+    )
+    str(panel)
+    assert panel.update(log.Update('eggs')) == (
+        f'{term.move(1, 0)}      '
+        f'{term.move(2, 0)}      '
+        f'{term.move(1, 0)}eggs'
+        f'{term.move(2, 0)}spam'
+    )
+
+
+def test_update_after_shown_scrolls_region(styled_term):
+    """Given an Update message after the log has been drawn, if the
+    log fills the width of the terminal, Log.update() should have the
+    terminal shift the lines down and only write the new lines.
+    """
+    term = styled_term
+    panel = log.Log(
+        content=('spam', 'eggs',),
+        height=5,
+        width=10,
+        term=term
+    )
+    str(panel)
+    assert panel.update(log.Update('bacon')) == (
+        f'{term.csr(0, 4)}'
+        f'{term.move(0, 0)}{term.ri}'
+        f'{term.csr(0, 4)}'
+        f'{term.move(0, 0)}          '
+        f'{term.move(0, 0)}bacon'
+    )
+
+
+def test_update_scrolls_only_lines_still_shown(styled_term):
+    """Given more new entries than the log keeps, Log.update_many()
+    should only have the terminal shift the lines down by the new
+    lines still shown, and should write the frame of the rows it
+    exposes.
+    """
+    term = styled_term
+    panel = log.Log(
+        maxlen=1,
+        max_pending=3,
+        frame_type='light',
+        height=5,
+        width=10,
+        term=term
+    )
+    str(panel)
+    assert panel.update_many([log.Update('spam'), log.Update('eggs')]) == (
+        f'{term.csr(1, 3)}'
+        f'{term.move(1, 0)}{term.ri}'
+        f'{term.csr(0, 4)}'
+        f'{term.move(1, 0)}│'
+        f'{term.move(1, 9)}│'
+        f'{term.move(1, 1)}        '
+        f'{term.move(1, 1)}eggs'
+    )
+
+
+def test_update_wraps_only_new_entry(mocker, term):
+    """Given an Update message, Log.update() should only wrap the
+    text of the new entry.
+    """
+    panel = log.Log(
+        content=('spam', 'eggs',),
+        height=5,
+        width=6
+    )
+    str(panel)
+    wrap = mocker.spy(term, 'wrap')
+    panel.update(log.Update('bacon'))
+    wrap.assert_called_once_with('bacon', width=6)
+    assert panel.lines == ['bacon', 'eggs', 'spam']
+
+
+def test_update_max_rate(mocker, term):
+    """Given a maximum rate, Log.update() should hold back entries
+    received before the next time entries can be added, and
+    Log.flush() should add them.
+    """
+    clock = mocker.patch('thurible.log.monotonic', return_value=0.0)
+    panel = log.Log(max_rate=10, height=5, width=6)
+    str(panel)
+    assert panel.update(log.Update('spam')) == (
+        f'{term.move(0, 0)}      '
+        f'{term.move(0, 0)}spam'
+    )
+    assert panel.update(log.Update('eggs')) == ''
+    assert panel.pending == 1
+    assert panel.time_to_flush == 0.1
+    clock.return_value = 0.1
+    assert panel.time_to_flush == 0.0
+    assert panel.flush() == (
+        f'{term.move(0, 0)}      '
+        f'{term.move(1, 0)}      '
+        f'{term.move(0, 0)}eggs'
+        f'{term.move(1, 0)}spam'
+    )
+    assert panel.pending == 0
+    assert panel.time_to_flush is None
+
+
+def test_update_many_drop_oldest(term):
+    """Given more entries than can be held back, Log.update_many()
+    should drop the oldest entries and count them.
+    """
+    panel = log.Log(max_pending=2, height=5, width=6)
+    panel.update_many([log.Update(s) for s in ('spam', 'eggs', 'bacon')])
+    assert panel.content == deque(['bacon', 'eggs'])
+    assert panel.dropped == 1
+
+
+def test_update_many_collapse(term):
+    """Given repeated entries and the collapse overflow policy,
+    Log.update() should collapse the repeated entries into one.
+    """
+    panel = log.Log(overflow='collapse', height=5, width=10)
+    msgs = [log.Update(s) for s in ('spam', 'spam', 'spam', 'eggs')]
+    panel.update_many(msgs)
+    assert panel.content == deque(['eggs', 'spam x3'])
+    panel.update(log.Update('eggs'))
+    assert panel.content == deque(['eggs x2', 'spam x3'])
+    assert panel.dropped == 0
+
+
+def test_update_many_summarize(term):
+    """Given more entries than can be held back and the summarize
+    overflow policy, Log.update_many() should add an entry saying
+    how many entries were dropped.
+    """
+    panel = log.Log(overflow='summarize', max_pending=2, height=5, width=30)
+    msgs = [log.Update(s) for s in ('spam', 'eggs', 'bacon', 'ham')]
+    panel.update_many(msgs)
+    assert panel.content == deque(['ham', 'bacon', '[2 entries dropped]'])
+    assert panel.dropped == 2
+
+
+def test__init_invalid_overflow():
+    """Given an invalid overflow policy, Log should raise a
+    ValueError.
+    """
+    with pt.raises(ValueError, match='spam'):
+        log.Log(overflow='spam')
@@ -7,6 +7,7 @@ Unit tests for the `thurible.menu` module.
 import unittest as ut
 
 import pytest as pt
+from blessed.keyboard import Keystroke
 
 from thurible import menu
 
@@ -327,7 +328,8 @@ def test_as_str_with_select_bg_and_fg(menu_options, term):
 
 def test_action_down(KEY_DOWN, menu_options_long, term):
     """When a down arrow is received, Menu.action() selects the
-    next option.
+    next option. If the menu doesn't scroll, only the rows of the
+    previously and newly selected options are written.
     """
     m = menu.Menu(
         options=menu_options_long,
@@ -341,15 +343,13 @@ def test_action_down(KEY_DOWN, menu_options_long, term):
         f'{term.reverse}'
         f'{term.move(1, 0)}eggs  '
         f'{term.normal}'
-        f'{term.move(2, 0)}bacon '
-        f'{term.move(3, 0)}ham   '
     ))
 
 
 def test_action_down_at_bottom(KEY_DOWN, menu_options_long, term):
     """When a down arrow is received, Menu.action() selects the
     next option. If the selected option is the last option, the
-    selection doesn't move.
+    selection doesn't move, so nothing is written.
     """
     m = menu.Menu(
         options=menu_options_long,
@@ -360,14 +360,7 @@ def test_action_down_at_bottom(KEY_DOWN, menu_options_long, term):
     m._selected = 6
     m._start = 3
     m._stop = 7
-    assert m.action(KEY_DOWN) == ('', (
-        f'{term.move(1, 0)}ham   '
-        f'{term.move(2, 0)}beans '
-        f'{term.move(3, 0)}toast '
-        f'{term.reverse}'
-        f'{term.move(4, 0)}tomato'
-        f'{term.normal}'
-    ))
+    assert m.action(KEY_DOWN) == ('', '')
 
 
 def test_action_down_scrolls_to_overflow(KEY_DOWN, menu_options_long, term):
@@ -443,8 +436,6 @@ def test_action_down_with_content_pad_left(KEY_DOWN, menu_options_long, term):
         f'{term.reverse}'
         f'{term.move(1, 3)}eggs  '
         f'{term.normal}'
-        f'{term.move(2, 3)}bacon '
-        f'{term.move(3, 3)}ham   '
     ))
 
 
@@ -499,6 +490,137 @@ def test_action_home(KEY_HOME, menu_options_long, term):
     ))
 
 
+def test_action_filter(KEY_S, menu_options_long, term):
+    """When the filter key is received, Menu.action() starts
+    filtering the options. The characters received after that narrow
+    the options to the ones containing those characters in order,
+    and the filter is shown in the footer.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        height=5,
+        width=9
+    )
+    str(m)
+    m.action(Keystroke('/'))
+    m.action(Keystroke('a'))
+    assert m.action(Keystroke('m')) == ('', (
+        f'{term.move(0, 0)}         '
+        f'{term.move(1, 0)}         '
+        f'{term.move(2, 0)}         '
+        f'{term.move(3, 0)}         '
+        f'{term.move(4, 0)}         '
+        f'{term.move(4, 0)}/am'
+        f'{term.reverse}'
+        f'{term.move(0, 0)}ham   '
+        f'{term.normal}'
+        f'{term.move(1, 0)}spam  '
+    ))
+    assert m.footer_text == '/am'
+    assert m.action(KEY_S) == ('', (
+        f'{term.move(0, 0)}         '
+        f'{term.move(1, 0)}         '
+        f'{term.move(2, 0)}         '
+        f'{term.move(3, 0)}         '
+        f'{term.move(4, 0)}         '
+        f'{term.move(4, 0)}/ams'
+    ))
+
+
+def test_action_filter_backspace(KEY_BACKSPACE, menu_options_long, term):
+    """When a backspace is received while filtering, Menu.action()
+    removes the last character from the filter.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        height=5,
+        width=9
+    )
+    for char in '/am':
+        m.action(Keystroke(char))
+    m.action(KEY_BACKSPACE)
+    assert m.footer_text == '/a'
+    assert m.lines == [
+        'ham   ', 'bacon ', 'spam  ', 'beans ', 'toast ', 'tomato'
+    ]
+
+
+def test_action_filter_enter(KEY_DOWN, KEY_ENTER, menu_options_long, term):
+    """When an enter is received while filtering, Menu.action()
+    returns the name of the highlighted option.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        height=5,
+        width=9
+    )
+    for char in '/am':
+        m.action(Keystroke(char))
+    m.action(KEY_DOWN)
+    assert m.action(KEY_ENTER) == ('spam', '')
+
+
+def test_action_filter_escape(KEY_ESCAPE, menu_options_long, term):
+    """When an escape is received while filtering, Menu.action()
+    stops filtering, keeps the highlighted option highlighted, and
+    restores the footer.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        footer_text='eggs',
+        height=5,
+        width=9
+    )
+    for char in '/am':
+        m.action(Keystroke(char))
+    assert m.action(KEY_ESCAPE) == ('', (
+        f'{term.move(0, 0)}         '
+        f'{term.move(1, 0)}         '
+        f'{term.move(2, 0)}         '
+        f'{term.move(3, 0)}         '
+        f'{term.move(4, 0)}         '
+        f'{term.move(4, 0)}eggs'
+        f'{term.move(3, 0)}         '
+        f'{term.move(3, 3)}[▼]'
+        f'{term.move(0, 0)}         '
+        f'{term.move(0, 3)}[▲]'
+        f'{term.move(1, 0)}bacon '
+        f'{term.reverse}'
+        f'{term.move(2, 0)}ham   '
+        f'{term.normal}'
+    ))
+    assert m.footer_text == 'eggs'
+    assert m.lines[m._selected] == 'ham   '
+
+
+def test_action_filter_highlights_matches(menu_options_long, styled_term):
+    """While filtering, the characters of the options matching the
+    filter are underlined.
+    """
+    term = styled_term
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        height=5,
+        width=9,
+        term=term
+    )
+    for char in '/a':
+        m.action(Keystroke(char))
+    assert m.action(Keystroke('m'))[1].endswith(
+        f'{term.reverse}'
+        f'{term.move(0, 0)}h{term.underline}a{term.no_underline}'
+        f'{term.underline}m{term.no_underline}   '
+        f'{term.normal}'
+        f'{term.move(1, 0)}sp{term.underline}a{term.no_underline}'
+        f'{term.underline}m{term.no_underline}  '
+    )
+
+
 def test_action_hotkey(KEY_E, menu_options_long, term):
     """When a hotkey for an option is received, the selection
     jumps to that option.
@@ -525,6 +647,69 @@ def test_action_hotkey(KEY_E, menu_options_long, term):
     ))
 
 
+def test_action_hotkey_multiple_characters(mocker, term):
+    """When the characters of a hotkey longer than one character are
+    received, the selection jumps to the option with that hotkey.
+    """
+    mocker.patch('thurible.util.monotonic', side_effect=[0.0, 0.5])
+    m = menu.Menu(
+        options=[
+            menu.Option('spam', 'sp'),
+            menu.Option('eggs', 'eg'),
+            menu.Option('bacon', 'ea'),
+        ],
+        height=5,
+        width=9
+    )
+    str(m)
+    assert m.action(Keystroke('e')) == ('', (
+        f'{term.move(0, 0)}spam '
+        f'{term.reverse}'
+        f'{term.move(1, 0)}eggs '
+        f'{term.normal}'
+    ))
+    assert m.action(Keystroke('a')) == ('', (
+        f'{term.move(1, 0)}eggs '
+        f'{term.reverse}'
+        f'{term.move(2, 0)}bacon'
+        f'{term.normal}'
+    ))
+
+
+def test_action_hotkey_no_match(term):
+    """When a character used in a hotkey is received but no hotkey
+    starts with it, the character is returned as data.
+    """
+    m = menu.Menu(
+        options=[menu.Option('spam', 'sp'), menu.Option('eggs', 'e')],
+        height=5,
+        width=9
+    )
+    assert m.action(Keystroke('p')) == ('p', '')
+
+
+def test_action_hotkey_scrolls_to_option(menu_options_long, term):
+    """When a hotkey for an option below the visible options is
+    received, the menu scrolls until that option is the last one
+    visible.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        height=5,
+        width=9
+    )
+    str(m)
+    assert m.action(Keystroke('n')) == ('', (
+        f'{term.move(0, 0)}         '
+        f'{term.move(0, 3)}[▲]'
+        f'{term.move(1, 0)}bacon '
+        f'{term.move(2, 0)}ham   '
+        f'{term.reverse}'
+        f'{term.move(3, 0)}beans '
+        f'{term.normal}'
+    ))
+
+
 def test_action_hotkey_near_bottom_of_overflow(
     KEY_O, menu_options_long, term
 ):
@@ -596,8 +781,6 @@ def test_action_page_down_at_bottom(KEY_PGDOWN, menu_options_very_long, term):
     m._start = 6
     m._stop = 10
     assert m.action(KEY_PGDOWN) == ('', (
-        f'{term.move(1, 0)}tomato'
-        f'{term.move(2, 0)}coffee'
         f'{term.move(3, 0)}muffin'
         f'{term.reverse}'
         f'{term.move(4, 0)}grits '
@@ -678,8 +861,6 @@ def test_action_page_up_at_top(KEY_PGUP, menu_options_very_long, term):
         f'{term.move(0, 0)}spam  '
         f'{term.normal}'
         f'{term.move(1, 0)}eggs  '
-        f'{term.move(2, 0)}bacon '
-        f'{term.move(3, 0)}ham   '
     ))
 
 
@@ -756,12 +937,10 @@ def test_action_up(KEY_UP, menu_options_long, term):
     m._selected = 2
     m._stop = 4
     assert m.action(KEY_UP) == ('', (
-        f'{term.move(0, 0)}spam  '
         f'{term.reverse}'
         f'{term.move(1, 0)}eggs  '
         f'{term.normal}'
         f'{term.move(2, 0)}bacon '
-        f'{term.move(3, 0)}ham   '
     ))
 
 
@@ -781,8 +960,6 @@ def test_action_up_at_bottom(KEY_UP, menu_options_long, term):
     m._start = 3
     m._stop = 7
     assert m.action(KEY_UP) == ('', (
-        f'{term.move(1, 0)}ham   '
-        f'{term.move(2, 0)}beans '
         f'{term.reverse}'
         f'{term.move(3, 0)}toast '
         f'{term.normal}'
@@ -793,7 +970,7 @@ def test_action_up_at_bottom(KEY_UP, menu_options_long, term):
 def test_action_up_at_top(KEY_UP, menu_options_long, term):
     """When an up arrow is received, Menu.action() selects the
     previous option. If the selected option is the top option,
-    the selection shouldn't move.
+    the selection shouldn't move, so nothing is written.
     """
     m = menu.Menu(
         options=menu_options_long,
@@ -803,14 +980,7 @@ def test_action_up_at_top(KEY_UP, menu_options_long, term):
     m._overflow_bottom = True
     m._selected = 0
     m._stop = 4
-    assert m.action(KEY_UP) == ('', (
-        f'{term.reverse}'
-        f'{term.move(0, 0)}spam  '
-        f'{term.normal}'
-        f'{term.move(1, 0)}eggs  '
-        f'{term.move(2, 0)}bacon '
-        f'{term.move(3, 0)}ham   '
-    ))
+    assert m.action(KEY_UP) == ('', '')
 
 
 def test_action_up_scrolls_to_overflow(KEY_UP, menu_options_long, term):
@@ -868,3 +1038,146 @@ def test_action_up_scrolls_near_top_of_overflow(
         f'{term.move(2, 0)}bacon '
         f'{term.move(3, 0)}ham   '
     ))
+
+
+def test_lines_cached(menu_options):
+    """The lines of a Menu should be kept until the options or their
+    alignment change.
+    """
+    m = menu.Menu(options=menu_options, height=5, width=7)
+    lines = m.lines
+    assert m.lines is lines
+    m.option_align_h = 'right'
+    assert m.lines == [' spam', ' eggs', 'bacon']
+    m.options = menu_options[:2]
+    assert m.lines == ['spam', 'eggs']
+    assert m.field_width == 4
+
+
+def test_lines_while_filtering(menu_options_long, term):
+    """While filtering, the lines of a Menu should be the lines of
+    the matching options, looked up from the formatted options.
+    """
+    m = menu.Menu(
+        options=menu_options_long,
+        filter_key='/',
+        height=5,
+        width=9
+    )
+    for char in '/am':
+        m.action(Keystroke(char))
+    assert len(m.lines) == 2
+    assert m.lines[0] == 'ham   '
+    assert m.lines[-1] == 'spam  '
+    assert m.lines[:1] == ['ham   ']
+
+
+def test_replace_option(menu_options, term):
+    """Given an index and an option, Menu.replace_option() should
+    replace the option and only write that option's row.
+    """
+    m = menu.Menu(options=menu_options, height=5, width=7)
+    str(m)
+    assert m.replace_option(1, menu.Option('ham', 'h')) == (
+        f'{term.move(1, 0)}       '
+        f'{term.move(1, 0)}ham  '
+    )
+    assert m.options[1] == menu.Option('ham', 'h')
+    assert m.lines == ['spam ', 'ham  ', 'bacon']
+    assert "'h'" in m.active_keys
+    assert "'e'" not in m.active_keys
+    assert m.action(Keystroke('h')) == ('', (
+        f'{term.move(0, 0)}spam '
+        f'{term.reverse}'
+        f'{term.move(1, 0)}ham  '
+        f'{term.normal}'
+    ))
+
+
+def test_replace_option_changes_field_width(menu_options, term):
+    """Given an option wider than the other options,
+    Menu.replace_option() should write all of the options.
+    """
+    m = menu.Menu(options=menu_options, height=5, width=7)
+    str(m)
+    assert m.replace_option(2, menu.Option('ham', 'h')) == (
+        f'{term.move(0, 0)}       '
+        f'{term.move(1, 0)}       '
+        f'{term.move(2, 0)}       '
+        f'{term.move(3, 0)}       '
+        f'{term.move(4, 0)}       '
+        f'{term.reverse}'
+        f'{term.move(0, 0)}spam'
+        f'{term.normal}'
+        f'{term.move(1, 0)}eggs'
+        f'{term.move(2, 0)}ham '
+    )
+    assert m.field_width == 4
+
+
+def test_update_replace_option(menu_options, term):
+    """Sent a ReplaceOption message, Menu.update() should replace
+    the option.
+    """
+    m = menu.Menu(options=menu_options, height=5, width=7)
+    str(m)
+    msg = menu.ReplaceOption(0, menu.Option('ham', 'h'))
+    assert m.update(msg) == (
+        f'{term.move(0, 0)}       '
+        f'{term.reverse}'
+        f'{term.move(0, 0)}ham  '
+        f'{term.normal}'
+    )
+
+
+class TestFuzzyMatcher:
+    def test_search(self):
+        """Given a query, FuzzyMatcher.search() should return the
+        positions of the names containing the characters of the query
+        in order, ignoring case, with the closest matches first.
+        """
+        matcher = menu.FuzzyMatcher(['Spam', 'eggs', 'sausage', 'ham'])
+        assert matcher.search('') == [0, 1, 2, 3]
+        assert matcher.search('s') == [0, 2, 1]
+        assert matcher.search('sa') == [2, 0]
+        assert matcher.search('sam') == [0]
+        assert matcher.search('x') == []
+
+    def test_search_refines_last_matches(self):
+        """Given a query that adds to the last query,
+        FuzzyMatcher.search() should only search the names that
+        matched the last query.
+        """
+        matcher = menu.FuzzyMatcher(['spam', 'eggs', 'sausage', 'ham'])
+        matcher.search('s')
+        matcher._lowered[3] = 'sam'
+        assert matcher.search('sa') == [2, 0]
+        assert matcher.search('a') == [3, 2, 0]
+
+    def test_search_keeps_first_character(self):
+        """Given a query starting with a character already searched
+        for, FuzzyMatcher.search() should start from the names found
+        for that character.
+        """
+        matcher = menu.FuzzyMatcher(['spam', 'eggs', 'sausage', 'ham'])
+        matcher.search('sa')
+        matcher.search('e')
+        matcher._lowered[3] = 'sam'
+        assert matcher.search('sa') == [2, 0]
+
+    def test_search_over_rank_limit(self, mocker):
+        """Given a query with more matches than the rank limit,
+        FuzzyMatcher.search() should return the matches in order.
+        """
+        mocker.patch('thurible.menu.RANK_LIMIT', 1)
+        matcher = menu.FuzzyMatcher(['spam', 'eggs', 'sausage', 'ham'])
+        assert matcher.search('sa') == [0, 2]
+
+    def test_positions(self):
+        """Given the position of a name and a query,
+        FuzzyMatcher.positions() should return where the characters of
+        the query are in the name.
+        """
+        matcher = menu.FuzzyMatcher(['spam', 'eggs', 'sausage', 'ham'])
+        assert matcher.positions(2, 'sg') == [0, 5]
+        assert matcher.positions(1, 'x') == []
@@ -372,6 +372,15 @@ class TestFrame:
             f'{term.move(4, 0)}└────┘'
         )
 
+    def test_layout_changes_when_frame_type_set(self):
+        """When the frame type of a Frame is changed, the layout
+        properties should reflect the new frame.
+        """
+        panel = p.Frame(height=5, width=6, frame_type='light')
+        assert (panel.inner_height, panel.inner_x) == (3, 1)
+        panel.frame_type = None
+        assert (panel.inner_height, panel.inner_x) == (5, 0)
+
 
 class TestPanel:
     def test__init_default(self, panel_attr_defaults):
@@ -558,6 +567,29 @@ class TestPanel:
             f'{term.normal}'
         )
 
+    def test_layout_cached(self):
+        """The layout properties of a Panel should keep their values
+        until an attribute that changes the layout is set.
+        """
+        panel = p.Panel(height=5, width=6, panel_pad_left=0.5)
+        assert panel.inner_width == 3
+        assert panel.inner_x == 3
+        assert panel._layout[p.Panel.inner_width] == 3
+        panel.width = 8
+        assert panel._layout == {}
+        assert panel.inner_width == 4
+        assert panel.inner_x == 4
+
+    def test_layout_kept_when_value_unchanged(self):
+        """Setting an attribute that changes the layout of a Panel to
+        the value it already has should keep the layout values.
+        """
+        panel = p.Panel(height=5, width=6, panel_pad_left=0.5)
+        assert panel.inner_width == 3
+        panel.width = 6
+        panel.panel_pad_left = 0.5
+        assert panel._layout[p.Panel.inner_width] == 3
+
     def test_register_key(self):
         """Given a string with the name of a control key as used by
         :mod:blessed and a method that follows the action handler
@@ -546,3 +546,19 @@ def test_update_tick_with_message_and_timestamp(term, mocker):
         f'{term.move(2, 0)}00:02 bacon       '
         f'{term.move(3, 0)}00:00 eggs        '
     )
+
+
+def test_update_many_ticks(term):
+    """When passed several Tick messages, Progress.update_many()
+    should advance the progress bar for each message but only
+    redraw the progress bar once.
+    """
+    panel = progress.Progress(
+        steps=6,
+        height=5,
+        width=6,
+        progress=1,
+    )
+    msgs = [progress.Tick() for _ in range(3)]
+    assert panel.update_many(msgs) == f'{term.move(2, 0)}████  '
+    assert panel.progress == 4
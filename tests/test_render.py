@@ -0,0 +1,230 @@
+"""
+test_render
+~~~~~~~~~~~
+
+Unit tests for the :mod:`thurible.render` module.
+"""
+import os
+from unittest.mock import PropertyMock
+
+import pytest as pt
+from blessed import Terminal
+
+from thurible import render, splash, text
+
+
+# Test case.
+class TestRenderer:
+    def test_flush_through_screen(self, capsys, styled_term):
+        """When diffing is on, a Renderer should only write the cells
+        the buffered updates changed.
+        """
+        renderer = render.Renderer(styled_term, fps=0, diff=True)
+        renderer.write(styled_term.move(0, 0) + 'spam')
+        renderer.flush()
+        capsys.readouterr()
+
+        renderer.write(styled_term.move(0, 0) + 'spat')
+        renderer.flush()
+        captured = capsys.readouterr()
+        assert captured.out == styled_term.move(0, 3) + 't'
+
+    def test_no_diff_without_styling(self, term):
+        """When the terminal doesn't support styling, a Renderer
+        shouldn't diff the updates.
+        """
+        renderer = render.Renderer(term, diff=True)
+        assert renderer.screen is None
+
+    def test_flush(self, capsys, term):
+        """When flushed, a Renderer should write all of the buffered
+        updates to the terminal at once.
+        """
+        renderer = render.Renderer(term)
+        renderer.write('spam')
+        renderer.write('eggs')
+        assert renderer.pending
+        assert renderer.flush()
+        assert not renderer.pending
+        captured = capsys.readouterr()
+        assert captured.out == 'spameggs'
+
+    def test_flush_limited_by_fps(self, capsys, mocker, term):
+        """When flushed before the next frame is due, a Renderer
+        should keep the updates buffered unless the flush is forced.
+        """
+        mock_time = mocker.patch('thurible.render.monotonic')
+        mock_time.return_value = 100.0
+        renderer = render.Renderer(term, fps=10)
+        renderer.write('spam')
+        renderer.flush()
+        mock_time.return_value = 100.05
+        renderer.write('eggs')
+        assert not renderer.flush()
+        assert renderer.time_to_frame == pt.approx(0.05)
+        assert capsys.readouterr().out == 'spam'
+
+        mock_time.return_value = 100.1
+        assert renderer.flush()
+        assert capsys.readouterr().out == 'eggs'
+
+        renderer.write('bacon')
+        assert renderer.flush(force=True)
+        assert capsys.readouterr().out == 'bacon'
+
+    def test_flush_writes_to_tty_fd(self, mocker):
+        """When the terminal is a TTY, a Renderer should write to its
+        file descriptor directly.
+        """
+        mocker.patch(
+            'blessed.Terminal.is_a_tty',
+            new_callable=PropertyMock,
+            return_value=True
+        )
+        read_fd, write_fd = os.pipe()
+        with open(write_fd, 'w', encoding='utf_8') as stream:
+            term = Terminal(stream=stream)
+            renderer = render.Renderer(term, fps=0)
+            renderer.write('spam ▸')
+            renderer.flush()
+        assert os.read(read_fd, 100) == 'spam ▸'.encode('utf_8')
+        os.close(read_fd)
+
+
+class TestScreen:
+    def test_first_render_draws_everything(self, styled_term):
+        """The first time it renders, a Screen should clear the
+        terminal and draw everything.
+        """
+        screen = render.Screen(styled_term)
+        result = screen.render(styled_term.move(1, 2) + 'spam')
+        assert result == styled_term.clear + styled_term.move(1, 2) + 'spam'
+
+    def test_render_changed_cells(self, styled_term):
+        """Given an update that only changes some cells, a Screen
+        should only draw those cells.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(0, 0) + 'spam eggs')
+        result = screen.render(
+            styled_term.move(0, 0) + '          '
+            + styled_term.move(0, 0) + 'spam hams'
+        )
+        assert result == styled_term.move(0, 5) + 'ham'
+
+    def test_render_unchanged(self, styled_term):
+        """Given a redraw of the same panel, a Screen should draw
+        nothing.
+        """
+        panel = splash.Splash('spam', height=3, width=10, term=styled_term)
+        screen = render.Screen(styled_term)
+        screen.render(str(panel))
+        assert screen.render(str(panel)) == ''
+
+    def test_render_style_change(self, styled_term):
+        """Given an update that changes the style of a cell, a Screen
+        should draw the cell with the new style and reset the style
+        afterwards.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(0, 0) + 'spam')
+        result = screen.render(
+            styled_term.move(0, 1) + styled_term.red + 'p' + styled_term.normal
+        )
+        assert result == (
+            styled_term.move(0, 1)
+            + styled_term.normal + styled_term.red + 'p'
+            + styled_term.normal
+        )
+
+    def test_render_clear(self, styled_term):
+        """Given an update that clears the terminal, a Screen should
+        only erase the cells that weren't blank.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(2, 0) + 'spam')
+        result = screen.render(
+            styled_term.clear + styled_term.move(2, 0) + 'sp'
+        )
+        assert result == styled_term.move(2, 2) + '  '
+
+    def test_render_wide_characters(self, styled_term):
+        """Given an update that changes the second half of a wide
+        character, a Screen should redraw the whole character.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(0, 0) + 'ａｂ')
+        result = screen.render(styled_term.move(0, 0) + 'ａｃ')
+        assert result == styled_term.move(0, 2) + 'ｃ'
+
+    def test_render_unknown_sequence(self, styled_term):
+        """Given an update with an escape sequence the Screen doesn't
+        understand, the Screen should pass the update through and
+        redraw the terminal on the next update.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(0, 0) + 'spam')
+        update = styled_term.move(1, 0) + '\x1b[5Xeggs'
+        assert screen.render(update) == update
+        result = screen.render('')
+        assert result == (
+            styled_term.clear
+            + styled_term.move(0, 0) + 'spam'
+            + styled_term.move(1, 0) + 'eggs'
+        )
+
+    @pt.mark.parametrize('seq', ('\x1b[?25l', '\x1b[>4;1m', '\x1b[2 q'))
+    def test_render_private_sequence(self, seq, styled_term):
+        """Given an update with a control sequence that has private
+        parameters or intermediate bytes, the Screen should treat it
+        as an escape sequence it doesn't understand.
+        """
+        screen = render.Screen(styled_term)
+        panel = text.Text(
+            f'{seq}spam',
+            height=3,
+            width=10,
+            term=styled_term
+        )
+        update = str(panel)
+        assert screen.render(update) == update
+        result = screen.render('')
+        assert result.startswith(styled_term.clear)
+
+    def test_render_after_resize(self, mocker, styled_term):
+        """When the terminal is resized, a Screen should redraw the
+        whole terminal.
+        """
+        screen = render.Screen(styled_term)
+        screen.render(styled_term.move(0, 0) + 'spam')
+        mocker.patch(
+            'blessed.Terminal.width',
+            new_callable=PropertyMock,
+            return_value=12
+        )
+        result = screen.render(styled_term.move(0, 0) + 'spam')
+        assert result == styled_term.clear + styled_term.move(0, 0) + 'spam'
+
+    def test_render_scrolling_region(self, styled_term):
+        """Given an update that scrolls part of the terminal, a Screen
+        should scroll the terminal and only draw the new cells.
+        """
+        term = styled_term
+        screen = render.Screen(term)
+        screen.render(''.join(
+            f'{term.move(n, 0)}line {n}' for n in range(5)
+        ))
+        result = screen.render(
+            f'{term.csr(1, 3)}{term.move(3, 0)}{term.ind}'
+            f'{term.csr(0, 4)}{term.move(3, 0)}spam'
+        )
+        assert result == (
+            f'{term.csr(1, 3)}{term.move(3, 0)}{term.ind}'
+            f'{term.csr(0, 4)}{term.move(3, 0)}spam'
+        )
+        assert screen.render(''.join(
+            f'{term.move(n, 0)}line {n}' for n in (1, 2)
+        )) == (
+            f'{term.move(1, 5)}1'
+            f'{term.move(2, 5)}2'
+        )
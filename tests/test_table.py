@@ -4,6 +4,8 @@ test_table
 
 Unit tests for the `thurible.table` module.
 """
+import pickle
+from array import array
 from dataclasses import dataclass
 
 import pytest as pt
@@ -48,6 +50,7 @@ class TestTable:
         )
         assert panel.records == records
         assert not panel.inner_frame
+        assert not panel.scroll_h
         assert {
             k: getattr(panel, k) for k in content_attr_defaults_menu
         } == content_attr_defaults_menu
@@ -144,6 +147,25 @@ class TestTable:
             f'{term.move(4, 0)}Eric     9 ▁        '
         )
 
+    def test_as_str_cell_control_characters(self, records, term):
+        """When converted to a string, a Table object returns a string
+        that will draw the table. Control characters in a record are
+        replaced with spaces.
+        """
+        records = [
+            Record('\x1b[1mGr\x7f\x85', 48, False),
+            Record('\tEric\x00', 9, False),
+        ]
+        panel = t.Table(
+            records=records,
+            height=5,
+            width=20
+        )
+        assert list(panel.lines) == [
+            ' [1mGr   48 ▁       ',
+            ' Eric     9 ▁       ',
+        ]
+
     def test_as_str_cell_overflow(self, records, term):
         """When converted to a string, a Table object returns a string
         that will draw the table. If a value is so large that the cell
@@ -474,3 +496,448 @@ class TestTable:
             f'{term.move(3, 0)}│Terry   77 ▁      │'
             f'{term.move(4, 0)}│Eric     9 ▁      │'
         ))
+
+    def test_lines_formats_only_displayed_records(
+        self, mocker, records, term
+    ):
+        """Displaying a `Table` should only format the records that
+        are displayed.
+        """
+        panel = t.Table(records=records * 1000, height=5, width=20)
+        spy = mocker.spy(panel, '_format_rows')
+        str(panel)
+        spy.assert_called_once_with(0, t.CHUNK_SIZE)
+
+    def test_lines_with_inner_frame(self, records, term):
+        """If the `Table` has a frame and an inner frame,
+        `Table.lines` should divide the records with lines.
+        """
+        panel = t.Table(
+            records=records[:2],
+            height=7,
+            width=20,
+            frame_type='light',
+            inner_frame=True
+        )
+        assert len(panel.lines) == 3
+        assert list(panel.lines) == [
+            '│John   │83│█      │',
+            '├───────┼──┼───────┤',
+            '│Michael│79│█      │',
+        ]
+        with pt.raises(IndexError):
+            panel.lines[3]
+
+    def test_field_widths_sampled(self, mocker, records, term):
+        """If there are more records than the width sample,
+        `Table.field_widths` should only use that many records,
+        spread evenly through the records.
+        """
+        mocker.patch('thurible.table.WIDTH_SAMPLE', 3)
+        records = records[:5]
+        records[1] = Record('Graham Chapman', 48, False)
+        panel = t.Table(records=records, height=5, width=20)
+        assert panel.field_widths == [6, 2, 1]
+
+    def test_as_str_with_columns(self, term):
+        """Given a mapping of field names to columns of values,
+        `Table` should display the values one row at a time.
+        """
+        columns = {
+            'name': ['John', 'Michael', 'Graham'],
+            'age': array('l', (83, 79, 48)),
+            'parrot': (True, True, False),
+        }
+        panel = t.Table(records=columns, height=5, width=20)
+        assert panel.field_names == ['name', 'age', 'parrot']
+        assert str(panel) == (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(0, 0)}John    83 █        '
+            f'{term.move(1, 0)}Michael 79 █        '
+            f'{term.move(2, 0)}Graham  48 ▁        '
+        )
+
+    def test_as_str_with_column_source(self, term):
+        """Given an object that provides columns of values, `Table`
+        should display the values one row at a time.
+        """
+        class Squares:
+            field_names = ['root', 'square']
+
+            def __len__(self):
+                return 3
+
+            def column(self, name):
+                if name == 'root':
+                    return range(1, 4)
+                return [1, 4, 9]
+
+        panel = t.Table(records=Squares(), height=5, width=20)
+        assert list(panel.lines) == [
+            '1 1                 ',
+            '2 4                 ',
+            '3 9                 ',
+        ]
+
+    def test_sort(self, mocker, records, term):
+        """Given the name of a field, `Table.sort()` should show the
+        records in the order of that field and write the visible
+        records from the first record. Only the visible records are
+        formatted.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        str(panel)
+        spy = mocker.spy(panel, '_format_rows')
+        assert panel.sort('age') == (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(4, 8)}[▼]'
+            f'{term.move(0, 0)}Eric     9 ▁        '
+            f'{term.move(1, 0)}Graham  48 ▁        '
+            f'{term.move(2, 0)}Terry   77 ▁        '
+            f'{term.move(3, 0)}Michael 79 █        '
+        )
+        spy.assert_called_once_with(0, 7)
+        assert panel.records == records
+
+    def test_sort_reverse(self, records, term):
+        """Given the name of a field and reverse, `Table.sort()`
+        should show the records in the descending order of that field.
+        Sorting by the same field in the same order again shouldn't
+        compare the records.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        panel.sort('age', reverse=True)
+        order = panel._sort_orders[('age', True)][0]
+        panel.sort('age')
+        panel.sort('age', reverse=True)
+        assert panel._sort_orders[('age', True)][0] is order
+        assert [line[:10] for line in panel.lines] == [
+            'John    83',
+            'Terry   81',
+            'Carol   80',
+            'Michael 79',
+            'Terry   77',
+            'Graham  48',
+            'Eric     9',
+        ]
+
+    def test_filter_with_inner_frame(self, styled_term):
+        """Given a filter that removes records from a table with an
+        inner frame, `Table.filter()` should write the sides of the
+        frame over the dividers of the removed records.
+        """
+        term = styled_term
+        panel = t.Table(
+            records={'name': ['a', 'b']},
+            height=5,
+            width=10,
+            frame_type='light',
+            inner_frame=True,
+            term=term
+        )
+        str(panel)
+        result = panel.filter('name', lambda name: name == 'a')
+        assert f'{term.move(2, 0)}│' in result
+        assert f'{term.move(2, 9)}│' in result
+        assert '├' not in result
+
+    @pt.mark.parametrize('reverse,expected', (
+        (False, ['c', 'a', 'd', 'b', 'e']),
+        (True, ['b', 'e', 'a', 'd', 'c']),
+    ))
+    def test_sort_none_and_ties(self, reverse, expected, term):
+        """Given a field with None values and equal values,
+        `Table.sort()` should show the records with None values
+        together after the others, or before them when descending.
+        Records with equal values should stay in their original order.
+        """
+        columns = {
+            'name': ['a', 'b', 'c', 'd', 'e'],
+            'age': [2, None, 1, 2, None],
+        }
+        panel = t.Table(records=columns, height=5, width=20)
+        panel.sort('age', reverse=reverse)
+        assert [line[0] for line in panel.lines] == expected
+
+    def test_sort_mixed_types(self, term):
+        """Given a field with values that can't be compared,
+        `Table.sort()` should group the values by type.
+        """
+        columns = {
+            'name': ['a', 'b', 'c', 'd'],
+            'age': ['x', 2, None, 1],
+        }
+        panel = t.Table(records=columns, height=5, width=20)
+        panel.sort('age')
+        assert [line[0] for line in panel.lines] == ['d', 'b', 'a', 'c']
+
+    def test_filter(self, records, term):
+        """Given the name of a field and a predicate, `Table.filter()`
+        should only show the records the predicate accepts. It should
+        keep the current sort order.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        panel.sort('age')
+        assert panel.filter('name', lambda name: 'r' in name) == (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(0, 0)}Eric     9 ▁        '
+            f'{term.move(1, 0)}Graham  48 ▁        '
+            f'{term.move(2, 0)}Terry   77 ▁        '
+            f'{term.move(3, 0)}Carol   80 ▁        '
+            f'{term.move(4, 0)}Terry   81 ▁        '
+        )
+        panel.filter()
+        panel.sort()
+        expected = t.Table(records=records, height=5, width=20)
+        assert list(panel.lines) == list(expected.lines)
+
+    def test_update_sort_and_filter(self, records, term):
+        """Given Sort and Filter messages, `Table.update()` should
+        sort and filter the records.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        panel.update(t.Filter('parrot', lambda parrot: parrot))
+        panel.update(t.Sort('name'))
+        assert list(panel.lines) == [
+            'John    83 █        ',
+            'Michael 79 █        ',
+        ]
+
+    def test_pickle_sorted(self, records, term):
+        """A sorted and filtered `Table` should keep its order when
+        pickled.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        panel.filter('age', lambda age: age > 50)
+        panel.sort('age')
+        result = pickle.loads(pickle.dumps(panel))
+        assert list(result.lines) == list(panel.lines)
+
+    def test_extend(self, records, term):
+        """Given records, `Table.extend()` should add them to the end
+        of the records and only write the new records that are
+        visible.
+        """
+        panel = t.Table(records=records[:2], height=5, width=20)
+        str(panel)
+        assert panel.extend(records[2:3]) == (
+            f'{term.move(2, 0)}                    '
+            f'{term.move(2, 0)}Graham  48 ▁        '
+        )
+        assert panel.records == records[:3]
+
+    def test_extend_grows_field(self, records, term):
+        """Given records that need wider fields, `Table.extend()`
+        should widen the fields and write all the visible records.
+        """
+        panel = t.Table(records=records[:2], height=5, width=20)
+        str(panel)
+        assert panel.extend([Record('Terry Jones', 81, False)]) == (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(0, 0)}John        83 █    '
+            f'{term.move(1, 0)}Michael     79 █    '
+            f'{term.move(2, 0)}Terry Jones 81 ▁    '
+        )
+        assert panel.field_widths == [11, 2, 1]
+
+    def test_extend_sorted_and_filtered(self, records, term):
+        """Given records, `Table.extend()` should add them to a sorted
+        and filtered table in order, if the filter accepts them.
+        """
+        panel = t.Table(records=records[:4], height=5, width=20)
+        panel.filter('parrot', lambda parrot: not parrot)
+        panel.sort('age')
+        panel.extend(records[4:])
+        assert [line[:10] for line in panel.lines] == [
+            'Eric     9',
+            'Graham  48',
+            'Terry   77',
+            'Carol   80',
+            'Terry   81',
+        ]
+
+    def test_extend_sorted_mixed_types(self, term):
+        """Given records with values that can't be compared to the
+        values of the sorted field, `Table.extend()` should sort the
+        field again, grouping the values by type.
+        """
+        columns = {'name': ['a', 'b'], 'age': [2, 1]}
+        panel = t.Table(records=columns, height=5, width=20)
+        panel.sort('age', reverse=True)
+        panel.extend({'name': ['c', 'd'], 'age': ['x', None]})
+        assert [line[0] for line in panel.lines] == ['d', 'c', 'a', 'b']
+
+    def test_extend_columns(self, term):
+        """Given a mapping of columns, `Table.extend()` should add the
+        values to copies of the columns of the table, keeping arrays
+        as arrays. The columns the table was created with shouldn't
+        change.
+        """
+        columns = {'root': (1, 2), 'square': array('l', [1, 4])}
+        panel = t.Table(records=columns, height=5, width=20)
+        str(panel)
+        assert panel.extend({'root': [3], 'square': [9]}) == (
+            f'{term.move(2, 0)}                    '
+            f'{term.move(2, 0)}3 9                 '
+        )
+        assert panel.records == {
+            'root': [1, 2, 3],
+            'square': array('l', [1, 4, 9]),
+        }
+        assert columns == {'root': (1, 2), 'square': array('l', [1, 4])}
+
+    def test_extend_copies_records(self, records, term):
+        """Given records, `Table.extend()` shouldn't change the
+        sequence of records the table was created with.
+        """
+        data = tuple(records[:2])
+        panel = t.Table(records=data, height=5, width=20)
+        panel.extend(records[2:])
+        assert panel.records == records
+        assert data == tuple(records[:2])
+
+    @pt.mark.parametrize('page,ex,match', (
+        ({'root': [3]}, ValueError, 'fields'),
+        ({'root': [3], 'square': [9, 16]}, ValueError, 'same length'),
+        ({'root': [3], 'square': ['nine']}, TypeError, 'square'),
+        ({'root': [3], 'square': [2 ** 80]}, TypeError, 'square'),
+        ([(3, 9)], TypeError, 'mapping'),
+    ))
+    def test_extend_columns_invalid(self, page, ex, match, term):
+        """Given records that can't be added to the columns,
+        `Table.extend()` should raise an exception and leave the
+        table unchanged.
+        """
+        columns = {'root': [1, 2], 'square': array('l', [1, 4])}
+        panel = t.Table(records=columns, height=5, width=20)
+        str(panel)
+        with pt.raises(ex, match=match):
+            panel.update_many([
+                t.AddRows({'root': [5], 'square': [25]}),
+                t.AddRows(page),
+            ])
+        assert panel.records == columns
+        assert list(panel.lines) == [
+            '1 1                 ',
+            '2 4                 ',
+        ]
+
+    def test_extend_records_invalid(self, records, term):
+        """Given records without the fields of the table,
+        `Table.extend()` should raise a ValueError and leave the table
+        unchanged.
+        """
+        panel = t.Table(records=records[:2], height=5, width=20)
+        with pt.raises(ValueError, match='fields'):
+            panel.extend([records[2], object()])
+        with pt.raises(TypeError, match='sequence'):
+            panel.extend({'name': ['Eric']})
+        assert panel.records == records[:2]
+
+    def test_update_many_add_rows(self, records, term):
+        """Given consecutive AddRows messages, `Table.update_many()`
+        should add the records of all of them before writing the new
+        records.
+        """
+        panel = t.Table(records=records[1:2], height=5, width=20)
+        str(panel)
+        msgs = [t.AddRows(records[:1]), t.AddRows(records[2:3])]
+        assert panel.update_many(msgs) == (
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(1, 0)}John    83 █        '
+            f'{term.move(2, 0)}Graham  48 ▁        '
+        )
+
+    def test_scroll_h(self, mocker, term):
+        """When `scroll_h` is true, the fields shouldn't be narrowed to
+        fit the panel. Only the fields that fit should be formatted.
+        """
+        columns = {name: [name * 6] * 3 for name in 'abcdef'}
+        panel = t.Table(records=columns, height=5, width=20, scroll_h=True)
+        spy = mocker.spy(panel, '_get_field_value')
+        assert list(panel.lines) == [
+            'aaaaaa bbbbbb cccccc',
+            'aaaaaa bbbbbb cccccc',
+            'aaaaaa bbbbbb cccccc',
+        ]
+        assert panel.field_widths == [6, 6, 6, 6, 6, 6]
+        assert spy.call_count == 9
+
+    def test_action_field_right(self, KEY_RIGHT, term):
+        """When `scroll_h` is true and KEY_RIGHT is pressed, the table
+        should scroll one field right and write the visible records
+        again. It should stop when the last field is shown.
+        """
+        columns = {name: [name * 6] * 3 for name in 'abcd'}
+        panel = t.Table(records=columns, height=5, width=20, scroll_h=True)
+        str(panel)
+        assert panel.action(KEY_RIGHT) == ('', (
+            f'{term.move(0, 0)}                    '
+            f'{term.move(1, 0)}                    '
+            f'{term.move(2, 0)}                    '
+            f'{term.move(3, 0)}                    '
+            f'{term.move(4, 0)}                    '
+            f'{term.move(0, 0)}bbbbbb cccccc dddddd'
+            f'{term.move(1, 0)}bbbbbb cccccc dddddd'
+            f'{term.move(2, 0)}bbbbbb cccccc dddddd'
+        ))
+        assert panel.action(KEY_RIGHT) == ('', '')
+
+    def test_action_field_left(self, KEY_LEFT, KEY_RIGHT, term):
+        """When `scroll_h` is true and KEY_LEFT is pressed, the table
+        should scroll one field left. It should stop when the first
+        field is shown.
+        """
+        columns = {name: [name * 6] * 3 for name in 'abcd'}
+        panel = t.Table(records=columns, height=5, width=20, scroll_h=True)
+        str(panel)
+        assert panel.action(KEY_LEFT) == ('', '')
+        panel.action(KEY_RIGHT)
+        panel.action(KEY_LEFT)
+        assert panel.lines[0] == 'aaaaaa bbbbbb cccccc'
+
+    def test_action_left_without_scroll_h(self, KEY_LEFT, records, term):
+        """When `scroll_h` is false, KEY_LEFT should be sent to the
+        application.
+        """
+        panel = t.Table(records=records, height=5, width=20)
+        str(panel)
+        assert panel.action(KEY_LEFT) == ('\x1b[D', '')
+
+
+class TestColumns:
+    def test_different_lengths(self):
+        """Given columns that aren't the same length, `Columns` should
+        raise a ValueError.
+        """
+        with pt.raises(ValueError, match='same length'):
+            t.Columns({'spam': [1, 2], 'eggs': [1]})
+
+
+class TestFieldView:
+    def test_values(self, records):
+        """A `FieldView` should be a sequence of the values of a field
+        of the records.
+        """
+        view = t.FieldView(records, 'name')
+        assert len(view) == 7
+        assert view[1] == 'Michael'
+        assert view[1:3] == ['Michael', 'Graham']
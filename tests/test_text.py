@@ -4,6 +4,9 @@ test_text
 
 Unit tests for the termui.text module.
 """
+import pickle
+from unittest.mock import PropertyMock
+
 import pytest as pt
 
 from thurible import text
@@ -507,6 +510,64 @@ class TestText:
             f'{term.move(3, 0)}7pam eggs'
         ))
 
+    def test_action_up_scrolls_region(self, KEY_UP, styled_term):
+        """When a up arrow is received and the panel fills the width
+        of the terminal, Text.action() has the terminal shift the
+        visible lines down and only writes the new line.
+        """
+        term = styled_term
+        panel = text.Text(
+            content=''.join(f'{n}pam eggs ' for n in range(10)),
+            height=5,
+            width=10,
+            term=term
+        )
+        panel._overflow_bottom = True
+        panel._overflow_top = True
+        panel._start = 4
+        panel._stop = 7
+        assert panel.action(KEY_UP) == ('', (
+            f'{term.csr(1, 3)}'
+            f'{term.move(1, 0)}{term.ri}'
+            f'{term.csr(0, 4)}'
+            f'{term.move(1, 0)}          '
+            f'{term.move(1, 0)}3pam eggs'
+        ))
+
+    def test_action_down_scrolls_region_in_frame(
+        self, KEY_DOWN, mocker, styled_term
+    ):
+        """When a down arrow is received and the panel fills the width
+        of the terminal, Text.action() has the terminal shift the
+        visible lines up, and it redraws the frame on the new line.
+        """
+        mocker.patch(
+            'blessed.Terminal.height',
+            new_callable=PropertyMock,
+            return_value=7
+        )
+        term = styled_term
+        panel = text.Text(
+            content=''.join(f'{n}pam egg ' for n in range(10)),
+            frame_type='light',
+            height=7,
+            width=10,
+            term=term
+        )
+        panel._overflow_bottom = True
+        panel._overflow_top = True
+        panel._start = 2
+        panel._stop = 5
+        assert panel.action(KEY_DOWN) == ('', (
+            f'{term.csr(2, 4)}'
+            f'{term.move(4, 0)}{term.ind}'
+            f'{term.csr(0, 6)}'
+            f'{term.move(4, 0)}│'
+            f'{term.move(4, 9)}│'
+            f'{term.move(4, 1)}        '
+            f'{term.move(4, 1)}5pam egg'
+        ))
+
     def test_action_up_cannot_scroll_past_top(self, KEY_UP, term):
         """When a up arrow is received, Text.action() scrolls up
         in the text. If already at the bottom of the text, Text.action()
@@ -596,3 +657,282 @@ class TestText:
         panel._start = 0
         panel._stop = 4
         assert panel.action(KEY_UP) == ('', '')
+
+    def test_as_str_wraps_only_visible_lines(self, mocker, term):
+        """When converted to a string, a Text object should only wrap
+        the part of the text it needs to fill the display.
+        """
+        mocker.patch('thurible.text.WrappedLines._count_in_background')
+        panel = text.Text(
+            content='spam\n' * 10_000,
+            height=5,
+            width=10
+        )
+        assert str(panel) == (
+            f'{term.move(0, 0)}          '
+            f'{term.move(1, 0)}          '
+            f'{term.move(2, 0)}          '
+            f'{term.move(3, 0)}          '
+            f'{term.move(4, 0)}          '
+            f'{term.move(4, 0)}          '
+            f'{term.move(4, 3)}[▼]'
+            f'{term.move(0, 0)}spam'
+            f'{term.move(1, 0)}spam'
+            f'{term.move(2, 0)}spam'
+            f'{term.move(3, 0)}spam'
+        )
+        assert len(panel.lines._ends) < 100
+
+    def test_pickle_leaves_out_wrapped_lines(self, term):
+        """When pickled, a Text object should leave out its wrapped
+        lines, which are rebuilt when needed.
+        """
+        panel = text.Text(content='spam eggs', height=5, width=10)
+        str(panel)
+        state = panel.__getstate__()
+        assert '_lines' not in state
+        result = pickle.loads(pickle.dumps(panel))
+        assert result == panel
+        assert list(result.lines) == ['spam eggs']
+
+    def test_append(self, term):
+        """Given text, Text.append() should add the text to the content
+        and only write the rows that changed.
+        """
+        panel = text.Text(content='spam', height=5, width=10)
+        str(panel)
+        assert panel.append(' eggs\nbacon') == (
+            f'{term.move(0, 0)}          '
+            f'{term.move(1, 0)}          '
+            f'{term.move(0, 0)}spam eggs'
+            f'{term.move(1, 0)}bacon'
+        )
+        assert panel.append('\nham') == (
+            f'{term.move(2, 0)}          '
+            f'{term.move(2, 0)}ham'
+        )
+        assert panel.content == 'spam eggs\nbacon\nham'
+        assert list(panel.lines) == ['spam eggs', 'bacon', 'ham']
+
+    def test_append_before_wrapped(self, term):
+        """If the panel hasn't been wrapped yet, Text.append() should
+        add the text to the content without writing anything.
+        """
+        panel = text.Text(content='spam', height=5, width=10)
+        assert panel.append('\neggs') == ''
+        assert list(panel.lines) == ['spam', 'eggs']
+
+    def test_append_follow(self, styled_term):
+        """If the panel follows the end of the content and is showing
+        the end, Text.append() should scroll to show the new text.
+        """
+        term = styled_term
+        panel = text.Text(
+            content='0\n1\n2\n3\n4\n5',
+            follow=True,
+            height=5,
+            width=10,
+            term=term
+        )
+        str(panel)
+        panel._overflow_top = True
+        panel._overflow_bottom = False
+        panel._start = 2
+        panel._stop = 6
+        assert panel.append('\n6') == (
+            f'{term.csr(1, 4)}'
+            f'{term.move(4, 0)}{term.ind}'
+            f'{term.csr(0, 4)}'
+            f'{term.move(4, 0)}          '
+            f'{term.move(4, 0)}6'
+        )
+        assert (panel._start, panel._stop) == (3, 7)
+
+    def test_append_mapped_text(self, tmp_path):
+        """Text.append() should raise a TypeError if the content is
+        mapped from a file.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam')
+        panel = text.Text(text.MappedText(path), height=5, width=10)
+        with pt.raises(TypeError):
+            panel.append('eggs')
+
+    def test_update_append(self, term):
+        """Sent an Append message, Text.update() should add the text
+        to the content.
+        """
+        panel = text.Text(content='spam', height=5, width=10)
+        str(panel)
+        assert panel.update(text.Append('\neggs')) == (
+            f'{term.move(1, 0)}          '
+            f'{term.move(1, 0)}eggs'
+        )
+
+    def test_update_many_joins_appends(self, mocker, term):
+        """Sent several Append messages, Text.update_many() should add
+        their text at once.
+        """
+        panel = text.Text(content='spam', height=5, width=10)
+        append = mocker.spy(panel, 'append')
+        panel.update_many([text.Append('\neggs'), text.Append('\nbacon')])
+        append.assert_called_once_with('\neggs\nbacon')
+        assert panel.content == 'spam\neggs\nbacon'
+
+
+class TestWrappedLines:
+    @pt.mark.parametrize('content', (
+        '',
+        '\n',
+        'spam',
+        'spam\n',
+        'spam\n\neggs\n',
+        'spam eggs bacon ham\r\nbeans\n\n\n  toast',
+        '  spam  \n   \n\tspam\teggs\n\t\n',
+        'spam-eggs-bacon ham--beans toast-\nspameggsbacon',
+        'spam\x1b[1meggs\x1b[0m bacon\nspäm ëggs bácon\n',
+    ))
+    def test_lines_match_terminal_wrap(self, content, term):
+        """A WrappedLines object should contain the same lines as
+        wrapping the whole text at once.
+        """
+        lines = text.WrappedLines(content, 5, term, background=False)
+        assert list(lines) == term.wrap(content, 5)
+        assert len(lines) == len(term.wrap(content, 5))
+
+    def test_len_of_long_text(self, term):
+        """When many paragraphs are counted at once, a WrappedLines
+        object should count the same lines as wrapping the whole text
+        at once, including paragraphs that aren't ASCII or are wider
+        than the text.
+        """
+        content = 'spam\n\n  eggs bacon\n' * 4_000 + 'späm\neggs\n' * 10
+        content += 'spam eggs\n' * 1_000 + 'spam'
+        lines = text.WrappedLines(content, 5, term, background=False)
+        expected = term.wrap(content, 5)
+        assert len(lines) == len(expected)
+        assert lines[-24:] == expected[-24:]
+
+    def test_count_to_stops_at_limit(self, term):
+        """Given a limit, WrappedLines.count_to() should return the
+        limit when there are more lines than that, without counting
+        the whole text.
+        """
+        content = 'spam eggs\n' * 1_000
+        lines = text.WrappedLines(content, 5, term, background=False)
+        assert lines.count_to(10) == 10
+        assert len(lines._ends) < 1_000
+        assert lines[-1] == 'eggs'
+        assert lines.count_to(10_000) == 2_000
+
+    def test_append(self, term):
+        """Given text, WrappedLines.append() should add the lines of
+        the text, returning the index of the first line that changed.
+        """
+        lines = text.WrappedLines('spam eggs', 5, term, background=False)
+        assert lines.append(' bacon\nham') == 2
+        assert lines.append('\n') == 4
+        assert lines.append('beans') == 4
+        assert list(lines) == term.wrap('spam eggs bacon\nham\nbeans', 5)
+
+    def test_count_in_background(self, term):
+        """After lines are counted to a limit, the rest of the lines
+        should be counted in a background thread.
+        """
+        content = 'spam eggs\n' * 1_000
+        lines = text.WrappedLines(content, 5, term)
+        assert lines.count_to(10) == 10
+        lines._counter.join(5)
+        assert lines._done
+        assert lines._count == 2_000
+
+    def test_cache_size(self, term):
+        """A WrappedLines object should only keep the given number of
+        wrapped paragraphs, rewrapping others when they are needed.
+        """
+        content = 'spam eggs\n' * 10
+        lines = text.WrappedLines(content, 5, term, 2, background=False)
+        assert lines[:] == ['spam', 'eggs'] * 10
+        assert list(lines._cache) == [8, 9]
+        assert lines[1] == 'eggs'
+        assert list(lines._cache) == [9, 0]
+
+
+class TestMappedText:
+    def test_text_of_file(self, tmp_path):
+        """A MappedText object should give the text of the file."""
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam\neggs ☕\n', encoding='utf_8')
+        content = text.MappedText(path)
+        assert len(content) == 14
+        assert content.find('\n', 5) == 13
+        assert content[5:9] == 'eggs'
+        assert str(content) == 'spam\neggs ☕\n'
+        content.close()
+
+    def test_context_manager(self, tmp_path):
+        """Used as a context manager, a MappedText object should unmap
+        the file on exit.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam')
+        with text.MappedText(path) as content:
+            assert str(content) == 'spam'
+        assert content._map.closed
+
+    def test_empty_file(self, tmp_path):
+        """A MappedText object should allow empty files, which can't
+        be mapped into memory.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('')
+        content = text.MappedText(path)
+        assert len(content) == 0
+        assert str(content) == ''
+
+    def test_encoding_not_ascii_compatible(self, tmp_path):
+        """Given an encoding where a newline isn't a single byte,
+        MappedText should raise a ValueError.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam')
+        with pt.raises(ValueError, match='utf_16'):
+            text.MappedText(path, 'utf_16')
+
+    def test_is_decodable(self, tmp_path):
+        """MappedText.is_decodable() should check whether the start of
+        the file can be decoded with the encoding.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_bytes(b'\xc3\x28\n')
+        assert not text.MappedText(path).is_decodable()
+        assert text.MappedText(path, 'latin_1').is_decodable()
+
+    def test_pickle(self, tmp_path):
+        """When pickled, a MappedText object should leave out the map
+        of the file and map the file again when unpickled.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam')
+        content = text.MappedText(path)
+        result = pickle.loads(pickle.dumps(content))
+        assert result == content
+        assert str(result) == 'spam'
+
+    def test_display_in_text(self, term, tmp_path):
+        """Given a MappedText, a Text object should display the lines
+        of the file.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam\neggs bacon\n')
+        panel = text.Text(text.MappedText(path), height=5, width=5)
+        assert str(panel) == (
+            f'{term.move(0, 0)}     '
+            f'{term.move(1, 0)}     '
+            f'{term.move(2, 0)}     '
+            f'{term.move(3, 0)}     '
+            f'{term.move(4, 0)}     '
+            f'{term.move(0, 0)}spam'
+            f'{term.move(1, 0)}eggs'
+            f'{term.move(2, 0)}bacon'
+        )
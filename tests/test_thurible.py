@@ -4,6 +4,7 @@ test_thurible
 
 Unit tests for the `thurible.thurible` module.
 """
+import socket
 from collections.abc import Iterator
 from queue import Queue
 from threading import Thread
@@ -11,11 +12,13 @@ from time import sleep
 from unittest.mock import PropertyMock, call
 
 import pytest as pt
+from blessed.keyboard import Keystroke
 
 from thurible import dialog, log, menu
 from thurible import messages as tm
-from thurible import splash
+from thurible import progress, splash
 from thurible import thurible as thb
+from thurible.util import NotifyingQueue
 
 
 # Fixtures.
@@ -216,6 +219,30 @@ class TestQueuedManager:
             f'{term.move(4, 13)}spam'
         )
 
+    def test_drains_and_coalesces_updates(self, capsys, in_thread, term):
+        """Given several messages at once, `queued_manager()` should
+        handle all of them before writing to the terminal, and a run
+        of updates for the showing panel should be drawn once.
+        """
+        T, q_to, q_from, _ = in_thread
+        msgs = [
+            tm.Store('spam', progress.Progress(4, height=3, width=4)),
+            tm.Show('spam'),
+            *[progress.Tick() for _ in range(3)],
+        ]
+        for msg in msgs:
+            q_to.put(msg)
+        T.start()
+        watch_for_pong(q_to, q_from, 'test_drains_and_coalesces_updates')
+        captured = capsys.readouterr()
+        assert captured.out == (
+            f'{term.move(0, 0)}    '
+            f'{term.move(1, 0)}    '
+            f'{term.move(2, 0)}    '
+            f'{term.move(1, 0)}    '
+            f'{term.move(1, 0)}███ '
+        )
+
     def test_get_display(self, capsys, in_thread):
         """Sent a `Showing` message, queued_manager() should return a
         `Shown` message with the currently displayed panel.
@@ -345,9 +372,6 @@ class TestQueuedManager:
             f'{term.move(0, 0)}spam'
             f'{term.move(0, 0)}                    '
             f'{term.move(1, 0)}                    '
-            f'{term.move(2, 0)}                    '
-            f'{term.move(3, 0)}                    '
-            f'{term.move(4, 0)}                    '
             f'{term.move(0, 0)}eggs'
             f'{term.move(1, 0)}spam'
         )
@@ -390,6 +414,44 @@ class TestQueuedManagerComplex:
         assert displays['spam'].height == 80
         assert displays['spam'].width == 43
 
+    def test_sleeps_until_event(self, capsys, mocker, term):
+        """Given a queue that can notify the manager and a terminal
+        with a keyboard, `queued_manager()` should sleep until there
+        is a message or key press rather than polling for input.
+        """
+        keyboard, typist = socket.socketpair()
+        mocker.patch.object(term, '_keyboard_fd', keyboard.fileno())
+        mocker.patch('blessed.Terminal.cbreak')
+        mocker.patch('blessed.Terminal.fullscreen')
+        mock_inkey = mocker.patch(
+            'blessed.Terminal.inkey',
+            return_value=Keystroke('')
+        )
+        q_to, q_from = NotifyingQueue(), Queue()
+        T = Thread(target=thb.queued_manager, args=(q_to, q_from, term))
+        T.start()
+        watch_for_pong(q_to, q_from, 'test_sleeps_until_event')
+        count = mock_inkey.call_count
+        sleep(.1)
+        assert mock_inkey.call_count - count <= 1
+        q_to.put(tm.End())
+        T.join()
+        keyboard.close()
+        typist.close()
+        assert call(timeout=0.0) in mock_inkey.mock_calls
+        assert call(timeout=.01) not in mock_inkey.mock_calls
+
+    def test_polls_on_windows(self, mocker, term):
+        """On Windows, the manager should poll for input rather than
+        select on the console, which Windows doesn't support.
+        """
+        keyboard, typist = socket.socketpair()
+        mocker.patch.object(term, '_keyboard_fd', keyboard.fileno())
+        mocker.patch('thurible.thurible.sys.platform', 'win32')
+        assert thb._get_selector(NotifyingQueue(), term) is None
+        keyboard.close()
+        typist.close()
+
     def test_terminal_modes(self, capsys, in_thread, mocker):
         """While running, the terminal should be in `fullscreen` and
         `cbreak` modes.
@@ -401,3 +463,27 @@ class TestQueuedManagerComplex:
         watch_for_pong(q_to, q_from, 'test_terminal_modes')
         assert mock_cbreak.mock_calls == [call(), call().__enter__(),]
         assert mock_fscreen.mock_calls == [call(), call().__enter__(),]
+
+
+class TestCheckFlush:
+    def test_writes_held_updates(self, capsys, mocker, term):
+        """When the showing panel has held back updates that are
+        ready, check_flush() should write them.
+        """
+        clock = mocker.patch('thurible.log.monotonic', return_value=0.0)
+        panel = log.Log(max_rate=10, height=3, width=6)
+        str(panel)
+        displays = {'spam': panel}
+        panel.update(log.Update('spam'))
+        assert panel.update(log.Update('eggs')) == ''
+        thb.check_flush(displays, 'spam')
+        assert capsys.readouterr().out == ''
+
+        clock.return_value = 0.2
+        thb.check_flush(displays, 'spam')
+        assert capsys.readouterr().out == (
+            f'{term.move(0, 0)}      '
+            f'{term.move(1, 0)}      '
+            f'{term.move(0, 0)}eggs'
+            f'{term.move(1, 0)}spam'
+        )
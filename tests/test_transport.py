@@ -0,0 +1,336 @@
+"""
+test_transport
+~~~~~~~~~~~~~~
+
+Unit tests for the :mod:`thurible.transport` module.
+"""
+import multiprocessing as mp
+import os
+import pickle
+import pty
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Empty
+from unittest.mock import PropertyMock
+
+import pytest as pt
+
+from thurible import log, menu
+from thurible import messages as tm
+from thurible import progress, splash, table, text
+from thurible import transport as tp
+
+
+# Utility classes.
+@tp.register
+@dataclass
+class Record:
+    name: str
+    value: int
+
+
+class Unregistered:
+    """A class that isn't a dataclass, panel, or exception."""
+
+
+@dataclass
+class UnregisteredRecord:
+    """A dataclass that wasn't registered."""
+    name: str
+
+
+class UnregisteredError(Exception):
+    """An exception that wasn't registered."""
+
+
+# Test cases.
+class TestEncoding:
+    @pt.mark.parametrize('value', (
+        None, True, False, 0, 1, -1, 2 ** 70, -(2 ** 70), 1.5, '',
+        'spam│eggs', b'\x00\xff', bytearray(b'\x00\xff'), [1, 'a'],
+        (1, (2, 3)), {1, 2},
+        frozenset('ab'), {'spam': [1, 2], 3: None},
+        datetime(2023, 1, 2, 3, 4, 5, 6),
+        array('l', (-1, 0, 2 ** 31 - 1)), array('d', (1.5,)),
+    ))
+    def test_round_trip_value(self, value):
+        """Given a value of a supported type, :func:`encode` should
+        return bytes :func:`decode` turns back into an equal value.
+        """
+        result = tp.decode(tp.encode(value))
+        assert result == value
+        assert type(result) is type(value)
+
+    def test_round_trip_deque(self):
+        """Given a :class:`collections.deque`, :func:`encode` should
+        keep its length limit.
+        """
+        value = deque(['spam', 'eggs'], maxlen=3)
+        result = tp.decode(tp.encode(value))
+        assert result == value
+        assert result.maxlen == 3
+
+    @pt.mark.parametrize('msg', (
+        tm.Alert('spam', 'eggs', 'bacon', [menu.Option('Ham', 'h')]),
+        tm.Data('spam'),
+        tm.Delete('spam'),
+        tm.Dismiss('spam'),
+        tm.End('spam'),
+        tm.Ending('spam', KeyError('eggs')),
+        tm.Ping('spam'),
+        tm.Pong('spam'),
+        tm.Show('spam'),
+        tm.Showing(),
+        tm.Shown('spam', 'eggs'),
+        tm.Store('spam', splash.Splash('eggs', height=5, width=20)),
+        tm.Storing(),
+        tm.Stored('spam', ('eggs', 'bacon')),
+        log.Update('spam'),
+        progress.NoTick(),
+        progress.Tick('spam'),
+        table.AddRows([Record('spam', 1)]),
+        table.Sort('spam', True),
+    ))
+    def test_round_trip_message(self, msg):
+        """Given a message, :func:`encode` should return bytes
+        :func:`decode` turns back into an equal message.
+        """
+        result = tp.decode(tp.encode(msg))
+        if isinstance(msg, tm.Ending):
+            assert type(result.ex) is KeyError
+            assert result.ex.args == msg.ex.args
+        else:
+            assert result == msg
+
+    def test_round_trip_panel(self, KEY_DOWN, term):
+        """Given a panel, :func:`encode` should leave out the terminal,
+        and :func:`decode` should give the panel a terminal and rebind
+        the panel's key handlers.
+        """
+        panel = menu.Menu(
+            [menu.Option('spam', 's'), menu.Option('eggs', 'e')],
+            height=5,
+            width=20
+        )
+        data = tp.encode(panel)
+        result = tp.decode(data)
+        assert result == panel
+        assert result.term is term
+        assert result.active_keys['KEY_ENTER'].__self__ is result
+        assert result.action(KEY_DOWN) == panel.action(KEY_DOWN)
+
+    def test_round_trip_table(self):
+        """Given a table of dataclass records, :func:`encode` should
+        encode the records.
+        """
+        panel = table.Table([Record('spam', 1), Record('eggs', 2)])
+        result = tp.decode(tp.encode(panel))
+        assert result.records == panel.records
+        assert str(result) == str(panel)
+
+    def test_round_trip_mapped_text(self, tmp_path):
+        """Given a :class:`thurible.text.MappedText`, :func:`encode`
+        should send the path of the file, and :func:`decode` should
+        map the file again.
+        """
+        path = tmp_path / 'spam.txt'
+        path.write_text('spam\neggs\n')
+        value = text.MappedText(path, errors='strict')
+        result = tp.decode(tp.encode(value))
+        assert result == value
+        assert str(result) == 'spam\neggs\n'
+
+    def test_round_trip_filtered_table(self):
+        """Given a filtered table with columns in arrays,
+        :func:`encode` should keep the types of the columns and the
+        filter, so records can still be added after decoding.
+        """
+        panel = table.Table(
+            {'name': ['spam', 'eggs'], 'value': array('l', (1, 2))},
+            height=5,
+            width=20
+        )
+        panel.filter('value', lambda value: value > 1)
+        result = tp.decode(tp.encode(panel))
+        assert type(result.records['value']) is array
+        assert type(result._mask) is bytearray
+        str(result)
+        result.extend({'name': ['bacon'], 'value': [3]})
+        assert list(result.lines) == [
+            'eggs  2             ',
+            'bacon 3             ',
+        ]
+
+    def test_decode_bad_array(self):
+        """Given an array with an unknown type code, :func:`decode`
+        should raise a ValueError.
+        """
+        data = bytearray(tp.encode(array('l')))
+        data[data.index(b'l')] = ord('!')
+        with pt.raises(ValueError, match='type code'):
+            tp.decode(bytes(data))
+
+    def test_encode_unencodable_exception_args(self):
+        """Given an exception with arguments that can't be encoded,
+        :func:`encode` should send the text of the exception instead.
+        """
+        ex = ValueError(Unregistered())
+        result = tp.decode(tp.encode(ex))
+        assert type(result) is Exception
+        assert result.args == (str(ex),)
+
+    def test_encode_unregistered_dataclass(self):
+        """Given a dataclass from outside of thurible that wasn't
+        registered, :func:`encode` should raise a TypeError.
+        """
+        with pt.raises(TypeError, match='Register'):
+            tp.encode(UnregisteredRecord('spam'))
+
+    def test_round_trip_unregistered_exception(self):
+        """Given an exception from outside of thurible that wasn't
+        registered, :func:`decode` should decode it as an Exception.
+        """
+        result = tp.decode(tp.encode(UnregisteredError('spam')))
+        assert type(result) is Exception
+        assert result.args == ('spam',)
+
+    def test_encode_unsupported_type(self):
+        """Given a value of an unsupported type, :func:`encode` should
+        raise a TypeError.
+        """
+        with pt.raises(TypeError, match='Unregistered'):
+            tp.encode(Unregistered())
+
+    def test_decode_disallowed_class(self):
+        """Given data naming a class that isn't a dataclass, panel, or
+        exception, :func:`decode` should raise a ValueError rather than
+        create the object.
+        """
+        encoder = tp._Encoder()
+        encoder.out += tp.MAGIC + bytes((tp.VERSION,)) + tp.TAG_DATACLASS
+        encoder._write_class(Unregistered)
+        encoder.write({})
+        data = bytes(encoder.out)
+        with pt.raises(ValueError, match='Cannot decode'):
+            tp.decode(data)
+
+    def test_decode_foreign_module(self, mocker):
+        """Given data naming a class in a module outside of thurible,
+        :func:`decode` should raise a ValueError without importing the
+        module.
+        """
+        mock_import = mocker.patch('thurible.transport.import_module')
+        encoder = tp._Encoder()
+        encoder.out += tp.MAGIC + bytes((tp.VERSION,)) + tp.TAG_DATACLASS
+        encoder._write_str('spam.eggs')
+        encoder._write_str('Bacon')
+        encoder.write({})
+        data = bytes(encoder.out)
+        with pt.raises(ValueError, match='Cannot decode spam.eggs.Bacon'):
+            tp.decode(data)
+        mock_import.assert_not_called()
+
+    def test_decode_wrong_version(self):
+        """Given data from a different version of the encoding,
+        :func:`decode` should raise a ValueError.
+        """
+        data = bytearray(tp.encode('spam'))
+        data[len(tp.MAGIC)] = tp.VERSION + 1
+        with pt.raises(ValueError, match='version'):
+            tp.decode(bytes(data))
+
+    def test_decode_truncated(self):
+        """Given data that ends early, :func:`decode` should raise a
+        ValueError.
+        """
+        with pt.raises(ValueError, match='ended'):
+            tp.decode(tp.encode('spam')[:-1])
+
+
+class TestPanelPickling:
+    def test_pickle_without_terminal(self, term):
+        """When pickled, a panel should leave out its terminal and
+        get a new one when unpickled.
+        """
+        panel = splash.Splash('spam', height=5, width=20)
+        state = panel.__getstate__()
+        result = pickle.loads(pickle.dumps(panel))
+        assert 'term' not in state
+        assert result == panel
+        assert result.term is term
+
+
+class TestPipeQueue:
+    def test_put_and_get(self):
+        """Messages put into the queue should come out in order, and
+        the queue should report how many are waiting.
+        """
+        q = tp.PipeQueue()
+        assert q.empty()
+        q.put(tm.Ping('spam'))
+        q.put_nowait(tm.Ping('eggs'))
+        q.flush()
+        assert q.qsize() == 2
+        assert q.get() == tm.Ping('spam')
+        assert q.get_nowait() == tm.Ping('eggs')
+        with pt.raises(Empty):
+            q.get(timeout=0.01)
+        q.close()
+
+    def test_put_nowait_full_pipe(self):
+        """Given a message larger than the pipe holds,
+        `PipeQueue.put_nowait()` should return before the message is
+        read.
+        """
+        q = tp.PipeQueue()
+        msg = tm.Ping('spam' * 2 ** 16)
+        q.put_nowait(msg)
+        q.put_nowait(tm.Ping('eggs'))
+        assert q.get(timeout=5) == msg
+        assert q.get(timeout=5) == tm.Ping('eggs')
+        q.close()
+
+    def test_manager_in_process(self, mocker):
+        """A :func:`thurible.transport.process_manager` started in
+        another process should show panels and respond to messages
+        sent through the queues.
+        """
+        mocker.patch('blessed.Terminal.cbreak')
+        mocker.patch('blessed.Terminal.fullscreen')
+        q_to, q_from = tp.get_process_queues()
+        ctx = mp.get_context('fork')
+        P = ctx.Process(target=tp.process_manager, args=(q_to, q_from))
+        P.start()
+        q_to.put(tm.Store('spam', splash.Splash('spam', height=5, width=20)))
+        q_to.put(tm.Show('spam'))
+        q_to.put(tm.Ping('test_manager_in_process'))
+        q_to.put(tm.Storing())
+        assert q_from.get(timeout=5) == tm.Pong('test_manager_in_process')
+        assert q_from.get(timeout=5) == tm.Stored('', ('spam',))
+        q_to.put(tm.End())
+        assert q_from.get(timeout=5) == tm.Ending('Received End message.')
+        P.join(5)
+        assert P.exitcode == 0
+
+    def test_keyboard_terminal(self, mocker, term):
+        """If standard input isn't the terminal, the terminal used by
+        :func:`thurible.transport.process_manager` should read keys
+        from the controlling terminal.
+        """
+        main, tty = pty.openpty()
+        mocker.patch(
+            'blessed.Terminal.is_a_tty',
+            new_callable=PropertyMock,
+            return_value=True
+        )
+        mocker.patch.object(term, '_keyboard_fd', None)
+        mocker.patch('thurible.transport.Terminal', return_value=term)
+        mocker.patch('thurible.transport.os.open', return_value=tty)
+        assert tp._keyboard_terminal() is term
+        assert term._keyboard_fd == tty
+        os.write(main, b'q\n')
+        assert term.inkey(timeout=1) == 'q'
+        os.close(main)
+        os.close(tty)
@@ -4,6 +4,9 @@ test_util
 
 Unit tests for the `thurible.util` module.
 """
+import selectors
+from queue import Queue
+
 import pytest as pt
 
 from thurible import util
@@ -55,3 +58,103 @@ class TestBox:
         """
         with pt.raises(ValueError):
             _ = util.Box(custom='bad')
+
+
+class TestHotkeyIndex:
+    def test_press(self):
+        """Given a character, :meth:`HotkeyIndex.press` should return
+        the position of the option with that hotkey.
+        """
+        hotkeys = util.HotkeyIndex(['s', None, 'e', ''])
+        assert hotkeys.press('e', now=0.0) == 2
+        assert hotkeys.press('s', now=5.0) == 0
+        assert hotkeys.chars == {'s', 'e'}
+
+    def test_press_no_match(self):
+        """Given a character that doesn't start a hotkey,
+        :meth:`HotkeyIndex.press` should return None.
+        """
+        hotkeys = util.HotkeyIndex(['s', 'e'])
+        assert hotkeys.press('x', now=0.0) is None
+
+    def test_press_multiple_characters(self):
+        """Given characters typed within the timeout,
+        :meth:`HotkeyIndex.press` should find the option with a hotkey
+        that starts with all of them. Typing the start of a hotkey
+        finds the first option with a hotkey that starts that way.
+        """
+        hotkeys = util.HotkeyIndex(['b', 'ba', 'bac', 'bb'])
+        assert hotkeys.press('b', now=0.0) == 0
+        assert hotkeys.press('a', now=0.5) == 1
+        assert hotkeys.press('c', now=1.0) == 2
+
+        hotkeys = util.HotkeyIndex(['sp', 'eg', 'ea'])
+        assert hotkeys.press('e', now=0.0) == 1
+        assert hotkeys.press('a', now=0.5) == 2
+
+    def test_press_after_timeout(self):
+        """Given a character typed after the timeout,
+        :meth:`HotkeyIndex.press` should start a new hotkey.
+        """
+        hotkeys = util.HotkeyIndex(['s', 'e', 'se'], timeout=1.0)
+        assert hotkeys.press('s', now=0.0) == 0
+        assert hotkeys.press('e', now=2.0) == 1
+
+    def test_press_not_continuing_hotkey(self):
+        """Given a character that doesn't continue the hotkey being
+        typed, :meth:`HotkeyIndex.press` should start a new hotkey.
+        """
+        hotkeys = util.HotkeyIndex(['sp', 'e'])
+        assert hotkeys.press('s', now=0.0) == 0
+        assert hotkeys.press('e', now=0.5) == 1
+
+    def test_add_and_remove(self):
+        """Hotkeys added with :meth:`HotkeyIndex.add` should be found,
+        and hotkeys removed with :meth:`HotkeyIndex.remove` should not.
+        """
+        hotkeys = util.HotkeyIndex(['s', 'e'])
+        hotkeys.remove(0, 's')
+        hotkeys.add(0, 'ba')
+        assert hotkeys.press('s', now=0.0) is None
+        assert hotkeys.press('b', now=5.0) == 0
+        assert hotkeys.chars == {'b', 'a', 'e'}
+
+
+class TestNotifyingQueue:
+    def test_put_notifies(self):
+        """When an item is put into a NotifyingQueue, its file
+        descriptor should become readable.
+        """
+        q = util.NotifyingQueue()
+        sel = selectors.DefaultSelector()
+        sel.register(q, selectors.EVENT_READ)
+        assert sel.select(0) == []
+        q.put('spam')
+        assert len(sel.select(0)) == 1
+        assert q.get() == 'spam'
+        sel.close()
+        q.close()
+
+    def test_clear_notifications(self):
+        """When notifications are cleared, the file descriptor should
+        no longer be readable, but the items should remain in the queue.
+        """
+        q = util.NotifyingQueue()
+        sel = selectors.DefaultSelector()
+        sel.register(q, selectors.EVENT_READ)
+        q.put('spam')
+        q.put('eggs')
+        q.clear_notifications()
+        assert sel.select(0) == []
+        assert q.qsize() == 2
+        sel.close()
+        q.close()
+
+
+def test_get_queues():
+    """When called, get_queues() should return a queue for sending
+    messages to the manager that can wake the manager.
+    """
+    q_to, q_from = util.get_queues()
+    assert isinstance(q_to, util.NotifyingQueue)
+    assert isinstance(q_from, Queue)